@@ -0,0 +1,58 @@
+"""Automatic task assignment speed for one large event.
+
+    python benchmarks/bench_assignment.py [--workers 1000] [--tasks 100000] [--busy 0.2]
+
+A share (`--busy`) of the workers already has a task at an overlapping event,
+so every pick also skips busy workers, and every assignment is checked for
+double bookings. Prints the time per assignment and the spread of loads
+afterwards.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import Department, Manager, TaskRegistry, Worker
+from src.assignment import AssignmentEngine
+from src.scheduling import Schedule
+
+EVENTS = {1: (datetime(2025, 6, 1), datetime(2025, 6, 5)), 2: (datetime(2025, 6, 4), datetime(2025, 6, 6))}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--busy", type=float, default=0.2)
+    options = parser.parse_args()
+
+    registry = TaskRegistry()
+    manager = Manager("Jack", Department.PRODUCTION, registry)
+    duties = ("Photographer", "Audio Specialist", "Stage Hand", "Lighting")
+    workers = [Worker(f"Worker {i:06d}", Department.PRODUCTION, duties[i % len(duties)]) for i in range(options.workers)]
+    schedule = registry.schedule = Schedule(EVENTS.get)
+    engine = AssignmentEngine(schedule)
+    engine.rebuild(workers)
+
+    other = manager.create_task(2, "Other event", "")
+    schedule.track(other)
+    manager.assign_task(other, workers[:int(options.workers * options.busy)])
+
+    tasks = manager.create_tasks([(1, f"Task {i}", "") for i in range(options.tasks)])
+    for task in tasks:
+        schedule.track(task)
+
+    started = time.perf_counter()
+    for i, task in enumerate(tasks):
+        engine.assign(manager, task, duty=duties[i % len(duties)] if i % 2 else None)
+    seconds = time.perf_counter() - started
+
+    loads = [engine.load(w) for w in workers[int(options.workers * options.busy):]]
+    print(f"{options.tasks:,} tasks over {options.workers:,} workers: {seconds:.2f}s "
+          f"({options.tasks / seconds:,.0f} assignments/sec, {seconds / options.tasks * 1e6:.1f} µs each)")
+    print(f"load of free workers: min {min(loads)}, max {max(loads)}")
+
+if __name__ == "__main__":
+    main()
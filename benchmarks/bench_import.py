@@ -0,0 +1,53 @@
+"""Bulk import speed of event applications from CSV and JSON Lines.
+
+    python benchmarks/bench_import.py [--rows 1000000] [--workers 0 4]
+
+Writes the input files to a temporary directory, then imports each into a
+fresh EventSystem with no journal installed.
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import EventSystem
+from src.bulk import APPLICATION_FIELDS, import_file
+
+def write_inputs(directory: str, rows: int) -> dict:
+    paths = {fmt: os.path.join(directory, f"applications.{fmt}") for fmt in ("csv", "jsonl")}
+    with open(paths["csv"], "w", newline="", encoding="utf-8") as c, open(paths["jsonl"], "w", encoding="utf-8") as j:
+        writer = csv.writer(c)
+        writer.writerow(APPLICATION_FIELDS)
+        for i in range(rows):
+            row = (f"Client {i % 5000}", "Workshop", f"2025-{i % 12 + 1:02d}-01T10:00:00",
+                   f"2025-{i % 12 + 1:02d}-02T18:00:00", str(1000 + i % 900), "Jazz")
+            writer.writerow(row)
+            j.write(json.dumps(dict(zip(APPLICATION_FIELDS, row))))
+            j.write("\n")
+    return paths
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4])
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_inputs(directory, options.rows)
+        for fmt, path in paths.items():
+            for workers in options.workers:
+                system = EventSystem()
+                gc.collect()
+                report = import_file(path, "applications", lambda rows: system.create_many(rows) and [],
+                                     workers=workers)
+                print(f"{fmt:<6} workers={workers:<3} {report.imported:>10,} rows {report.seconds:>8.2f}s "
+                      f"{report.rows_per_sec:>12,.0f} rows/sec")
+                del system
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Bytes per record of the domain models, before and after slotting.
+
+    python benchmarks/bench_memory.py [--records 1000000]
+
+The "before" classes reproduce the original dict-backed models.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import BudgetRequest, Comment, EventApplication, HistoryEntry, HistoryStore, InternalBudgetRequest, Role
+
+class LegacyEventApplication:
+    def __init__(self, app_id, client_name, event_type, start_date, end_date, budget, preferences, created_by):
+        self.app_id = app_id
+        self.client_name = client_name
+        self.event_type = event_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.budget = budget
+        self.preferences = preferences
+        self.created_by = created_by
+        self.status = "Pending Review"
+        self.history = [(datetime.now(), created_by, "Created", "Initial submission")]
+        self.comment = ""
+
+class LegacyBudgetRequest:
+    def __init__(self, request_id, event_id, amount, reason):
+        self.request_id = request_id
+        self.event_id = event_id
+        self.amount = amount
+        self.reason = reason
+        self.status = "Pending"
+
+def bytes_per_record(factory: Callable[[int], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records: List[object] = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the list holding the records.
+    per_record = (after - before - sys.getsizeof(records)) / count
+    del records
+    return per_record
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    count = parser.parse_args().records
+
+    start, end = datetime(2025, 12, 1), datetime(2025, 12, 2)
+    # Applications in a system share one history store; each case gets a fresh one.
+    # History is measured at four entries per application.
+    stores = {"application": HistoryStore(), "entry": HistoryStore()}
+    cases = [
+        ("event application",
+         lambda i: LegacyEventApplication(i, "TestCorp", "Workshop", start, end, 5000.0, "Jazz", Role.CS_WORKER),
+         lambda i: EventApplication(i, "TestCorp", "Workshop", start, end, 5000.0, "Jazz", Role.CS_WORKER,
+                                    stores["application"])),
+        ("budget request",
+         lambda i: LegacyBudgetRequest(i, 1, 5000.0, "Equipment"),
+         lambda i: BudgetRequest(i, 1, 5000.0, "Equipment")),
+        ("task comment",
+         lambda i: {"worker": "Tobias", "comment": "On it", "timestamp": datetime.now()},
+         lambda i: Comment("Tobias", "On it")),
+        ("task budget request",
+         lambda i: {"worker": "Tobias", "amount": 100.0, "reason": "Cables", "timestamp": datetime.now()},
+         lambda i: InternalBudgetRequest("Tobias", 100.0, "Cables")),
+        ("history entry",
+         lambda i: (datetime.now(), Role.CS_MANAGER, "Forwarded", "ok"),
+         lambda i: stores["entry"].append(i // 4, HistoryEntry(datetime.now(), Role.CS_MANAGER, "Forwarded", "ok"))),
+    ]
+
+    print(f"{count:,} records per case")
+    print(f"{'record':<22}{'before B':>10}{'after B':>10}{'saved':>8}")
+    for name, before, after in cases:
+        b = bytes_per_record(before, count)
+        a = bytes_per_record(after, count)
+        print(f"{name:<22}{b:>10.0f}{a:>10.0f}{(1 - a / b):>8.0%}")
+
+if __name__ == "__main__":
+    main()
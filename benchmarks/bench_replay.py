@@ -0,0 +1,91 @@
+"""Domain-event replay speed: full rebuild and rebuild from a checkpoint.
+
+    python benchmarks/bench_replay.py [--events 10000000] [--checkpoint-at 0.9]
+
+The journal mixes creations (5% each of applications, budget requests,
+negotiations and tasks) with status changes and counter-offers on them.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import (BudgetNegotiationStatus, BudgetRequestStatus, Department, EventApplicationStatus, Role,
+                 TaskStatus)
+from src.event_request import ApplicationStatusChanged, ApplicationSubmitted
+from src.financial_request import (BudgetRequestDecided, BudgetRequestOpened, CounterOffered, NegotiationDecided,
+                                   NegotiationOpened)
+from src.journal import DomainEvent, Journal
+from src.projection import DomainState
+from src.task_distribution import TaskCreated, TaskStatusChanged
+
+def build_journal(count: int) -> Journal:
+    journal = Journal()
+    entities = max(1, count // 20)
+    at = datetime(2025, 1, 1)
+    start, end = datetime(2025, 12, 1), datetime(2025, 12, 2)
+    statuses = [EventApplicationStatus.FORWARDED, EventApplicationStatus.APPROVED]
+    task_statuses = [TaskStatus.IN_PROGRESS, TaskStatus.CLOSED, TaskStatus.OPEN]
+
+    for i in range(1, entities + 1):
+        journal.append(ApplicationSubmitted(i, "TestCorp", "Workshop", start, end, 5000.0, "Jazz", Role.CS_WORKER, at))
+        journal.append(BudgetRequestOpened(i, i, 1000.0, "Equipment"))
+        journal.append(NegotiationOpened(i, i))
+        journal.append(TaskCreated(i, i, "Prepare Stage", "Lights", Department.PRODUCTION))
+
+    changes: List[DomainEvent] = []
+    for n in range(count - 4 * entities):
+        target = n % entities + 1
+        match n // entities % 4:
+            case 0:
+                changes.append(ApplicationStatusChanged(target, Role.CS_MANAGER, statuses[n % 2], "ok", at))
+            case 1:
+                changes.append(CounterOffered(target, 900.0))
+            case 2:
+                changes.append(TaskStatusChanged(target, task_statuses[n % 3]))
+            case _:
+                changes.append(BudgetRequestDecided(target, BudgetRequestStatus.APPROVED)
+                               if n % 2 else NegotiationDecided(target, BudgetNegotiationStatus.APPROVED))
+        if len(changes) >= 100_000:
+            for event in changes:
+                journal.append(event)
+            changes.clear()
+    for event in changes:
+        journal.append(event)
+    return journal
+
+def timed(label: str, count: int, fn):
+    gc.collect()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    rate = f"{count / elapsed:>12,.0f} events/sec" if count else ""
+    print(f"{label:<28}{elapsed:>8.2f}s {rate}")
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--checkpoint-at", type=float, default=0.9, help="fraction of the journal the checkpoint covers")
+    options = parser.parse_args()
+
+    journal = timed("build journal", 0, lambda: build_journal(options.events))
+    print(f"{len(journal):,} events")
+
+    timed("full replay", len(journal), lambda: DomainState.rebuild(journal))
+
+    covered = int(len(journal) * options.checkpoint_at)
+    state = DomainState()
+    state.apply_all(journal.events()[:covered])
+    timed("write checkpoint", 0, lambda: journal.save_checkpoint(state.seq, state.snapshot()))
+    del state
+    print(f"checkpoint: {covered:,} events, {len(journal.checkpoint[1]) / 1e6:,.1f} MB")
+    timed(f"checkpoint + {len(journal) - covered:,} events", 0, lambda: DomainState.rebuild(journal))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Full-text search speed over many indexed documents.
+
+    python benchmarks/bench_search.py [--docs 200000] [--words 8] [--queries 2000]
+
+Indexes `--docs` synthetic preference texts of `--words` words each, drawn
+from a skewed vocabulary, then times queries of one or two prefixes of
+rarer words. Prints the indexing rate and the query latency percentiles.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.search import SearchIndex, Document, APPLICATION
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--words", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=2000)
+    options = parser.parse_args()
+
+    rng = random.Random(1)
+    vocabulary = [f"{rng.choice('bcdfghklmnprstv')}{rng.choice('aeiou')}{i:x}" for i in range(50_000)]
+    cumulative = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    for doc_id in range(options.docs):
+        index.index(Document(APPLICATION, doc_id), " ".join(rng.choices(vocabulary, cum_weights=cumulative, k=options.words)))
+    seconds = time.perf_counter() - started
+    print(f"indexed {options.docs:,} documents in {seconds:.1f}s ({options.docs / seconds:,.0f} docs/sec)")
+
+    rare = vocabulary[1000:]
+    queries = [" ".join(rng.sample(rare, rng.choice((1, 2)))) for _ in range(options.queries)]
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, limit=10)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3
+    print(f"{options.queries:,} queries: p50 {pick(0.5):.3f} ms, p99 {pick(0.99):.3f} ms, max {latencies[-1] * 1e3:.3f} ms")
+
+if __name__ == "__main__":
+    main()
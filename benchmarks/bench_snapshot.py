@@ -0,0 +1,62 @@
+"""Startup time from a pickled snapshot versus a memory-mapped binary one.
+
+    python benchmarks/bench_snapshot.py [--applications 1000000]
+
+Builds applications with two history entries each, writes both snapshot
+formats, then times loading each and the first lookup and query after it.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import EventApplicationStatus, EventSystem, FileStorage, MappedFileStorage, Role
+
+def build_state(count: int) -> dict:
+    system = EventSystem()
+    start = datetime(2025, 1, 1)
+    system.create_many([(f"Client {i % 5000}", "Workshop", start + timedelta(hours=i % 8760),
+                         start + timedelta(hours=i % 8760 + 8), 1000.0 + i % 900, "Jazz") for i in range(count)])
+    for app in system.applications[::2]:
+        app.update_status(Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "Looks good")
+    return {"users": {}, "system": system, "hr_requests": {}, "budget_requests": {}, "budget_negotiations": {},
+            "next_ids": (1, 1, 1)}
+
+def timed(label: str, action):
+    started = time.perf_counter()
+    result = action()
+    print(f"  {label:<28} {time.perf_counter() - started:>8.3f}s")
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    state = build_state(options.applications)
+    with tempfile.TemporaryDirectory() as directory:
+        for storage_class in (FileStorage, MappedFileStorage):
+            path = os.path.join(directory, storage_class.__name__)
+            storage = storage_class(path)
+            storage.append({"cmd": "bench"})
+            timed(f"{storage_class.__name__} write", lambda: storage.write_snapshot(state))
+            storage.close()
+            size = os.path.getsize(os.path.join(path, storage_class.SNAPSHOT_FILE))
+            print(f"{storage_class.__name__}: {size / 2**20:,.1f} MiB")
+
+            gc.collect()
+            storage = storage_class(path)
+            loaded, _ = timed("load", storage.load)
+            system = loaded["system"]
+            timed("first lookup", lambda: system.get_application_by_id(options.applications // 2))
+            timed("first query", lambda: system.query(client_name="Client 42"))
+            storage.close()
+            del loaded, system
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,38 @@
+import argparse
+import contextlib
+import io
+import os
 import shlex
+import sys
+import time
 from datetime import datetime
-from typing import List, Dict, Callable
-
-from src import Employee, Role, Manager, Worker, Department, TaskStatus, EventSystem, EventApplicationStatus, HRRequest, BudgetRequest, BudgetNegotiation
+from typing import Any, Callable, Iterable, List, Dict, TextIO, Tuple
+
+from src import Employee, Role, Manager, Worker, Department, Task, TaskStatus, TaskRegistry, EventSystem, EventApplicationStatus, HRRequest, HRRequestStatus, BudgetRequest, BudgetRequestStatus, BudgetNegotiation
+from src import Storage, MemoryStorage, FileStorage, MappedFileStorage, SQLiteStorage
+from src import bulk, clock, journal
+from src.analytics import BudgetAnalytics
+from src.assignment import AssignmentEngine
+from src.commands import CommandRegistry, Session
+from src.journal import Journal
+from src.ledger import BudgetLedger, EventBudget
+from src.projection import DomainState
+from src.scheduling import Schedule
+from src.work_queue import WorkQueues, WorkItem, APPLICATION as APPLICATION_ITEM, HR_REQUEST as HR_ITEM, EVENT_TYPES as WORK_EVENTS
+from src.search import SearchIndex, Document, APPLICATION, BUDGET_REQUEST, TASK_COMMENT
+from src.financial_request import BudgetRequestOpened, NegotiationOpened
+from src.staff_recruitment import HRRequestOpened
+from src.concurrency import IdAllocator
+from src.event_bus import EventBus
+from src.metrics import LatencyRecorder
+from src.pagination import by_id
+from src.views import ALL, MaterializedView
 
 # ---------------------------------------------------------------------
 # Mock database
 # ---------------------------------------------------------------------
+TASKS = TaskRegistry()
+
 USERS: Dict[str, Employee] = {
     "mike@sep.se": Employee("Mike", Role.ADM_MANAGER),
 
@@ -18,11 +44,11 @@ USERS: Dict[str, Employee] = {
     "simon@sep.se": Employee("Simon", Role.HR_MANAGER),
     "maria@sep.se": Employee("Maria", Role.HR_WORKER),
 
-    "jack@sep.se": Manager("Jack", Department.PRODUCTION),
+    "jack@sep.se": Manager("Jack", Department.PRODUCTION, TASKS),
     "tobias@sep.se": Worker("Tobias", Department.PRODUCTION, "Photographer"),
     "antony@sep.se": Worker("Antony", Department.PRODUCTION, "Audio Specialist"),
 
-    "natalie@sep.se": Manager("Natalie", Department.SERVICES),
+    "natalie@sep.se": Manager("Natalie", Department.SERVICES, TASKS),
     "helen@sep.se": Worker("Helen", Department.SERVICES, "Top Chef"),
     "diana@sep.se": Worker("Diana", Department.SERVICES, "Chef"),
     "kate@sep.se": Worker("Kate", Department.SERVICES, "Top Waiter"),
@@ -32,116 +58,93 @@ USERS: Dict[str, Employee] = {
 # ---------------------------------------------------------------------
 # Global state
 # ---------------------------------------------------------------------
-CURRENT_USER: Employee | None = None
+SESSION = Session()
 SYSTEM = EventSystem()
+STORAGE: Storage = MemoryStorage()
+# Every domain transition of this process, as typed events. Each storage
+# snapshot becomes its checkpoint (see save_snapshot).
+JOURNAL = Journal()
+journal.install(JOURNAL)
+# Every recorded event is also published here for in-process subscribers.
+EVENT_BUS = EventBus()
+journal.publish_to(EVENT_BUS.publish)
+COMMANDS = CommandRegistry()
 
 HR_REQUESTS: Dict[int, HRRequest] = {}
 BUDGET_REQUESTS: Dict[int, BudgetRequest] = {}
 BUDGET_NEGOTIATIONS: Dict[int, BudgetNegotiation] = {}
+BUDGET_ANALYTICS = BudgetAnalytics()
+BUDGET_LEDGER = BudgetLedger()
+SEARCH = SearchIndex()
+
+
+# Pre-rendered rows for the view-* commands, updated as the objects change.
+def task_keys(task: Task) -> List[Any]:
+    owners = [o for o in (TASKS.manager_of(task), *task.assigned_workers) if o is not None]
+    return [*owners, *((o, task.status) for o in owners), (task.department, task.status)]
+
+def build_views() -> Tuple[MaterializedView, MaterializedView, MaterializedView]:
+    return (
+        MaterializedView(lambda t: t.task_id, task_keys, lambda t: f"- {t.title} ({t.status.value})"),
+        MaterializedView(lambda r: r.request_id, lambda r: (ALL, r.status),
+                         lambda r: f"#{r.request_id} | {r.type} | {r.status.value} | Staff: {[w.name for w in r.hired_staff]}"),
+        MaterializedView(lambda r: r.request_id, lambda r: (ALL, r.status),
+                         lambda r: f"#{r.request_id} | Event #{r.event_id} | {r.amount} SEK | {r.status.value} | {r.reason}"),
+    )
 
-next_hr_id = 1
-next_budget_id = 1
-next_negotiation_id = 1
+TASK_VIEW, HR_VIEW, BUDGET_VIEW = build_views()
 
-# ---------------------------------------------------------------------
-# Decorators
-# ---------------------------------------------------------------------
-def require_login(func: Callable):
-    """Decorator to ensure a user is logged in."""
-    def wrapper(*args, **kwargs):
-        if CURRENT_USER is None:
-            print("⚠️  You must log in first.")
-            return
-        return func(*args, **kwargs)
-    return wrapper
-
-def require_role(*roles: Role):
-    """Decorator to restrict access to certain roles."""
-    def decorator(func: Callable):
-        def wrapper(*args, **kwargs):
-            if CURRENT_USER is None:
-                print("⚠️  You must log in first.")
-                return
-            if CURRENT_USER.role not in roles:
-                print(f"🚫 Permission denied for {CURRENT_USER.role.value}.")
-                return
-            return func(*args, **kwargs)
-        return wrapper
-    return decorator
+def event_dates(event_id: int) -> Tuple[datetime, datetime] | None:
+    try:
+        app = SYSTEM.get_application_by_id(event_id)
+    except ValueError:
+        return None
+    return app.start_date, app.end_date
+
+SCHEDULE = Schedule(event_dates)
+TASKS.schedule = SCHEDULE
+ASSIGNMENT = AssignmentEngine(SCHEDULE)
+ASSIGNMENT.rebuild(u for u in USERS.values() if isinstance(u, Worker))
+
+# What the reviewing roles have waiting for them, filed as things change:
+# applications through the system's hook, HR and budget requests from their
+# events on the bus. The subscription looks the queues up on each event, so
+# it follows restore_state replacing them.
+WORK_QUEUES = WorkQueues(event_dates)
+SYSTEM.on_change = WORK_QUEUES.track_application
+EVENT_BUS.subscribe(lambda event: WORK_QUEUES.apply(event), *WORK_EVENTS)
+
+HR_IDS = IdAllocator()
+BUDGET_IDS = IdAllocator()
+NEGOTIATION_IDS = IdAllocator()
 
 # ---------------------------------------------------------------------
 # Help function
 # ---------------------------------------------------------------------
 def show_help(role: Role | None = None):
     print("")
+    print("Available commands:")
     if role is None:
-        print("Available commands:")
-        print("  login <email>                      Log in")
-        print("  help                               Show this help")
-        print("  quit                               Exit the program")
+        print(f"  {'login <email>':<40} Log in")
+        print(f"  {'help':<40} Show this help")
+        print(f"  {'quit':<40} Exit the program")
         print("")
         return
 
-    print("Available commands:")
-    match role:
-        case Role.MANAGER:
-            print("  create-task <event-id> <title> <desc>    Create a new task")
-            print("  assign-task <title> <emails...>          Assign a task to workers")
-            print("  update-task-status <title> <status>      Change task status (Open/In_Progress/Closed)")           
-            print("  view-tasks                               View your created tasks")
-            print("  review-task <title>                      Review feedback and budget requests")
-            print("  create-hr-request <type>                 Create a HR request")
-            print("  create-budget-request <event-id> <amount> <reason>")
-            print("  view-budget-requests                     View your department’s budget requests")
-
-        case Role.WORKER:
-            print("  view-tasks                               View your assigned tasks")
-            print("  comment-on-task <title> <text>           Add a comment to a task")
-
-        case Role.HR_MANAGER:
-            print("  view-hr-requests                         View all HR requests")
-            print("  review-hr-request <id> <approve|reject>  Approve or reject HR requests")
-
-        case Role.HR_WORKER:
-            print("  create-hr-request <type>                 Create a new HR request")
-            print("  view-hr-requests                         View all HR requests")
-            print("  hire-staff <id> <email> <name> <department> <duty>  Hire a new staff member for an approved request")
-
-        case Role.CS_MANAGER:
-            print("  review-event-application <app_id> FORWARDED <comment>   Forward an event application to Financial Manager")
-            print("  view-event-application <app_id>")
-
-        case Role.CS_WORKER:
-            print("  create-event-application <client> <event_type> <start> <end> <budget> [preferences]")
-            print("  view-event-application <app_id>")
-
-        case Role.FIN_MANAGER:
-            print("  view-event-application <app_id>")
-            print("  review-event-application <app_id> <FORWARDED|APPROVED|REJECTED> <comment>")
-            print("  review-budget-request <id> <approve|reject>")
-            print("  negotiate-budget <id> <new-amount>")
-            print("  view-budget-requests                     View all budget requests")
-
-        case Role.ADM_MANAGER:
-            print("  view-event-application <app_id>")
-            print("  review-event-application <app_id> <FORWARDED|APPROVED|REJECTED> <comment>")
-
-        case _:
-            print("  (No specific actions for this role)")
-
-    print("  logout                                  Log out")
-    print("  quit                                    Exit program")
+    lines = COMMANDS.help_lines(role)
+    print("\n".join(lines) if lines else "  (No specific actions for this role)")
+    print(f"  {'logout':<40} Log out")
+    print(f"  {'quit':<40} Exit program")
     print("")
 
 
 # ---------------------------------------------------------------------
 # Command functions
 # ---------------------------------------------------------------------
-@require_role(Role.CS_WORKER)
-def create_event_application(args: List[str]):
-    if len(args) < 5:
-        print("Usage: create-event-application <client> <event_type> <start> <end> <budget> [preferences]")
-        return
+@COMMANDS.command("create-event-application", Role.CS_WORKER,
+                  usage="create-event-application <client> <event_type> <start> <end> <budget> [preferences]",
+                  help="Create a new event application", min_args=5, mutates=True)
+def create_event_application(user: Employee, args: List[str]):
     client, event_type, start_str, end_str, budget_str, *prefs = args
     try:
         start = datetime.fromisoformat(start_str)
@@ -158,16 +161,63 @@ def create_event_application(args: List[str]):
         end_date=end,
         budget=budget,
         preferences=preferences,
-        created_by=CURRENT_USER.role
+        created_by=user.role
     )
+    BUDGET_LEDGER.track_application(app)
+    SEARCH.track_application(app)
     print(f"🆕 Created Event Application #{app.app_id} for {client}")
 
 
-@require_role(Role.CS_WORKER, Role.FIN_MANAGER, Role.ADM_MANAGER)
-def view_event_application(args: List[str]):
-    if not args:
-        print("Usage: view-event-application <app_id>")
+def parse_options(args: List[str], *names: str) -> Tuple[List[str], Dict[str, int]]:
+    """Split numeric `--name <n>` options out of a command's arguments."""
+    rest: List[str] = []
+    options: Dict[str, int] = {}
+    it = iter(args)
+    for arg in it:
+        if arg not in names:
+            rest.append(arg)
+            continue
+        try:
+            number = int(next(it, ""))
+        except ValueError:
+            raise ValueError(f"{arg} needs a number.")
+        if number < 0:
+            raise ValueError(f"{arg} must not be negative.")
+        options[arg] = number
+    return rest, options
+
+def parse_page(args: List[str]) -> Tuple[List[str], int, int | None]:
+    """Split `--after <id>` and `--limit <n>` out of a listing command's arguments."""
+    rest, options = parse_options(args, "--after", "--limit")
+    return rest, options.get("--after", 0), options.get("--limit")
+
+def print_page(rows_for: Callable[[int, int | None], Iterable[Tuple[int, str]]], after: int, limit: int | None, empty: str):
+    """Print rows as they are produced; if more remain past `limit`, say where the next page starts."""
+    shown, last = 0, after
+    for row_id, row in rows_for(after, None if limit is None else limit + 1):
+        if shown == limit:
+            print(f"-- more: --after {last}")
+            return
+        print(row)
+        shown, last = shown + 1, row_id
+    if not shown:
+        print(empty)
+
+@COMMANDS.command("list-applications", Role.CS_WORKER, Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER,
+                  usage="list-applications [--after <id>] [--limit <n>]", help="List event applications by ID")
+def list_applications(user: Employee, args: List[str]):
+    try:
+        _, after, limit = parse_page(args)
+    except ValueError as e:
+        print(f"❌ {e}")
         return
+    print_page(lambda a, n: ((app.app_id, str(app)) for app in SYSTEM.iter_applications(a, n)),
+               after, limit, "No event applications available.")
+
+
+@COMMANDS.command("view-event-application", Role.CS_WORKER, Role.FIN_MANAGER, Role.ADM_MANAGER,
+                  usage="view-event-application <app_id>", help="View an event application and its history", min_args=1)
+def view_event_application(user: Employee, args: List[str]):
     try:
         app_id = int(args[0])
         app = SYSTEM.get_application_by_id(app_id)
@@ -186,28 +236,61 @@ def view_event_application(args: List[str]):
         print(f"❌ {e}")
 
 
-@require_role(Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER)
-def review_event_application(args: List[str]):
-    if len(args) < 3:
-        print("Usage: review-event-application <app_id> <FORWARDED|APPROVED|REJECTED> <comment>")
-        return
+@COMMANDS.command("review-event-application", Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER,
+                  usage="review-event-application <app_id> <FORWARDED|APPROVED|REJECTED> <comment>",
+                  help="Forward, approve or reject an event application", min_args=3, mutates=True)
+def review_event_application(user: Employee, args: List[str]):
     try:
         app_id = int(args[0])
         decision_str = args[1].upper()
         comment = " ".join(args[2:])
         decision = EventApplicationStatus[decision_str]
-        SYSTEM.review_application(app_id, CURRENT_USER.role, decision, comment)
+        SYSTEM.review_application(app_id, user.role, decision, comment)
         print(f"✅ Application #{app_id} updated to {decision.value}")
     except KeyError:
         print("❌ Invalid decision. Choose: FORWARDED, APPROVED, REJECTED")
     except Exception as e:
         print(f"❌ {e}")
 
-@require_role(Role.MANAGER)
-def create_task(args: List[str]):
-    if len(args) < 3:
-        print("Usage: create-task <event-id> <title> <description>")
+def parse_ids(args: List[str]) -> List[int]:
+    """IDs given one by one or as inclusive `first-last` ranges."""
+    ids: List[int] = []
+    for arg in args:
+        first, _, last = arg.partition("-")
+        try:
+            ids.extend(range(int(first), int(last or first) + 1))
+        except ValueError:
+            raise ValueError(f"Invalid ID or range: {arg}")
+    return ids
+
+@COMMANDS.command("review-event-applications", Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER,
+                  usage="review-event-applications <FORWARDED|APPROVED|REJECTED> <comment> <app_id|first-last>...",
+                  help="Give many event applications the same decision, all or none", min_args=3, mutates=True)
+def review_event_applications(user: Employee, args: List[str]):
+    try:
+        decision = EventApplicationStatus[args[0].upper()]
+    except KeyError:
+        print("❌ Invalid decision. Choose: FORWARDED, APPROVED, REJECTED")
+        return
+    try:
+        ids = parse_ids(args[2:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    results = SYSTEM.review_many([(app_id, decision, args[1]) for app_id in ids], user.role)
+    failed = [r for r in results if r.error is not None]
+    if not failed:
+        print(f"✅ {len(results)} applications updated to {decision.value}")
         return
+    print(f"❌ No applications updated; {len(failed)} of {len(results)} decisions are not allowed:")
+    for r in failed[:20]:
+        print(f"  #{r.app_id}: {r.error}")
+    if len(failed) > 20:
+        print(f"  ... and {len(failed) - 20} more")
+
+@COMMANDS.command("create-task", Role.MANAGER,
+                  usage="create-task <event-id> <title> <description>", help="Create a new task", min_args=3, mutates=True)
+def create_task(user: Employee, args: List[str]):
     
     try:
         event_id = int(args[0])
@@ -224,18 +307,20 @@ def create_task(args: List[str]):
     title = args[1]
     description = " ".join(args[2:])
 
-    manager: Manager = CURRENT_USER
+    manager: Manager = user  # type: ignore
     task = manager.create_task(event_id, title, description)
+    BUDGET_LEDGER.track_task(task)
+    TASK_VIEW.track(task)
+    SCHEDULE.track(task)
+    SEARCH.track_task(task)
     print(f"🆕 Created task '{task.title}' linked to Event #{task.event_id} ({event.client_name}) ({task.department.value} Department)")
 
-@require_role(Role.MANAGER)
-def assign_task(args: List[str]):
-    if len(args) < 2:
-        print("Usage: assign-task <task-title> <worker_emails...>")
-        return
+@COMMANDS.command("assign-task", Role.MANAGER,
+                  usage="assign-task <task-title> <worker_emails...>", help="Assign a task to workers", min_args=2, mutates=True)
+def assign_task(user: Employee, args: List[str]):
     title, emails = args[0], args[1:]
-    manager: Manager = CURRENT_USER
-    task = next((t for t in manager.tasks if t.title == title), None)
+    manager: Manager = user  # type: ignore
+    task = TASKS.find(manager, title)
     if not task:
         print("❌ Task not found.")
         return
@@ -247,32 +332,99 @@ def assign_task(args: List[str]):
     if not workers:
         print("No valid workers found.")
         return
-    manager.assign_task(task, workers)
+    try:
+        manager.assign_task(task, workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print(f"✅ Assigned '{title}' to {', '.join(w.name for w in workers)}")
+
+@COMMANDS.command("auto-assign-task", Role.MANAGER,
+                  usage="auto-assign-task <task-title> [duty] [--workers <n>]",
+                  help="Assign the least loaded workers free at the event's dates", min_args=1, mutates=True)
+def auto_assign_task(user: Employee, args: List[str]):
+    manager: Manager = user  # type: ignore
+    try:
+        args, options = parse_options(args, "--workers")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    if not args:
+        print("Usage: auto-assign-task <task-title> [duty] [--workers <n>]")
+        return
+    title, duty = args[0], " ".join(args[1:]) or None
+    task = TASKS.find(manager, title)
+    if not task:
+        print("❌ Task not found.")
+        return
+    try:
+        workers = ASSIGNMENT.assign(manager, task, options.get("--workers", 1), duty)
+    except (ValueError, PermissionError) as e:
+        print(f"❌ {e}")
+        return
     print(f"✅ Assigned '{title}' to {', '.join(w.name for w in workers)}")
 
+@COMMANDS.command("free-workers", Role.MANAGER,
+                  usage="free-workers <start> <end> [duty]",
+                  help="List your department's workers not booked for any event in a period", min_args=2)
+def free_workers(user: Employee, args: List[str]):
+    manager: Manager = user  # type: ignore
+    try:
+        start, end = datetime.fromisoformat(args[0]), datetime.fromisoformat(args[1])
+    except ValueError as e:
+        print(f"❌ Invalid date: {e}")
+        return
+    workers = SCHEDULE.free_workers(manager.department, start, end, " ".join(args[2:]) or None)
+    if not workers:
+        print("No free workers in that period.")
+        return
+    for worker in workers:
+        print(f"- {worker.name} ({worker.duty}), {SCHEDULE.load(worker)} open tasks")
 
-@require_login
-@require_role(Role.MANAGER, Role.WORKER)
-def view_tasks(_: List[str]):
-    if isinstance(CURRENT_USER, (Manager, Worker)):
-        tasks = CURRENT_USER.view_tasks()
-        if not tasks:
-            print("No tasks found.")
-            return
-        for t in tasks:
-            print(f"- {t.title} ({t.status.value})")
-    else:
+def parse_task_status(args: List[str]) -> TaskStatus | None:
+    if not args:
+        return None
+    try:
+        return TaskStatus[args[0].upper()]
+    except KeyError:
+        raise ValueError("Invalid status. Use: Open, In_Progress, Closed.")
+
+@COMMANDS.command("view-tasks", Role.MANAGER, Role.WORKER,
+                  usage="view-tasks [Open|In_Progress|Closed] [--after <id>] [--limit <n>]", help="View your tasks")
+def view_tasks(user: Employee, args: List[str]):
+    if not isinstance(user, (Manager, Worker)):
         print("Your role has no tasks.")
+        return
+    try:
+        args, after, limit = parse_page(args)
+        status = parse_task_status(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    key = user if status is None else (user, status)
+    print_page(lambda a, n: TASK_VIEW.iter_rows(key, a, n), after, limit, "No tasks found.")
+
+@COMMANDS.command("view-department-tasks", Role.MANAGER,
+                  usage="view-department-tasks [Open|In_Progress|Closed] [--after <id>] [--limit <n>]",
+                  help="View your department's tasks (default: Open)")
+def view_department_tasks(user: Employee, args: List[str]):
+    manager: Manager = user  # type: ignore
+    try:
+        args, after, limit = parse_page(args)
+        status = parse_task_status(args) or TaskStatus.OPEN
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    key = (manager.department, status)
+    print_page(lambda a, n: TASK_VIEW.iter_rows(key, a, n), after, limit, "No tasks found.")
 
 
-@require_role(Role.WORKER)
-def comment_on_task(args: List[str]):
-    if len(args) < 2:
-        print("Usage: comment-on-task <task-title> <comment>")
-        return
+@COMMANDS.command("comment-on-task", Role.WORKER,
+                  usage="comment-on-task <task-title> <comment>", help="Add a comment to a task", min_args=2, mutates=True)
+def comment_on_task(user: Employee, args: List[str]):
     title, comment_text = args[0], " ".join(args[1:])
-    worker: Worker = CURRENT_USER  # type: ignore
-    task = next((t for t in worker.tasks if t.title == title), None)
+    worker: Worker = user  # type: ignore
+    task = TASKS.find_assigned(worker, title)
     if not task:
         print("❌ Task not found.")
         return
@@ -280,14 +432,12 @@ def comment_on_task(args: List[str]):
     print("💬 Comment added.")
 
 
-@require_role(Role.MANAGER)
-def update_task_status(args: List[str]):
-    if len(args) < 2:
-        print("Usage: update-task-status <task-title> <Open|In_Progress|Closed>")
-        return
+@COMMANDS.command("update-task-status", Role.MANAGER,
+                  usage="update-task-status <task-title> <Open|In_Progress|Closed>", help="Change task status", min_args=2, mutates=True)
+def update_task_status(user: Employee, args: List[str]):
     title, status_str = args[0], args[1]
-    manager: Manager = CURRENT_USER  # type: ignore
-    task = next((t for t in manager.tasks if t.title == title), None)
+    manager: Manager = user  # type: ignore
+    task = TASKS.find(manager, title)
     if not task:
         print("❌ Task not found.")
         return
@@ -299,17 +449,13 @@ def update_task_status(args: List[str]):
     manager.change_task_status(task, new_status)
     print(f"🔄 Task '{title}' updated to {new_status.value}")
 
-@require_role(Role.MANAGER)
-def review_task(args: List[str]):
-    if len(args) < 1:
-        print("Usage: review-task <task-title>")
-        return
-
+@COMMANDS.command("review-task", Role.MANAGER,
+                  usage="review-task <task-title>", help="Review feedback and budget requests", min_args=1)
+def review_task(user: Employee, args: List[str]):
     title = " ".join(args)
-    manager: Manager = CURRENT_USER  # type: ignore
+    manager: Manager = user  # type: ignore
 
-    # Find task by title
-    task = next((t for t in manager.tasks if t.title == title), None)
+    task = TASKS.find(manager, title)
     if not task:
         print(f"❌ No task found with title '{title}'.")
         return
@@ -334,25 +480,19 @@ def review_task(args: List[str]):
     else:
         print("\n💰 No budget requests yet.")
 
-@require_role(Role.MANAGER)
-def create_hr_request(args: List[str]):
-    global next_hr_id
-    if not args:
-        print("Usage: create-hr-request <type>")
-        return
-
+@COMMANDS.command("create-hr-request", Role.MANAGER,
+                  usage="create-hr-request <type>", help="Create a HR request", min_args=1, mutates=True)
+def create_hr_request(user: Employee, args: List[str]):
     req_type = " ".join(args)
-    req = HRRequest(next_hr_id, req_type)
-    HR_REQUESTS[next_hr_id] = req
-    print(f"🧾 Created HR Request #{next_hr_id} ({req_type}) [Status: {req.status.value}]")
-    next_hr_id += 1
-
-@require_role(Role.HR_MANAGER)
-def review_hr_request(args: List[str]):
-    if len(args) < 2:
-        print("Usage: review-hr-request <request-id> <approve|reject>")
-        return
-
+    req = HRRequest(HR_IDS.allocate(), req_type)
+    HR_REQUESTS[req.request_id] = req
+    journal.record(HRRequestOpened(req.request_id, req_type))
+    HR_VIEW.track(req)
+    print(f"🧾 Created HR Request #{req.request_id} ({req_type}) [Status: {req.status.value}]")
+
+@COMMANDS.command("review-hr-request", Role.HR_MANAGER,
+                  usage="review-hr-request <request-id> <approve|reject>", help="Approve or reject HR requests", min_args=2, mutates=True)
+def review_hr_request(user: Employee, args: List[str]):
     try:
         req_id = int(args[0])
         decision = args[1].lower()
@@ -373,12 +513,10 @@ def review_hr_request(args: List[str]):
     except Exception as e:
         print(f"❌ {e}")
 
-@require_role(Role.HR_WORKER)
-def hire_staff(args: List[str]):
-    if len(args) < 5:
-        print("Usage: hire-staff <request-id> <email> <name> <department> <duty>")
-        return
-
+@COMMANDS.command("hire-staff", Role.HR_WORKER,
+                  usage="hire-staff <request-id> <email> <name> <department> <duty>",
+                  help="Hire a new staff member for an approved request", min_args=5, mutates=True)
+def hire_staff(user: Employee, args: List[str]):
     try:
         req_id = int(args[0])
         email = args[1]
@@ -401,26 +539,34 @@ def hire_staff(args: List[str]):
 
         req.hire_staff(staff)
         USERS[email] = staff
+        ASSIGNMENT.add_worker(staff)
 
         print(f"👤 Hired {staff.name} required by HR Request #{req_id}. Status: {req.status.value}")
 
     except Exception as e:
         print(f"❌ {e}")
 
-@require_role(Role.HR_MANAGER, Role.HR_WORKER)
-def view_hr_requests(_: List[str]):
-    if not HR_REQUESTS:
-        print("No HR Requests available.")
+@COMMANDS.command("view-hr-requests", Role.HR_MANAGER, Role.HR_WORKER,
+                  usage="view-hr-requests [PENDING|APPROVED|REJECTED|HIRED] [--after <id>] [--limit <n>]",
+                  help="View all HR requests")
+def view_hr_requests(user: Employee, args: List[str]):
+    try:
+        args, after, limit = parse_page(args)
+    except ValueError as e:
+        print(f"❌ {e}")
         return
-    for req in HR_REQUESTS.values():
-        print(f"#{req.request_id} | {req.type} | {req.status.value} | Staff: {[w.name for w in req.hired_staff]}")
+    key = ALL
+    if args:
+        try:
+            key = HRRequestStatus[args[0].upper()]
+        except KeyError:
+            print(f"❌ Invalid status: {args[0]}. Use: {', '.join(s.name for s in HRRequestStatus)}")
+            return
+    print_page(lambda a, n: HR_VIEW.iter_rows(key, a, n), after, limit, "No HR Requests available.")
 
-@require_role(Role.MANAGER)
-def create_budget_request(args: List[str]):
-    global next_budget_id
-    if len(args) < 3:
-        print("Usage: create-budget-request <event-id> <amount> <reason>")
-        return
+@COMMANDS.command("create-budget-request", Role.MANAGER,
+                  usage="create-budget-request <event-id> <amount> <reason>", help="Create a budget request", min_args=3, mutates=True)
+def create_budget_request(user: Employee, args: List[str]):
     try:
         event_id = int(args[0])
         amount = float(args[1])
@@ -429,16 +575,18 @@ def create_budget_request(args: List[str]):
         print("❌ Invalid number format.")
         return
 
-    req = BudgetRequest(next_budget_id, event_id, amount, reason)
-    BUDGET_REQUESTS[next_budget_id] = req
-    print(f"💵 Created Budget Request #{next_budget_id} for Event #{event_id} ({amount} SEK)")
-    next_budget_id += 1
-
-@require_role(Role.FIN_MANAGER)
-def review_budget_request(args: List[str]):
-    if len(args) < 2:
-        print("Usage: review-budget-request <id> <approve|reject>")
-        return
+    req = BudgetRequest(BUDGET_IDS.allocate(), event_id, amount, reason)
+    BUDGET_REQUESTS[req.request_id] = req
+    journal.record(BudgetRequestOpened(req.request_id, event_id, amount, reason))
+    BUDGET_ANALYTICS.track(req)
+    BUDGET_LEDGER.track_request(req)
+    SEARCH.track_request(req)
+    BUDGET_VIEW.track(req)
+    print(f"💵 Created Budget Request #{req.request_id} for Event #{event_id} ({amount} SEK)")
+
+@COMMANDS.command("review-budget-request", Role.FIN_MANAGER,
+                  usage="review-budget-request <id> <approve|reject>", help="Approve or reject a budget request", min_args=2, mutates=True)
+def review_budget_request(user: Employee, args: List[str]):
     try:
         req_id = int(args[0])
         decision = args[1].lower()
@@ -459,12 +607,9 @@ def review_budget_request(args: List[str]):
     except Exception as e:
         print(f"❌ {e}")
 
-@require_role(Role.FIN_MANAGER)
-def negotiate_budget(args: List[str]):
-    global next_negotiation_id
-    if len(args) < 2:
-        print("Usage: negotiate-budget <request-id> <new-amount>")
-        return
+@COMMANDS.command("negotiate-budget", Role.FIN_MANAGER,
+                  usage="negotiate-budget <request-id> <new-amount>", help="Counter-offer a budget request", min_args=2, mutates=True)
+def negotiate_budget(user: Employee, args: List[str]):
     try:
         req_id = int(args[0])
         new_amount = float(args[1])
@@ -473,30 +618,452 @@ def negotiate_budget(args: List[str]):
             print(f"❌ No Budget Request #{req_id}.")
             return
 
-        negotiation = BudgetNegotiation(next_negotiation_id, req)
+        negotiation = BudgetNegotiation(NEGOTIATION_IDS.allocate(), req)
+        journal.record(NegotiationOpened(negotiation.negotiation_id, req_id))
         negotiation.counter_offer(new_amount)
-        BUDGET_NEGOTIATIONS[next_negotiation_id] = negotiation
-        print(f"💬 Negotiation #{next_negotiation_id}: Counter-offer set to {new_amount} SEK.")
-        next_negotiation_id += 1
+        BUDGET_NEGOTIATIONS[negotiation.negotiation_id] = negotiation
+        BUDGET_ANALYTICS.track_negotiation(negotiation)
+        BUDGET_LEDGER.track_negotiation(negotiation)
+        print(f"💬 Negotiation #{negotiation.negotiation_id}: Counter-offer set to {new_amount} SEK.")
     except Exception as e:
         print(f"❌ {e}")
 
-@require_role(Role.FIN_MANAGER, Role.MANAGER)
-def view_budget_requests(_: List[str]):
-    if not BUDGET_REQUESTS:
+@COMMANDS.command("view-budget-requests", Role.FIN_MANAGER, Role.MANAGER,
+                  usage="view-budget-requests [PENDING|APPROVED|REJECTED] [--after <id>] [--limit <n>]",
+                  help="View all budget requests")
+def view_budget_requests(user: Employee, args: List[str]):
+    try:
+        args, after, limit = parse_page(args)
+        status = parse_budget_status(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    key = ALL if status is None else status
+    print_page(lambda a, n: BUDGET_VIEW.iter_rows(key, a, n), after, limit, "No budget requests available.")
+
+def parse_budget_status(args: List[str]) -> BudgetRequestStatus | None:
+    if not args:
+        return None
+    try:
+        return BudgetRequestStatus[args[0].upper()]
+    except KeyError:
+        raise ValueError(f"Invalid status: {args[0]}. Use: {', '.join(s.name for s in BudgetRequestStatus)}")
+
+@COMMANDS.command("budget-summary", Role.FIN_MANAGER,
+                  usage="budget-summary", help="Totals, approval rate and counter-offers across budget requests")
+def budget_summary(user: Employee, _: List[str]):
+    if not len(BUDGET_ANALYTICS):
+        print("No budget requests available.")
+        return
+    print(f"Requests: {len(BUDGET_ANALYTICS)} | Total: {BUDGET_ANALYTICS.total():.2f} SEK")
+    for status, totals in BUDGET_ANALYTICS.by_status().items():
+        print(f"  {status.value:<10} {totals.count:>8} | {totals.amount:.2f} SEK")
+    print(f"Approval rate: {BUDGET_ANALYTICS.approval_rate():.1%}")
+    offers = BUDGET_ANALYTICS.counter_offers()
+    print(f"Counter-offers: {offers.count} | {offers.requested:.2f} -> {offers.offered:.2f} SEK ({offers.delta:+.2f})")
+
+@COMMANDS.command("budget-by-event", Role.FIN_MANAGER,
+                  usage="budget-by-event [PENDING|APPROVED|REJECTED]", help="Budget request totals per event")
+def budget_by_event(user: Employee, args: List[str]):
+    try:
+        totals = BUDGET_ANALYTICS.by_event(parse_budget_status(args))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    if not totals:
         print("No budget requests available.")
         return
-    for req in BUDGET_REQUESTS.values():
-        print(f"#{req.request_id} | Event #{req.event_id} | {req.amount} SEK | {req.status.value} | {req.reason}")
+    for event_id, amount in totals.items():
+        print(f"Event #{event_id} | {amount:.2f} SEK")
 
-def cli():
-    global CURRENT_USER
+@COMMANDS.command("budget-percentiles", Role.FIN_MANAGER,
+                  usage="budget-percentiles [PENDING|APPROVED|REJECTED]", help="p50/p90/p99 of budget request amounts")
+def budget_percentiles(user: Employee, args: List[str]):
+    try:
+        values = BUDGET_ANALYTICS.percentiles((50, 90, 99), parse_budget_status(args))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print(" | ".join(f"p{q}: {value:.2f} SEK" for q, value in values.items()))
+
+def print_event_budget(event_id: int, budget: EventBudget):
+    print(f"Event #{event_id} | Original: {budget.original:.2f} | Requested: {budget.requested:.2f} "
+          f"(negotiating {budget.negotiating:.2f}) | Approved: {budget.approved:.2f} | "
+          f"Committed: {budget.committed:.2f} | Worker asks: {budget.worker_asks:.2f} SEK")
+
+@COMMANDS.command("view-event-budget", Role.FIN_MANAGER,
+                  usage="view-event-budget [event-id]", help="Original, requested, approved and committed budget per event")
+def view_event_budget(user: Employee, args: List[str]):
+    if args:
+        try:
+            event_id = int(args[0])
+        except ValueError:
+            print("❌ Event ID must be a number.")
+            return
+        print_event_budget(event_id, BUDGET_LEDGER.get(event_id))
+        return
+    budgets = BUDGET_LEDGER.events()
+    if not budgets:
+        print("No event budgets available.")
+        return
+    for event_id, budget in budgets.items():
+        print_event_budget(event_id, budget)
 
+# ---------------------------------------------------------------------
+# Bulk import / export
+# ---------------------------------------------------------------------
+def run_import(args: List[str], kind: str, create: Callable[[List[tuple]], Iterable[Tuple[int, str]]]):
+    # Imports are not logged: replaying one would read the file again, which
+    # may have changed or gone since. Whatever was created is snapshotted
+    # instead, so the log never depends on the file.
+    created = False
+    def create_rows(rows: List[tuple]) -> Iterable[Tuple[int, str]]:
+        nonlocal created
+        created = True
+        return create(rows)
+    try:
+        rest, options = parse_options(args, "--workers", "--chunk-size")
+        report = bulk.import_file(rest[0], kind, create_rows, options.get("--chunk-size", 10_000), options.get("--workers", 0))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    finally:
+        if created:
+            STORAGE.mark_changed()
+            save_snapshot()
+    print(f"📥 Imported {report.imported} {kind} ({len(report.rejected)} rejected) in {report.seconds:.2f}s "
+          f"({report.rows_per_sec:,.0f} rows/sec)")
+    for line, reason in report.rejected[:10]:
+        print(f"  line {line}: {reason}")
+    if len(report.rejected) > 10:
+        print(f"  ... and {len(report.rejected) - 10} more")
+
+def run_export(path: str, fields: Tuple[str, ...], rows: Iterable[Tuple[Any, ...]]):
+    started = time.perf_counter()
+    try:
+        written = bulk.export_file(path, fields, rows)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    print(f"📤 Exported {written} rows to {path} in {time.perf_counter() - started:.2f}s")
+
+IMPORT_USAGE = "<file.csv|file.jsonl> [--workers <n>] [--chunk-size <n>]"
+
+@COMMANDS.command("import-applications", Role.CS_WORKER,
+                  usage=f"import-applications {IMPORT_USAGE}", help="Create event applications from a file", min_args=1)
+def import_applications(user: Employee, args: List[str]):
+    def create(rows: List[tuple]) -> List[Tuple[int, str]]:
+        for app in SYSTEM.create_many(rows, user.role):
+            BUDGET_LEDGER.track_application(app)
+            SEARCH.track_application(app)
+        return []
+    run_import(args, "applications", create)
+
+@COMMANDS.command("import-tasks", Role.MANAGER,
+                  usage=f"import-tasks {IMPORT_USAGE}", help="Create tasks in your department from a file", min_args=1)
+def import_tasks(user: Employee, args: List[str]):
+    manager: Manager = user  # type: ignore
+    def create(rows: List[tuple]) -> List[Tuple[int, str]]:
+        refused = [(i, f"No event found with ID {row[0]}") for i, row in enumerate(rows) if row[0] not in SYSTEM]
+        if refused:
+            skip = {i for i, _ in refused}
+            rows = [row for i, row in enumerate(rows) if i not in skip]
+        for task in manager.create_tasks(rows):
+            BUDGET_LEDGER.track_task(task)
+            TASK_VIEW.track(task)
+            SCHEDULE.track(task)
+            SEARCH.track_task(task)
+        return refused
+    run_import(args, "tasks", create)
+
+@COMMANDS.command("import-budget-requests", Role.MANAGER,
+                  usage=f"import-budget-requests {IMPORT_USAGE}", help="Create budget requests from a file", min_args=1)
+def import_budget_requests(user: Employee, args: List[str]):
+    def create(rows: List[tuple]) -> List[Tuple[int, str]]:
+        for request_id, (event_id, amount, reason) in zip(BUDGET_IDS.reserve(len(rows)), rows):
+            req = BudgetRequest(request_id, event_id, amount, reason)
+            BUDGET_REQUESTS[request_id] = req
+            journal.record(BudgetRequestOpened(request_id, event_id, amount, reason))
+            BUDGET_ANALYTICS.track(req)
+            BUDGET_LEDGER.track_request(req)
+            SEARCH.track_request(req)
+            BUDGET_VIEW.track(req)
+        return []
+    run_import(args, "budget-requests", create)
+
+@COMMANDS.command("export-applications", Role.CS_WORKER, Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER,
+                  usage="export-applications <file.csv|file.jsonl>", help="Write all event applications to a file", min_args=1)
+def export_applications(user: Employee, args: List[str]):
+    run_export(args[0], ("app_id", *bulk.APPLICATION_FIELDS, "status", "created_by"),
+               ((a.app_id, a.client_name, a.event_type, a.start_date, a.end_date, a.budget, a.preferences, a.status,
+                 a.created_by) for a in SYSTEM.iter_applications()))
+
+@COMMANDS.command("export-tasks", Role.MANAGER,
+                  usage="export-tasks <file.csv|file.jsonl>", help="Write your tasks to a file", min_args=1)
+def export_tasks(user: Employee, args: List[str]):
+    manager: Manager = user  # type: ignore
+    run_export(args[0], ("task_id", *bulk.TASK_FIELDS, "department", "status"),
+               ((t.task_id, t.event_id, t.title, t.description, t.department, t.status) for t in list(manager.tasks)))
+
+@COMMANDS.command("export-budget-requests", Role.FIN_MANAGER, Role.MANAGER,
+                  usage="export-budget-requests <file.csv|file.jsonl>", help="Write all budget requests to a file", min_args=1)
+def export_budget_requests(user: Employee, args: List[str]):
+    run_export(args[0], ("request_id", *bulk.BUDGET_REQUEST_FIELDS, "requested_amount", "status"),
+               ((r.request_id, r.event_id, r.amount, r.reason, r.requested_amount, r.status)
+                for r in by_id(BUDGET_REQUESTS, 0, BUDGET_IDS.next_id)))
+
+APPLICATION_READERS = (Role.CS_WORKER, Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER)
+BUDGET_REQUEST_READERS = (Role.FIN_MANAGER, Role.MANAGER)
+
+def can_read(user: Employee, doc: Document) -> bool:
+    if doc.kind == APPLICATION:
+        return user.role in APPLICATION_READERS
+    if doc.kind == BUDGET_REQUEST:
+        return user.role in BUDGET_REQUEST_READERS
+    task = TASKS.get(doc.id)
+    return task is not None and (TASKS.manager_of(task) is user or user in task.assigned_workers)
+
+def describe(doc: Document) -> str:
+    if doc.kind == APPLICATION:
+        app = SYSTEM.get_application_by_id(doc.id)
+        return f"Application #{app.app_id} | {app.client_name} - {app.event_type} | {app.preferences}"
+    if doc.kind == BUDGET_REQUEST:
+        req = BUDGET_REQUESTS[doc.id]
+        return f"Budget Request #{req.request_id} | Event #{req.event_id} | {req.reason}"
+    task = TASKS.get(doc.id)
+    if doc.kind == TASK_COMMENT:
+        c = task.comments[doc.position]
+        return f"Task '{task.title}' (Event #{task.event_id}) | comment by {c.worker}: {c.comment}"
+    ask = task.budget_requests[doc.position]
+    return f"Task '{task.title}' (Event #{task.event_id}) | {ask.amount} SEK asked by {ask.worker}: {ask.reason}"
+
+@COMMANDS.command("search", *APPLICATION_READERS, Role.MANAGER, Role.WORKER,
+                  usage="search <words> [--limit <n>]",
+                  help="Find applications, budget requests and task notes containing words starting with <words>",
+                  min_args=1)
+def search(user: Employee, args: List[str]):
+    try:
+        words, options = parse_options(args, "--limit")
+        hits = SEARCH.search(" ".join(words), options.get("--limit", 10), lambda doc: can_read(user, doc))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    if not hits:
+        print("No matches found.")
+        return
+    for _, doc in hits:
+        print(f"- {describe(doc)}")
+
+def describe_work(item: WorkItem) -> str:
+    if item.kind == APPLICATION_ITEM:
+        app = SYSTEM.get_application_by_id(item.id)
+        return f"Application #{app.app_id} | {app.client_name} - {app.event_type} | starts {app.start_date:%Y-%m-%d} | {app.status.value}"
+    if item.kind == HR_ITEM:
+        req = HR_REQUESTS[item.id]
+        return f"HR Request #{req.request_id} | {req.type} | {req.status.value}"
+    budget = BUDGET_REQUESTS[item.id]
+    return f"Budget Request #{budget.request_id} | Event #{budget.event_id} | {budget.amount} SEK | {budget.reason}"
+
+@COMMANDS.command("my-queue", Role.CS_MANAGER, Role.FIN_MANAGER, Role.ADM_MANAGER, Role.HR_MANAGER, Role.HR_WORKER,
+                  usage="my-queue [peek|pop] [--limit <n>]",
+                  help="Show (or take) what is waiting for your role, soonest event first")
+def my_queue(user: Employee, args: List[str]):
+    try:
+        args, options = parse_options(args, "--limit")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    mode = args[0].lower() if args else "peek"
+    if mode not in ("peek", "pop"):
+        print("❌ Use: my-queue [peek|pop] [--limit <n>]")
+        return
+    limit = options.get("--limit", 10)
+    items = WORK_QUEUES.pop(user.role, limit) if mode == "pop" else WORK_QUEUES.peek(user.role, limit)
+    if not items:
+        print("📭 Nothing is waiting for you.")
+        return
+    for item in items:
+        print(f"- {describe_work(item)}")
+    remaining = WORK_QUEUES.count(user.role)
+    if remaining > (0 if mode == "pop" else len(items)):
+        print(f"-- {remaining} waiting in total")
+
+# ---------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------
+def snapshot_state() -> Dict[str, Any]:
+    return {
+        "users": USERS,
+        "system": SYSTEM,
+        "hr_requests": HR_REQUESTS,
+        "budget_requests": BUDGET_REQUESTS,
+        "budget_negotiations": BUDGET_NEGOTIATIONS,
+        "next_ids": (HR_IDS.next_id, BUDGET_IDS.next_id, NEGOTIATION_IDS.next_id),
+    }
+
+def restore_state(state: Dict[str, Any]) -> None:
+    global USERS, SYSTEM, TASKS, HR_REQUESTS, BUDGET_REQUESTS, BUDGET_NEGOTIATIONS, BUDGET_ANALYTICS, BUDGET_LEDGER
+    global TASK_VIEW, HR_VIEW, BUDGET_VIEW, SCHEDULE, ASSIGNMENT, SEARCH, WORK_QUEUES
+    global HR_IDS, BUDGET_IDS, NEGOTIATION_IDS, JOURNAL
+    USERS = state["users"]
+    tasks = [t for user in USERS.values() if isinstance(user, Manager) for t in user.tasks]
+    TASKS = TaskRegistry()
+    for user in USERS.values():
+        if isinstance(user, Manager):
+            TASKS.adopt(user)
+    SYSTEM = state["system"]
+    HR_REQUESTS = state["hr_requests"]
+    BUDGET_REQUESTS = state["budget_requests"]
+    BUDGET_NEGOTIATIONS = state["budget_negotiations"]
+    BUDGET_ANALYTICS = BudgetAnalytics()
+    BUDGET_ANALYTICS.rebuild(BUDGET_REQUESTS.values(), BUDGET_NEGOTIATIONS.values())
+    BUDGET_LEDGER = BudgetLedger()
+    # A mapped snapshot gives the application budgets as a column, so the
+    # applications need not be built to fill the ledger.
+    budgets = state.get("budgets")
+    if budgets is not None:
+        BUDGET_LEDGER.use_originals(budgets)
+    BUDGET_LEDGER.rebuild(SYSTEM.applications if budgets is None else (), BUDGET_REQUESTS.values(),
+                          BUDGET_NEGOTIATIONS.values(), tasks)
+    TASK_VIEW, HR_VIEW, BUDGET_VIEW = build_views()
+    TASK_VIEW.rebuild(tasks)
+    SCHEDULE = Schedule(event_dates)
+    TASKS.schedule = SCHEDULE
+    ASSIGNMENT = AssignmentEngine(SCHEDULE)
+    ASSIGNMENT.rebuild(u for u in USERS.values() if isinstance(u, Worker))
+    for task in tasks:
+        SCHEDULE.track(task)
+    # Indexing reads every text, which would undo a mapped snapshot's lazy
+    # start; the restored documents are indexed on the first search instead.
+    SEARCH = search = SearchIndex()
+    system, requests = SYSTEM, BUDGET_REQUESTS
+    search.defer(lambda: search.rebuild(system.applications, list(requests.values()), tasks))
+    # Only applications still under review can be waiting for anyone.
+    WORK_QUEUES = queues = WorkQueues(event_dates)
+    SYSTEM.on_change = queues.track_application
+    reviewing = (EventApplicationStatus.PENDING_REVIEW, EventApplicationStatus.FORWARDED, EventApplicationStatus.APPROVED)
+    hr_requests = HR_REQUESTS
+    queues.defer(lambda: queues.rebuild((a for s in reviewing for a in system.query(status=s)),
+                                        list(hr_requests.values()), list(requests.values())))
+    HR_VIEW.rebuild(HR_REQUESTS.values())
+    BUDGET_VIEW.rebuild(BUDGET_REQUESTS.values())
+    HR_IDS, BUDGET_IDS, NEGOTIATION_IDS = (IdAllocator(start) for start in state["next_ids"])
+
+    # The journal restarts here; checkpoint the restored state so it can still
+    # be rebuilt from the journal alone. A snapshot that can be decoded again
+    # is only serialized if the checkpoint is read before a newer one replaces it.
+    JOURNAL = Journal()
+    reload = state.get("reload")
+    if reload is None:
+        domain_state(state).checkpoint(JOURNAL)
+    else:
+        JOURNAL.save_checkpoint(0, lambda: domain_state(reload()).snapshot())
+    journal.install(JOURNAL)
+
+def domain_state(state: Dict[str, Any], seq: int = 0) -> DomainState:
+    tasks = [t for user in state["users"].values() if isinstance(user, Manager) for t in user.tasks]
+    return DomainState.of(state["system"], state["hr_requests"], state["budget_requests"],
+                          state["budget_negotiations"], tasks, seq)
+
+def record_mutation(email: str, cmd: str, args: List[str], at: datetime) -> None:
+    STORAGE.append({"user": email, "cmd": cmd, "args": args, "at": at.isoformat()})
+    # Without auto-commit the caller (the server) snapshots off the request path.
+    if STORAGE.auto_commit and STORAGE.needs_snapshot:
+        save_snapshot()
+
+def save_snapshot() -> None:
+    STORAGE.write_snapshot(snapshot_state())
+    # The snapshot now covers every event recorded so far, so it serves as the
+    # journal's checkpoint: nothing is serialized for it unless it is read, and
+    # the events it covers are dropped. It is replaced along with the snapshot.
+    if not isinstance(STORAGE, MemoryStorage):
+        storage, seq = STORAGE, JOURNAL.last_seq
+        JOURNAL.save_checkpoint(seq, lambda: domain_state(storage.read_snapshot(), seq).snapshot(), compact=True)
+
+def open_storage(storage: Storage) -> int:
+    """Restore the last snapshot from `storage` and replay the log tail after it."""
+    global STORAGE
+    STORAGE = storage
+    state, records = storage.load()
+    if state is not None:
+        restore_state({"reload": storage.read_snapshot, **state})
+
+    # Replayed commands run exactly as they did originally, minus the output,
+    # and at the time they were logged (records from older logs carry none).
+    with contextlib.redirect_stdout(io.StringIO()):
+        for record in records:
+            at = datetime.fromisoformat(record["at"]) if "at" in record else clock.now()
+            with clock.pinned(at):
+                COMMANDS.dispatch(USERS[record["user"]], record["cmd"], record["args"])
+    return len(records)
+
+def close_storage() -> None:
+    STORAGE.write_snapshot(snapshot_state())
+    STORAGE.close()
+
+def execute(session: Session, cmd: str, args: List[str], interactive: bool = True) -> bool:
+    """Run one command for `session`. Returns False when the session ends."""
+    # Pre-authentication.
+    if session.user is None:
+        match cmd:
+            case "help" | "?":
+                show_help(None)
+
+            case "quit" | "exit":
+                print("👋 Goodbye!")
+                return False
+
+            case "login":
+                if args:
+                    email = args[0]
+                elif interactive:
+                    email = input("Enter your email to login: ")
+                else:
+                    print("Usage: login <email>")
+                    return True
+
+                user = USERS.get(email)
+                if not user:
+                    print("❌ User not found.\n")
+                    return True
+                session.login(email, user)
+
+                if isinstance(user, (Manager, Worker)):
+                    print(f"✅ Logged in as {user.name} ({user.department.value} {user.__class__.__name__})\n")
+                else:
+                    print(f"✅ Logged in as {user.name} ({user.__class__.__name__}, {user.role.value})\n")
+
+            case _:
+                print("❓ Unknown command. Type 'help' for options.")
+        return True
+
+    # Post-authentication.
+    match cmd:
+        case "help" | "?":
+            show_help(session.user.role)
+
+        case "logout":
+            print("👋 Logged out\n")
+            session.logout()
+
+        case "quit" | "exit":
+            print("👋 Goodbye!\n")
+            return False
+
+        case _:
+            # Everything the command stamps gets one time, logged with it for replay.
+            with clock.pinned(clock.now()) as at:
+                command = COMMANDS.dispatch(session.user, cmd, args)
+            if command is not None and command.mutates:
+                record_mutation(session.email, cmd, args, at)
+    return True
+
+def cli():
     print("\nSEP Internal System CLI ⚙️")
     print("Type 'help' to see available commands.\n")
 
     while True:
-        prompt = f"[{CURRENT_USER.name}] > " if CURRENT_USER else "> "
+        prompt = f"[{SESSION.user.name}] > " if SESSION.user else "> "
         try:
             raw = input(prompt).strip()
         except (EOFError, KeyboardInterrupt):
@@ -507,80 +1074,88 @@ def cli():
             continue
 
         parts = shlex.split(raw)
-        cmd, args = parts[0].lower(), parts[1:]
+        # The log is committed in groups as records are appended, and once more
+        # when the storage is closed on exit.
+        keep_going = execute(SESSION, parts[0].lower(), parts[1:])
+        if not keep_going:
+            break
 
-        # Pre-authentication.
-        if CURRENT_USER is None:
-            match cmd:
-                case "help" | "?":
-                    show_help(None)
-                    continue
+def run_batch(lines: Iterable[str], out: TextIO, flush_bytes: int = 64 * 1024) -> LatencyRecorder:
+    """Run commands from `lines` without prompting, buffering their output into `out`.
 
-                case "quit" | "exit":
-                    print("👋 Goodbye!")
-                    break
+    A command that fails is reported in the output and the batch goes on."""
+    stats = LatencyRecorder()
+    buffer = io.StringIO()
+    clock = time.perf_counter
 
-                case "login":
-                    if not args:
-                        email = input("Enter your email to login: ")
-                    else:
-                        email = args[0]
-
-                    CURRENT_USER = USERS.get(email)
-                    if not CURRENT_USER:
-                        print("❌ User not found.\n")
-                        continue
-
-                    if isinstance(CURRENT_USER, (Manager, Worker)):
-                        print(f"✅ Logged in as {CURRENT_USER.name} ({CURRENT_USER.department.value} {CURRENT_USER.__class__.__name__})\n")
-                    else:
-                        print(f"✅ Logged in as {CURRENT_USER.name} ({CURRENT_USER.__class__.__name__}, {CURRENT_USER.role.value})\n")
+    try:
+        with contextlib.redirect_stdout(buffer):
+            for line in lines:
+                raw = line.strip()
+                if not raw or raw.startswith("#"):
                     continue
 
-                case _:
-                    print("❓ Unknown command. Type 'help' for options.")
+                started = clock()
+                try:
+                    parts = shlex.split(raw)
+                except ValueError as e:
+                    print(f"❌ {e}")
                     continue
-        
-        # Post-authentication.
-        match cmd:
-            case "help" | "?":
-                show_help(CURRENT_USER.role)
-                continue
-
-            case "logout":
-                print("👋 Logged out\n")
-                CURRENT_USER = None
-                continue
-            
-            case "quit" | "exit":
-                print("👋 Goodbye!\n")
-                break
-
-            case "create-event-application": create_event_application(args)
-            case "view-event-application": view_event_application(args)
-            case "review-event-application": review_event_application(args)
-            case "create-task": create_task(args)
-            case "assign-task": assign_task(args)
-            case "view-tasks": view_tasks(args)
-            case "comment-on-task": comment_on_task(args)
-            case "update-task-status": update_task_status(args)
-            case "review-task": review_task(args)
-            case "create-hr-request": create_hr_request(args)
-            case "review-hr-request": review_hr_request(args)
-            case "hire-staff": hire_staff(args)
-            case "view-hr-requests": view_hr_requests(args)
-            case "create-budget-request": create_budget_request(args)
-            case "review-budget-request": review_budget_request(args)
-            case "negotiate-budget": negotiate_budget(args)
-            case "view-budget-requests": view_budget_requests(args)
-
-            case _:
-                print("❓ Unknown command. Type 'help' for options.")
-                continue
-                
+                cmd = parts[0].lower()
+                try:
+                    keep_going = execute(SESSION, cmd, parts[1:], interactive=False)
+                except Exception as e:
+                    print(f"❌ {e}")
+                    keep_going = True
+                stats.record(cmd, clock() - started)
+
+                if buffer.tell() >= flush_bytes:
+                    out.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+                if not keep_going:
+                    break
+    finally:
+        out.write(buffer.getvalue())
+        out.flush()
+    STORAGE.commit()
+    stats.stop()
+    return stats
 
 def main():
-    cli()
+    parser = argparse.ArgumentParser(description="SEP Internal System CLI")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--data-dir", help="keep state in this directory between sessions")
+    backend.add_argument("--sqlite", metavar="PATH", help="keep state in this SQLite database between sessions")
+    parser.add_argument("--snapshot-format", choices=("pickle", "binary"), default="pickle",
+                        help="snapshot format for --data-dir; binary snapshots are memory-mapped and load lazily")
+    parser.add_argument("--batch", metavar="FILE", help="run commands from FILE ('-' for stdin) instead of prompting")
+    parser.add_argument("--quiet", action="store_true", help="discard command output in batch mode")
+    options = parser.parse_args()
+
+    storage: Storage | None = None
+    if options.data_dir:
+        storage = (MappedFileStorage if options.snapshot_format == "binary" else FileStorage)(options.data_dir)
+    elif options.sqlite:
+        storage = SQLiteStorage(options.sqlite)
+
+    if storage is not None:
+        replayed = open_storage(storage)
+        if replayed:
+            print(f"♻️  Recovered {replayed} operations from the write-ahead log.")
+    try:
+        if options.batch:
+            out = open(os.devnull, "w") if options.quiet else sys.stdout
+            if options.batch == "-":
+                stats = run_batch(sys.stdin, out)
+            else:
+                with open(options.batch, encoding="utf-8") as f:
+                    stats = run_batch(f, out)
+            print("\n".join(stats.report()), file=sys.stderr)
+        else:
+            cli()
+    finally:
+        close_storage()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
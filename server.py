@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import shlex
+import sys
+import time
+from typing import Optional, Tuple
+
+import main
+from src import FileStorage, MappedFileStorage, SQLiteStorage
+from src.commands import Session
+from src.metrics import LatencyRecorder
+
+# Marks the end of one command's output on the wire.
+END_OF_RESPONSE = b"\x04\n"
+
+def run_line(session: Session, raw: str) -> Tuple[str, bool]:
+    """Run one command line for `session`, returning its output and whether to keep the connection.
+
+    A command that fails is answered with its error; the session stays open."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            parts = shlex.split(raw)
+            keep_going = main.execute(session, parts[0].lower(), parts[1:], interactive=False)
+        except Exception as e:
+            print(f"❌ {e}")
+            keep_going = True
+    return buffer.getvalue(), keep_going
+
+class GroupCommit:
+    """Syncs the storage log once per `interval` on a worker thread.
+
+    A command that logged records is answered only after the commit covering
+    it has been fsync'ed, so an acknowledged command survives a crash; every
+    command of one tick shares that commit. Snapshots falling due are taken
+    on a worker thread too. The state must not change while it is written, so
+    commands wait on `commands` meanwhile, but the loop keeps reading requests
+    and sending the replies of commands already run."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval: float = interval
+        # Held while a command runs or a snapshot is written.
+        self.commands: asyncio.Lock = asyncio.Lock()
+        self._next: Optional[asyncio.Future] = None
+
+    def durable(self) -> asyncio.Future:
+        """Resolves once everything logged so far is on disk."""
+        if self._next is None:
+            self._next = asyncio.get_running_loop().create_future()
+        return self._next
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            # Commands run on this loop, so every record the waiters logged is
+            # already buffered and goes out with this commit; later ones wait
+            # for the next.
+            waiters, self._next = self._next, None
+            try:
+                await loop.run_in_executor(None, main.STORAGE.commit)
+            except Exception as e:
+                if waiters is not None:
+                    waiters.set_exception(e)
+                continue
+            if waiters is not None:
+                waiters.set_result(None)
+            if main.STORAGE.needs_snapshot:
+                async with self.commands:
+                    try:
+                        await loop.run_in_executor(None, main.save_snapshot)
+                    except Exception as e:
+                        # The log still holds every record; retry on a later tick.
+                        print(f"❌ Snapshot failed: {e}", file=sys.stderr)
+
+# The running server's group commit; None when the log commits itself.
+GROUP_COMMIT: Optional[GroupCommit] = None
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # Commands run synchronously on the event loop thread, so each one finishes
+    # before any other session's command starts: mutations on the shared
+    # SYSTEM and request dicts never interleave.
+    session = Session()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            raw = line.decode().strip()
+            if not raw:
+                continue
+            if GROUP_COMMIT is None:
+                output, keep_going = run_line(session, raw)
+            else:
+                async with GROUP_COMMIT.commands:
+                    logged = main.STORAGE.records_since_snapshot
+                    output, keep_going = run_line(session, raw)
+                    durable = GROUP_COMMIT.durable() if main.STORAGE.records_since_snapshot != logged else None
+                if durable is not None:
+                    try:
+                        await durable
+                    except Exception as e:
+                        output += f"❌ Not saved: {e}\n"
+            writer.write(output.encode() + END_OF_RESPONSE)
+            await writer.drain()
+            if not keep_going:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+async def serve(host: str, port: int, commit_interval: float = 0.05) -> None:
+    global GROUP_COMMIT
+    main.STORAGE.auto_commit = False
+    GROUP_COMMIT = GroupCommit(commit_interval)
+    server = await asyncio.start_server(handle_client, host, port, limit=1 << 20)
+    flusher = asyncio.create_task(GROUP_COMMIT.run())
+    address = server.sockets[0].getsockname()
+    print(f"SEP server listening on {address[0]}:{address[1]}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        flusher.cancel()
+        GROUP_COMMIT = None
+        main.STORAGE.auto_commit = True
+
+# ---------------------------------------------------------------------
+# Load generator
+# ---------------------------------------------------------------------
+async def load_client(host: str, port: int, index: int, commands: int, stats: LatencyRecorder) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(line: str) -> str:
+        started = time.perf_counter()
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+        response = await reader.readuntil(END_OF_RESPONSE)
+        stats.record(line.split(" ", 1)[0], time.perf_counter() - started)
+        return response.decode()
+
+    await call("login sarah@sep.se")
+    for i in range(commands):
+        if i % 2 == 0:
+            await call(f'create-event-application "Load {index}-{i}" Workshop 2025-12-01 2025-12-02 1000 loadgen')
+        else:
+            await call("view-event-application 1")
+    await call("quit")
+    writer.close()
+    await writer.wait_closed()
+
+async def load_test(host: str, port: int | None, clients: int, commands: int) -> LatencyRecorder:
+    server = None
+    if port is None:
+        server = await asyncio.start_server(handle_client, "127.0.0.1", 0)
+        host, port = "127.0.0.1", server.sockets[0].getsockname()[1]
+
+    stats = LatencyRecorder()
+    await asyncio.gather(*(load_client(host, port, i, commands, stats) for i in range(clients)))
+    stats.stop()
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    return stats
+
+def cli_main() -> None:
+    parser = argparse.ArgumentParser(description="SEP multi-user server")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    serve_parser = sub.add_parser("serve", help="accept TCP connections, one session per connection")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8707)
+    backend = serve_parser.add_mutually_exclusive_group()
+    backend.add_argument("--data-dir", help="keep state in this directory between runs")
+    backend.add_argument("--sqlite", metavar="PATH", help="keep state in this SQLite database between runs")
+    serve_parser.add_argument("--snapshot-format", choices=("pickle", "binary"), default="pickle",
+                              help="snapshot format for --data-dir")
+
+    load_parser = sub.add_parser("loadgen", help="measure throughput with many concurrent sessions")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, help="target a running server (default: start one in-process)")
+    load_parser.add_argument("--clients", type=int, default=200)
+    load_parser.add_argument("--commands", type=int, default=50, help="commands per client")
+
+    options = parser.parse_args()
+    if options.mode == "loadgen":
+        stats = asyncio.run(load_test(options.host, options.port, options.clients, options.commands))
+        print("\n".join(stats.report()))
+        return
+
+    if options.data_dir:
+        main.open_storage((MappedFileStorage if options.snapshot_format == "binary" else FileStorage)(options.data_dir))
+    elif options.sqlite:
+        main.open_storage(SQLiteStorage(options.sqlite))
+    try:
+        asyncio.run(serve(options.host, options.port))
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down", file=sys.stderr)
+    finally:
+        main.close_storage()
+
+if __name__ == "__main__":
+    cli_main()
@@ -1,5 +1,9 @@
 from .models import Employee, Role
 from .event_request import EventApplication, EventSystem, EventApplicationStatus
-from .task_distribution import Manager, Worker, Task, Department, TaskStatus, Comment, InternalBudgetRequest
+from .history import HistoryEntry, HistoryStore
+from .task_distribution import Manager, Worker, Task, TaskRegistry, Department, TaskStatus, Comment, InternalBudgetRequest
 from .staff_recruitment import HRRequest, HRRequestStatus
 from .financial_request import BudgetRequest, BudgetRequestStatus, BudgetNegotiation, BudgetNegotiationStatus
+from .storage import Storage, MemoryStorage, FileStorage
+from .sqlite_storage import SQLiteStorage
+from .mapped_storage import MappedFileStorage
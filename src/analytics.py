@@ -0,0 +1,126 @@
+from array import array
+from itertools import compress
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .concurrency import Lockable
+from .financial_request import BudgetNegotiation, BudgetRequest, BudgetRequestStatus
+from .metrics import percentile
+
+STATUSES: List[BudgetRequestStatus] = list(BudgetRequestStatus)
+STATUS_CODES: Dict[BudgetRequestStatus, int] = {status: code for code, status in enumerate(STATUSES)}
+
+class StatusTotals(NamedTuple):
+    count: int
+    amount: float
+
+class CounterOfferSummary(NamedTuple):
+    count: int
+    requested: float
+    offered: float
+
+    @property
+    def delta(self) -> float:
+        return self.offered - self.requested
+
+class BudgetAnalytics(Lockable):
+    """Budget request figures kept column-wise, one row per request.
+
+    Rows are updated in place by listening to each request, and
+    queries are whole-column passes (sum/map/compress/sorted) rather than a
+    walk over the request objects."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._rows: Dict[int, int] = {}
+        self._event_ids = array("q")
+        self._requested = array("d")
+        self._amounts = array("d")
+        self._statuses = array("B")
+        self._negotiated = bytearray()
+        # Row offsets per event, so group-by-event only touches that event's rows.
+        self._event_rows: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def track(self, request: BudgetRequest) -> None:
+        with self._lock:
+            if request.request_id in self._rows:
+                raise ValueError(f"Budget Request #{request.request_id} is already tracked")
+            row = self._rows[request.request_id] = len(self._event_ids)
+            self._event_ids.append(request.event_id)
+            self._requested.append(request.requested_amount)
+            self._amounts.append(request.amount)
+            self._statuses.append(STATUS_CODES[request.status])
+            self._negotiated.append(0)
+            self._event_rows.setdefault(request.event_id, array("L")).append(row)
+        request.add_listener(self._changed)
+
+    def track_negotiation(self, negotiation: BudgetNegotiation) -> None:
+        with self._lock:
+            self._negotiated[self._rows[negotiation.request.request_id]] = 1
+
+    def rebuild(self, requests: Iterable[BudgetRequest], negotiations: Iterable[BudgetNegotiation] = ()) -> None:
+        for request in requests:
+            self.track(request)
+        for negotiation in negotiations:
+            self.track_negotiation(negotiation)
+
+    def _changed(self, request: BudgetRequest) -> None:
+        with self._lock:
+            row = self._rows[request.request_id]
+            self._amounts[row] = request.amount
+            self._statuses[row] = STATUS_CODES[request.status]
+
+    def _status_mask(self, status: BudgetRequestStatus) -> Iterable[bool]:
+        return map(STATUS_CODES[status].__eq__, self._statuses)
+
+    # -- Queries ----------------------------------------------------------
+    def total(self, status: Optional[BudgetRequestStatus] = None) -> float:
+        with self._lock:
+            if status is None:
+                return sum(self._amounts)
+            return sum(compress(self._amounts, self._status_mask(status)))
+
+    def by_status(self) -> Dict[BudgetRequestStatus, StatusTotals]:
+        with self._lock:
+            return {
+                status: StatusTotals(self._statuses.count(code), sum(compress(self._amounts, self._status_mask(status))))
+                for status, code in STATUS_CODES.items()
+            }
+
+    def by_event(self, status: Optional[BudgetRequestStatus] = None) -> Dict[int, float]:
+        with self._lock:
+            amounts = self._amounts.__getitem__
+            if status is None:
+                return {event_id: sum(map(amounts, rows)) for event_id, rows in sorted(self._event_rows.items())}
+            code = STATUS_CODES[status]
+            statuses = self._statuses.__getitem__
+            totals = {}
+            for event_id, rows in sorted(self._event_rows.items()):
+                total = sum(compress(map(amounts, rows), map(code.__eq__, map(statuses, rows))))
+                if total:
+                    totals[event_id] = total
+            return totals
+
+    def approval_rate(self) -> float:
+        """Share of decided requests that were approved; 0.0 before any decision."""
+        with self._lock:
+            approved = self._statuses.count(STATUS_CODES[BudgetRequestStatus.APPROVED])
+            rejected = self._statuses.count(STATUS_CODES[BudgetRequestStatus.REJECTED])
+        decided = approved + rejected
+        return approved / decided if decided else 0.0
+
+    def percentiles(self, qs: Iterable[float], status: Optional[BudgetRequestStatus] = None) -> Dict[float, float]:
+        with self._lock:
+            amounts = self._amounts if status is None else compress(self._amounts, self._status_mask(status))
+            ordered = sorted(amounts)
+        return {q: percentile(ordered, q) for q in qs}
+
+    def counter_offers(self) -> CounterOfferSummary:
+        with self._lock:
+            return CounterOfferSummary(
+                self._negotiated.count(1),
+                sum(compress(self._requested, self._negotiated)),
+                sum(compress(self._amounts, self._negotiated)),
+            )
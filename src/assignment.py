@@ -0,0 +1,117 @@
+import threading
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Collection, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .concurrency import Lockable
+from .scheduling import Period, Schedule
+from .task_distribution import Department, Manager, Task, Worker
+
+# (load, name, sequence number, worker). Ties go by name, so replaying logged
+# commands on restored state picks the same workers; the sequence number
+# tells current entries from stale ones.
+HeapEntry = Tuple[int, str, int, Worker]
+
+class AssignmentEngine(Lockable):
+    """Picks the least loaded free workers for a task.
+
+    A worker's load is the number of their assigned tasks that are not
+    closed, as tracked by `schedule`, which also says who is booked at an
+    overlapping event. Workers wait in one heap per department and one per
+    (department, duty), ordered by load. A load change pushes a new entry
+    instead of re-sorting; older entries are skipped when popped. Workers
+    found busy are parked beside the heap for as long as picks are for the
+    same event, so assigning many tasks of one event costs O(log w) each."""
+
+    def __init__(self, schedule: Schedule) -> None:
+        super().__init__()
+        self.schedule = schedule
+        schedule.on_change = self._push
+        self._heaps: Dict[Hashable, List[HeapEntry]] = {}
+        self._sequence = count()
+        self._latest: Dict[Worker, int] = {}
+        # Per heap: the (period, event) of the last pick and the entries it found busy.
+        self._parked: Dict[Hashable, Tuple[Tuple[Optional[Period], Optional[int]], List[HeapEntry]]] = {}
+
+    @property
+    def _lock(self) -> threading.RLock:
+        # Load changes arrive from the schedule with its lock held, and picks
+        # ask it who is busy; sharing one lock keeps the two in step.
+        return self.schedule._lock
+
+    @staticmethod
+    def _keys(worker: Worker) -> Tuple[Hashable, Hashable]:
+        return worker.department, (worker.department, worker.duty.casefold())
+
+    def add_worker(self, worker: Worker) -> None:
+        with self._lock:
+            self.schedule.add_worker(worker)
+            if worker not in self._latest:
+                self._push(worker)
+
+    def rebuild(self, workers: Iterable[Worker]) -> None:
+        for worker in workers:
+            self.add_worker(worker)
+
+    def load(self, worker: Worker) -> int:
+        return self.schedule.load(worker)
+
+    def _push(self, worker: Worker) -> None:
+        sequence = self._latest[worker] = next(self._sequence)
+        entry = (self.schedule.load(worker), worker.name, sequence, worker)
+        for key in self._keys(worker):
+            heap = self._heaps.setdefault(key, [])
+            heappush(heap, entry)
+            # Drop stale entries once they outnumber the workers.
+            if len(heap) > 2 * len(self._latest) + 64:
+                heap[:] = [e for e in heap if self._latest[e[3]] == e[2]]
+                heapify(heap)
+
+    def pick(self, department: Department, needed: int = 1, duty: Optional[str] = None,
+             period: Optional[Period] = None, event_id: Optional[int] = None,
+             exclude: Collection[Worker] = ()) -> List[Worker]:
+        """Up to `needed` workers of `department` (with `duty`, if given), least
+        loaded first, leaving out those busy during `period` and those in `exclude`."""
+        key = department if duty is None else (department, duty.casefold())
+        chosen: List[Worker] = []
+        with self._lock:
+            heap = self._heaps.get(key, [])
+            # A busy worker stays busy until their load changes, which pushes a
+            # new entry and leaves the parked one stale.
+            parked_for, parked = self._parked.pop(key, (None, []))
+            if parked_for != (period, event_id):
+                for entry in parked:
+                    if self._latest[entry[3]] == entry[2]:
+                        heappush(heap, entry)
+                parked = []
+            popped: List[HeapEntry] = []
+            while heap and len(chosen) < needed:
+                entry = heappop(heap)
+                _, _, sequence, worker = entry
+                if self._latest[worker] != sequence:
+                    continue
+                if self.schedule.is_busy(worker, period, event_id):
+                    parked.append(entry)
+                    continue
+                popped.append(entry)
+                if worker not in exclude:
+                    chosen.append(worker)
+            for entry in popped:
+                heappush(heap, entry)
+            self._parked[key] = ((period, event_id), parked)
+        return chosen
+
+    def assign(self, manager: Manager, task: Task, needed: int = 1, duty: Optional[str] = None) -> List[Worker]:
+        """Assign `needed` more workers to `task` through `manager`; nothing is
+        assigned unless that many are free."""
+        if needed <= 0:
+            raise ValueError("Number of workers must be positive.")
+        workers = self.pick(task.department, needed, duty, self.schedule.event_dates(task.event_id), task.event_id,
+                            set(task.assigned_workers))
+        if len(workers) < needed:
+            wanted = f"{duty} workers" if duty else "workers"
+            raise ValueError(f"Only {len(workers)} of {needed} {wanted} are free for '{task.title}'.")
+        # Picked under the schedule lock and assigned after releasing it, as the
+        # task lock must never be taken while holding it.
+        manager.assign_task(task, workers)
+        return workers
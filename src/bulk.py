@@ -0,0 +1,201 @@
+import csv
+import gc
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from enum import Enum
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Columns each kind of record is imported from; other columns are ignored, so
+# an export can be imported again.
+APPLICATION_FIELDS = ("client_name", "event_type", "start_date", "end_date", "budget", "preferences")
+TASK_FIELDS = ("event_id", "title", "description")
+BUDGET_REQUEST_FIELDS = ("event_id", "amount", "reason")
+
+Rejected = Tuple[int, str]
+
+class ImportReport(NamedTuple):
+    imported: int
+    rejected: List[Rejected]    # (line number, reason)
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        rows = self.imported + len(self.rejected)
+        return rows / self.seconds if self.seconds else 0.0
+
+def file_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported file type '{ext}'. Use .csv or .jsonl")
+
+# -- Parsing ----------------------------------------------------------------
+def _required(record: Dict[str, Any], name: str) -> Any:
+    value = record.get(name)
+    if value is None or value == "":
+        raise ValueError(f"Missing {name}")
+    return value
+
+def _date(record: Dict[str, Any], name: str) -> datetime:
+    try:
+        return datetime.fromisoformat(_required(record, name))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid {name}: {e}")
+
+def _number(record: Dict[str, Any], name: str, kind: Callable[[Any], Any] = float) -> Any:
+    value = _required(record, name)
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name}: {value!r}")
+
+def parse_application(record: Dict[str, Any]) -> Tuple[str, str, datetime, datetime, float, str]:
+    return (str(_required(record, "client_name")), str(_required(record, "event_type")),
+            _date(record, "start_date"), _date(record, "end_date"), _number(record, "budget"),
+            str(record.get("preferences") or ""))
+
+def parse_task(record: Dict[str, Any]) -> Tuple[int, str, str]:
+    return (_number(record, "event_id", int), str(_required(record, "title")),
+            str(record.get("description") or ""))
+
+def parse_budget_request(record: Dict[str, Any]) -> Tuple[int, float, str]:
+    return (_number(record, "event_id", int), _number(record, "amount"), str(record.get("reason") or ""))
+
+PARSERS: Dict[str, Callable[[Dict[str, Any]], tuple]] = {
+    "applications": parse_application,
+    "tasks": parse_task,
+    "budget-requests": parse_budget_request,
+}
+
+# A raw record is a CSV row (list of cells) or a JSON Lines line (text); the
+# header is the CSV column names. Decoding happens in `parse_chunk`, so with a
+# process pool the reading process only splits the file.
+Raw = Tuple[int, Any]
+
+def _decode(fmt: str, header: Optional[List[str]], raw: Any) -> Dict[str, Any]:
+    if fmt == "csv":
+        return dict(zip(header or (), raw))
+    try:
+        record = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e.msg}")
+    if not isinstance(record, dict):
+        raise ValueError("Expected a JSON object")
+    return record
+
+def parse_chunk(kind: str, fmt: str, header: Optional[List[str]],
+                numbered: List[Raw]) -> Tuple[List[tuple], List[int], List[Rejected]]:
+    """Parse one chunk of (line number, raw record) into valid rows, their line
+    numbers and the rejected lines. Runs in pool workers, so it only takes picklable data."""
+    parse = PARSERS[kind]
+    rows: List[tuple] = []
+    lines: List[int] = []
+    rejected: List[Rejected] = []
+    for line, raw in numbered:
+        try:
+            rows.append(parse(_decode(fmt, header, raw)))
+        except ValueError as e:
+            rejected.append((line, str(e)))
+        else:
+            lines.append(line)
+    return rows, lines, rejected
+
+# -- Reading ----------------------------------------------------------------
+def read_raw(stream: Iterable[str], fmt: str) -> Tuple[Optional[List[str]], Iterator[Raw]]:
+    """The header (CSV only) and a lazy iterator of (line number, raw record)."""
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        return header, ((reader.line_num, row) for row in reader if row)
+    return None, ((line, text) for line, text in enumerate(stream, 1) if text.strip())
+
+def _chunks(records: Iterator[Raw], size: int) -> Iterator[List[Raw]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _parsed(kind: str, fmt: str, header: Optional[List[str]], chunks: Iterator[List[Raw]],
+            workers: int) -> Iterator[Tuple[List[tuple], List[int], List[Rejected]]]:
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_chunk(kind, fmt, header, chunk)
+        return
+    # Keep a bounded number of chunks in flight and yield results in file order,
+    # so memory stays flat however large the file is.
+    with ProcessPoolExecutor(workers) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(parse_chunk, kind, fmt, header, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def import_file(path: str, kind: str, create: Callable[[List[tuple]], Iterable[Tuple[int, str]]],
+                chunk_size: int = 10_000, workers: int = 0) -> ImportReport:
+    """Parse `path` in chunks of `chunk_size` rows and pass each chunk's valid rows to `create`.
+
+    `create` returns (row index, reason) for any rows it refuses, e.g. for
+    referring to a missing event. Those and rows that fail validation are
+    skipped and reported with their line number. With `workers` > 1, chunks
+    are parsed in a process pool while the caller creates the previous ones."""
+    if kind not in PARSERS:
+        raise ValueError(f"Unknown record kind: {kind}")
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    fmt = file_format(path)
+    started = time.perf_counter()
+    imported = 0
+    rejected: List[Rejected] = []
+    # Everything created here stays alive, so cyclic GC passes over the growing
+    # heap would find nothing to free; pause them for the duration.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            header, records = read_raw(f, fmt)
+            for rows, lines, bad in _parsed(kind, fmt, header, _chunks(records, chunk_size), workers):
+                refused = list(create(rows)) if rows else []
+                imported += len(rows) - len(refused)
+                rejected.extend(bad)
+                rejected.extend((lines[index], reason) for index, reason in refused)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    rejected.sort()
+    return ImportReport(imported, rejected, time.perf_counter() - started)
+
+# -- Writing ----------------------------------------------------------------
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+def export_file(path: str, fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Write `rows` (values in `fields` order) as they are produced; returns how many were written."""
+    fmt = file_format(path)
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(fields)
+        for row in rows:
+            values = [_plain(v) for v in row]
+            if writer is not None:
+                writer.writerow(values)
+            else:
+                f.write(json.dumps(dict(zip(fields, values)), ensure_ascii=False))
+                f.write("\n")
+            written += 1
+    return written
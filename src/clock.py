@@ -0,0 +1,24 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+# Domain objects stamp times through `now` so a command replayed from the log
+# gets the times it was first run with. The pin is per thread: commands on
+# other threads keep the real clock.
+_pinned = threading.local()
+
+def now() -> datetime:
+    """The current time, or the time pinned on this thread."""
+    at: Optional[datetime] = getattr(_pinned, "at", None)
+    return datetime.now() if at is None else at
+
+@contextmanager
+def pinned(at: datetime) -> Iterator[datetime]:
+    """Make `now` return `at` on this thread until the block exits."""
+    previous = getattr(_pinned, "at", None)
+    _pinned.at = at
+    try:
+        yield at
+    finally:
+        _pinned.at = previous
@@ -0,0 +1,90 @@
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from .models import Employee, Role
+
+Handler = Callable[[Employee, List[str]], None]
+
+class Command:
+    def __init__(self, name: str, handler: Handler, roles: FrozenSet[Role], usage: str,
+                 help: str, min_args: int, mutates: bool) -> None:
+        self.name: str = name
+        self.handler: Handler = handler
+        self.roles: FrozenSet[Role] = roles
+        self.usage: str = usage
+        self.help: str = help
+        self.min_args: int = min_args
+        self.mutates: bool = mutates
+
+
+class Session:
+    """Who is logged in on one front end (the CLI prompt, a network connection, ...)."""
+
+    def __init__(self) -> None:
+        self.user: Optional[Employee] = None
+        self.email: Optional[str] = None
+
+    def login(self, email: str, user: Employee) -> None:
+        self.email = email
+        self.user = user
+
+    def logout(self) -> None:
+        self.user = self.email = None
+
+
+class CommandRegistry:
+    def __init__(self) -> None:
+        self._commands: Dict[str, Command] = {}
+        # Precomputed role -> allowed commands table, so dispatch is one lookup.
+        self._by_role: Dict[Role, Dict[str, Command]] = {role: {} for role in Role}
+
+    def register(self, name: str, handler: Handler, roles: Iterable[Role], usage: str = "",
+                 help: str = "", min_args: int = 0, mutates: bool = False) -> Command:
+        if name in self._commands:
+            raise ValueError(f"Command '{name}' is already registered")
+        command = Command(name, handler, frozenset(roles), usage or name, help, min_args, mutates)
+        self._commands[name] = command
+        for role in command.roles:
+            self._by_role[role][name] = command
+        return command
+
+    def command(self, name: str, *roles: Role, usage: str = "", help: str = "",
+                min_args: int = 0, mutates: bool = False) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.register(name, handler, roles, usage, help, min_args, mutates)
+            return handler
+        return decorator
+
+    def get(self, name: str) -> Optional[Command]:
+        return self._commands.get(name)
+
+    def allowed(self, role: Role) -> List[Command]:
+        return list(self._by_role[role].values())
+
+    def dispatch(self, user: Employee, name: str, args: List[str]) -> Optional[Command]:
+        """Run `name` for `user`. Returns the command if it ran, None otherwise.
+
+        A handler raising is reported like any other refusal and returns None,
+        so a failed command is not recorded as a mutation and every front end
+        (the prompt, batches, the server, log replay) carries on after it."""
+        command = self._by_role[user.role].get(name)
+        if command is None:
+            if name in self._commands:
+                print(f"🚫 Permission denied for {user.role.value}.")
+            else:
+                print("❓ Unknown command. Type 'help' for options.")
+            return None
+        if len(args) < command.min_args:
+            print(f"Usage: {command.usage}")
+            return None
+        try:
+            command.handler(user, args)
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+        return command
+
+    def help_lines(self, role: Role) -> List[str]:
+        lines = []
+        for command in self._by_role[role].values():
+            lines.append(f"  {command.usage:<40} {command.help}".rstrip())
+        return lines
@@ -0,0 +1,74 @@
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+# Only guards the lazy creation of per-object locks below.
+_LOCK_CREATION = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    # Slots named in any class's `_transient_slots` are left out of pickles.
+    names, transient = [], {"__dict__", "__weakref__"}
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+        transient.update(klass.__dict__.get("_transient_slots", ()))
+    return tuple(n for n in names if n not in transient)
+
+class Lockable:
+    """Gives each instance its own re-entrant lock.
+
+    The lock is created on first use, so records that are only read (most of
+    the history once it is loaded) never pay for one. It is dropped on pickling."""
+
+    __slots__ = ("_lock_obj",)
+    _transient_slots = ("_lock_obj",)
+
+    @property
+    def _lock(self) -> threading.RLock:
+        try:
+            return self._lock_obj
+        except AttributeError:
+            with _LOCK_CREATION:
+                if not hasattr(self, "_lock_obj"):
+                    self._lock_obj = threading.RLock()
+                return self._lock_obj
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(getattr(self, "__dict__", {}))
+        for name in _slot_names(type(self)):
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+class IdAllocator(Lockable):
+    __slots__ = ("_next",)
+
+    def __init__(self, start: int = 1) -> None:
+        super().__init__()
+        self._next: int = start
+
+    @property
+    def next_id(self) -> int:
+        return self._next
+
+    def allocate(self) -> int:
+        with self._lock:
+            value = self._next
+            self._next += 1
+            return value
+
+    def reserve(self, count: int) -> range:
+        with self._lock:
+            start = self._next
+            self._next += count
+            return range(start, start + count)
+
+    def advance_past(self, used_id: int) -> None:
+        with self._lock:
+            self._next = max(self._next, used_id + 1)
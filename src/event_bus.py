@@ -0,0 +1,202 @@
+import asyncio
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Type
+
+from .concurrency import Lockable
+from .journal import DomainEvent
+
+Handler = Callable[[DomainEvent], Any]
+
+class Subscription:
+    """One subscriber to an EventBus. Synchronous subscriptions run the
+    handler inside `publish`; see `QueuedSubscription` for the others.
+
+    A handler raising does not undo the change that published the event, nor
+    stop other subscribers: the error is counted and kept in `last_error`."""
+
+    def __init__(self, handler: Handler, event_types: Tuple[Type[DomainEvent], ...]) -> None:
+        self.handler = handler
+        self.event_types = event_types or (DomainEvent,)
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+    def wants(self, event_type: type) -> bool:
+        return issubclass(event_type, self.event_types)
+
+    def deliver(self, event: DomainEvent) -> None:
+        self._handle(event)
+
+    def _handle(self, event: DomainEvent) -> None:
+        try:
+            self.handler(event)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = e
+
+    def close(self) -> None:
+        pass
+
+
+class QueuedSubscription(Subscription):
+    """A subscriber fed through a bounded queue, so `publish` only enqueues.
+
+    The queue is drained in order by one task at a time, scheduled with
+    `schedule` whenever it goes from empty to non-empty. When it is full,
+    publishing either drops the event (counted in `dropped`) or, with
+    `block`, waits for room: backpressure on the publisher, for subscribers
+    that must see every event. Never block the thread that drains."""
+
+    def __init__(self, handler: Handler, event_types: Tuple[Type[DomainEvent], ...], maxsize: int, block: bool,
+                 schedule: Callable[[], None]) -> None:
+        if maxsize <= 0:
+            raise ValueError("Queue size must be positive.")
+        super().__init__(handler, event_types)
+        self.maxsize = maxsize
+        self.block = block
+        self.dropped = 0
+        self._schedule = schedule
+        self._queue: Deque[DomainEvent] = deque()
+        self._draining = False
+        self._closed = False
+        self._changed = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def deliver(self, event: DomainEvent) -> None:
+        with self._changed:
+            while len(self._queue) >= self.maxsize and self.block and not self._closed:
+                self._changed.wait()
+            if self._closed:
+                return
+            if len(self._queue) >= self.maxsize:
+                self.dropped += 1
+                return
+            self._queue.append(event)
+            if self._draining:
+                return
+            self._draining = True
+        self._schedule()
+
+    def _next(self) -> Optional[DomainEvent]:
+        with self._changed:
+            self._changed.notify_all()
+            if not self._queue:
+                self._draining = False
+                return None
+            return self._queue.popleft()
+
+    def drain(self) -> None:
+        while (event := self._next()) is not None:
+            self._handle(event)
+
+    async def drain_async(self) -> None:
+        while (event := self._next()) is not None:
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been handled; False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: not self._draining, timeout)
+
+    def close(self) -> None:
+        """Stop accepting events; those already queued are still handled."""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+
+class EventBus(Lockable):
+    """In-process publish/subscribe of domain events.
+
+    Install `publish` with `journal.publish_to` to receive every recorded
+    event. Subscribers choose how they run: inline in the publishing thread
+    (`subscribe`), on a shared thread pool (`subscribe_threaded`) or on an
+    asyncio loop (`subscribe_async`); the last two get bounded queues, so a
+    slow subscriber costs the publisher one enqueue. Which subscribers want
+    an event type is worked out once per type and cached.
+
+    The other ways of following changes are per object: `add_listener` on an
+    Observable calls back with the object itself, under its lock, for views
+    that re-read it (analytics, ledger, materialized views), and the
+    single-slot hooks (`EventApplication.on_status_change`, `Schedule.on_change`,
+    `EventSystem.on_change`) each belong to one owner. Each object must be
+    registered, and again after a restore, since none of these are pickled.
+    The bus needs no registration: it suits consumers that can act on the
+    event alone, like the work queues for HR and budget requests."""
+
+    def __init__(self, max_workers: int = 4) -> None:
+        super().__init__()
+        self.max_workers = max_workers
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._routes: Dict[type, Tuple[Subscription, ...]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._subscriptions += (subscription,)
+            self._routes = {}
+        return subscription
+
+    def subscribe(self, handler: Handler, *event_types: Type[DomainEvent]) -> Subscription:
+        """Call `handler` in the publishing thread, for events of `event_types` (default: all)."""
+        return self._add(Subscription(handler, event_types))
+
+    def subscribe_threaded(self, handler: Handler, *event_types: Type[DomainEvent], maxsize: int = 1024,
+                           block: bool = False) -> QueuedSubscription:
+        """Call `handler` on the bus's thread pool, one event at a time and in order."""
+        subscription: QueuedSubscription
+        subscription = QueuedSubscription(handler, event_types, maxsize, block,
+                                          lambda: self._pool().submit(subscription.drain))
+        return self._add(subscription)  # type: ignore[return-value]
+
+    def subscribe_async(self, handler: Handler, loop: asyncio.AbstractEventLoop, *event_types: Type[DomainEvent],
+                        maxsize: int = 1024, block: bool = False) -> QueuedSubscription:
+        """Call `handler` (a coroutine function, or a plain one) on `loop`, one
+        event at a time and in order. Publishing may happen on any thread, but
+        `block` must not be used when publishing from `loop` itself."""
+        subscription: QueuedSubscription
+        subscription = QueuedSubscription(handler, event_types, maxsize, block,
+                                          lambda: loop.call_soon_threadsafe(loop.create_task, subscription.drain_async()))
+        return self._add(subscription)  # type: ignore[return-value]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+            self._routes = {}
+        subscription.close()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="event-bus")
+            return self._executor
+
+    def publish(self, event: DomainEvent) -> None:
+        routes = self._routes
+        subscriptions = routes.get(type(event))
+        if subscriptions is None:
+            with self._lock:
+                subscriptions = tuple(s for s in self._subscriptions if s.wants(type(event)))
+                self._routes[type(event)] = subscriptions
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def close(self) -> None:
+        """Stop taking events, handle the ones queued for the thread pool and stop it."""
+        with self._lock:
+            subscriptions, self._subscriptions, self._routes = self._subscriptions, (), {}
+            executor, self._executor = self._executor, None
+        for subscription in subscriptions:
+            subscription.close()
+        if executor is not None:
+            executor.shutdown(wait=True)
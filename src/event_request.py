@@ -1,8 +1,19 @@
+from bisect import bisect_left, bisect_right, insort
+from contextlib import ExitStack
+from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
-from typing import List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
+from . import clock
+from .concurrency import IdAllocator, Lockable
+from .history import HistoryEntry, HistoryStore
+from . import journal
+from .journal import DomainEvent, record
 from .models import Role
+from .pagination import by_id
+from .scheduling import IntervalTree
+from .workflow import Require, Transition, Workflow
 
 class EventApplicationStatus(Enum):
     PENDING_REVIEW = "Pending Review"
@@ -10,10 +21,43 @@ class EventApplicationStatus(Enum):
     APPROVED = "Approved"
     REJECTED = "Rejected"
 
-class EventApplication:
+@dataclass(frozen=True, slots=True)
+class ApplicationSubmitted(DomainEvent):
+    app_id: int
+    client_name: str
+    event_type: str
+    start_date: datetime
+    end_date: datetime
+    budget: float
+    preferences: str
+    created_by: Role
+    at: datetime
+
+@dataclass(frozen=True, slots=True)
+class ApplicationStatusChanged(DomainEvent):
+    app_id: int
+    role: Role
+    status: EventApplicationStatus
+    comment: str
+    at: datetime
+
+class ReviewResult(NamedTuple):
+    app_id: int
+    decision: EventApplicationStatus
+    error: Optional[str]  # None if the decision is valid
+
+def _created_entry(at: datetime, created_by: Role) -> HistoryEntry:
+    return HistoryEntry(at, created_by, "Created", "Initial submission")
+
+class EventApplication(Lockable):
+    __slots__ = ("app_id", "client_name", "event_type", "start_date", "end_date", "budget", "preferences",
+                 "created_by", "status", "history_store", "comment", "on_status_change")
+
     def __init__(self, app_id: int, client_name: str, event_type: str, 
                  start_date: datetime, end_date: datetime, budget: float, 
-                 preferences: str, created_by: Role) -> None:
+                 preferences: str, created_by: Role, history: Optional[HistoryStore] = None,
+                 created_at: Optional[datetime] = None, log_creation: bool = True) -> None:
+        super().__init__()
         self.app_id: int = app_id
         self.client_name: str = client_name
         self.event_type: str = event_type
@@ -23,72 +67,344 @@ class EventApplication:
         self.preferences: str = preferences
         self.created_by: Role = created_by
         self.status: EventApplicationStatus = EventApplicationStatus.PENDING_REVIEW
-        self.history: List[Tuple[datetime, Role, str, str]] = [(datetime.now(), created_by, "Created", "Initial submission")]
+        # Applications in an EventSystem share its store; a standalone one gets its own.
+        self.history_store: HistoryStore = history if history is not None else HistoryStore()
+        if log_creation:
+            self.history_store.append(app_id, _created_entry(created_at or clock.now(), created_by))
         self.comment: str = ""  
+        self.on_status_change: Optional[Callable[["EventApplication", EventApplicationStatus], None]] = None
 
     def update_status(self, user_role: Role, new_status: EventApplicationStatus, comment: str = "") -> None:
         if new_status not in EventApplicationStatus:
             raise ValueError(f"Invalid status: {new_status}")
-        self.status = new_status
+        with self._lock:
+            old_status = self.status
+            self.status = new_status
+            if self.on_status_change is not None and old_status is not new_status:
+                self.on_status_change(self, old_status)
+
+            if user_role == Role.FIN_MANAGER and comment:
+                self.comment = comment  
+            at = clock.now()
+            self.history_store.append(self.app_id, HistoryEntry(at, user_role, new_status.value, comment))
+            record(ApplicationStatusChanged(self.app_id, user_role, new_status, comment, at))
 
-        if user_role == Role.FIN_MANAGER and comment:
-            self.comment = comment  
-        self.history.append((datetime.now(), user_role, new_status.value, comment))
+    @property
+    def history(self) -> List[HistoryEntry]:
+        return self.history_store.entries(self.app_id)
+
+    @history.setter
+    def history(self, entries: Iterable[HistoryEntry]) -> None:
+        self.history_store.replace(self.app_id, entries)
+
+    def has_acted(self, role: Role) -> bool:
+        return self.history_store.has_acted(self.app_id, role)
 
     def __str__(self) -> str:
         return f"[#{self.app_id}] {self.client_name} - {self.event_type} ({self.status})"
 
 
-class EventSystem:
+# An application's review stage: its status and whether FM has acted on it.
+_STAGES = [(status, fm_acted) for status in EventApplicationStatus for fm_acted in (False, True)]
+_DECISIONS = (EventApplicationStatus.FORWARDED, EventApplicationStatus.APPROVED, EventApplicationStatus.REJECTED)
+
+REVIEW_WORKFLOW: Workflow[EventApplication] = Workflow(_STAGES, [
+    Require(frozenset(s for s in _STAGES if s[0] is EventApplicationStatus.FORWARDED),
+            "FM can only act after SCS has forwarded the application.", roles=frozenset({Role.FIN_MANAGER})),
+    Require(frozenset(s for s in _STAGES if s[1]),
+            "AM cannot act before FM has reviewed the application.", roles=frozenset({Role.ADM_MANAGER})),
+    *(Transition(decision, frozenset(_STAGES), decision, "") for decision in _DECISIONS),
+], unknown="Invalid decision: {action}", actions=EventApplicationStatus, state_of=lambda app: (app.status, app.has_acted(Role.FIN_MANAGER)))
+
+
+class EventSystem(Lockable):
+    # Lock ordering: an application's lock may be held while taking the system
+    # lock (status reindexing), never the other way around.
     def __init__(self) -> None:
+        super().__init__()
         self.applications: List[EventApplication] = []
-        self.next_id: int = 1
+        self._ids: IdAllocator = IdAllocator()
+        self.history: HistoryStore = HistoryStore()
+
+        # Primary-key index, kept in sync with `applications`.
+        self._by_id: Dict[int, EventApplication] = {}
+
+        # Secondary indexes. Buckets are dicts keyed by app_id so moving an
+        # application between status buckets is O(1).
+        self._by_status: Dict[EventApplicationStatus, Dict[int, EventApplication]] = {s: {} for s in EventApplicationStatus}
+        self._by_client: Dict[str, Dict[int, EventApplication]] = {}
+        self._by_type: Dict[str, Dict[int, EventApplication]] = {}
+
+        # Start-date index: (start_date, app_id) sorted by start.
+        self._by_start: List[Tuple[datetime, int]] = []
+        # Interval index for `overlapping`, built from `_by_start` on its first
+        # use and kept up to date from then on. Not pickled.
+        self._by_period: Optional[IntervalTree[int]] = None
+
+        # Leading `applications` not yet in the secondary indexes (see `loaded_lazily`).
+        self._unindexed: int = 0
+
+        # Called with each application after it is created or reviewed. Not
+        # pickled; whoever restores the system sets it again.
+        self.on_change: Optional[Callable[[EventApplication], None]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state["on_change"] = None
+        state["_by_period"] = None
+        state.pop("_max_duration", None)
+        return state
+
+    @classmethod
+    def loaded_lazily(cls, applications: List[EventApplication], by_id: Dict[int, EventApplication],
+                      history: HistoryStore, next_id: int) -> "EventSystem":
+        """A system over applications that are only built when accessed, e.g. read
+        from a memory-mapped snapshot. `applications` and `by_id` must call
+        `attach` on each application they build. The secondary indexes, which need
+        every application, are filled in on the first query."""
+        system = cls()
+        system.applications = applications
+        system._by_id = by_id
+        system.history = history
+        system._ids = IdAllocator(next_id)
+        system._unindexed = len(applications)
+        return system
+
+    def attach(self, app: EventApplication) -> None:
+        app.on_status_change = self._reindex_status
 
     def create_event_application(self, client_name: str, event_type: str, 
                                start_date: datetime, end_date: datetime, 
                                budget: float, preferences: str, 
                                created_by: Role = Role.CS_WORKER) -> EventApplication:
-        app = EventApplication(
-            app_id=self.next_id,
-            client_name=client_name,
-            event_type=event_type,
-            start_date=start_date,
-            end_date=end_date,
-            budget=budget,
-            preferences=preferences,
-            created_by=created_by
-        )
-        self.applications.append(app)
-        self.next_id += 1
+        at = clock.now()
+        with self._lock:
+            app = EventApplication(
+                app_id=self._ids.allocate(),
+                client_name=client_name,
+                event_type=event_type,
+                start_date=start_date,
+                end_date=end_date,
+                budget=budget,
+                preferences=preferences,
+                created_by=created_by,
+                history=self.history,
+                created_at=at
+            )
+            self.applications.append(app)
+            self._index(app)
+            record(ApplicationSubmitted(app.app_id, client_name, event_type, start_date, end_date, budget,
+                                        preferences, created_by, at))
+        self._changed(app)
         return app
 
+    def create_many(self, rows: Sequence[Tuple[str, str, datetime, datetime, float, str]],
+                    created_by: Role = Role.CS_WORKER) -> List[EventApplication]:
+        """Create one application per (client, type, start, end, budget, preferences) row.
+
+        The IDs are reserved as one range, the "Created" history entries are
+        written a column at a time and the start-date index is re-sorted once,
+        instead of doing each per application."""
+        at = clock.now()
+        with self._lock:
+            ids = self._ids.reserve(len(rows))
+            apps = [EventApplication(app_id, client, event_type, start, end, budget, preferences, created_by,
+                                     self.history, at, log_creation=False)
+                    for app_id, (client, event_type, start, end, budget, preferences) in zip(ids, rows)]
+            self.history.append_each(ids, _created_entry(at, created_by))
+            self.applications.extend(apps)
+            for app in apps:
+                self._index(app, sort_later=True)
+            self._by_start.sort()
+            if journal.wanted():
+                for app in apps:
+                    record(ApplicationSubmitted(app.app_id, app.client_name, app.event_type, app.start_date,
+                                                app.end_date, app.budget, app.preferences, created_by, at))
+        for app in apps:
+            self._changed(app)
+        return apps
+
+    @property
+    def next_id(self) -> int:
+        return self._ids.next_id
+
+    def add_application(self, app: EventApplication) -> None:
+        with self._lock:
+            if app.app_id in self._by_id:
+                raise ValueError(f"Application #{app.app_id} already exists")
+            if app.history_store is not self.history:
+                self.history.extend(app.app_id, app.history)
+                app.history_store = self.history
+            self.applications.append(app)
+            self._index(app)
+            self._ids.advance_past(app.app_id)
+
+    def _index(self, app: EventApplication, sort_later: bool = False) -> None:
+        self._by_id[app.app_id] = app
+        self._index_fields(app, sort_later)
+
+    def _ensure_indexed(self) -> None:
+        with self._lock:
+            if self._unindexed:
+                for position in range(self._unindexed):
+                    self._index_fields(self.applications[position], sort_later=True)
+                self._by_start.sort()
+                self._unindexed = 0
+
+    def _index_fields(self, app: EventApplication, sort_later: bool = False) -> None:
+        self._by_status[app.status][app.app_id] = app
+        self._by_client.setdefault(app.client_name, {})[app.app_id] = app
+        self._by_type.setdefault(app.event_type, {})[app.app_id] = app
+        if sort_later:
+            self._by_start.append((app.start_date, app.app_id))
+        else:
+            insort(self._by_start, (app.start_date, app.app_id))
+        by_period = getattr(self, "_by_period", None)
+        if by_period is not None:
+            by_period.add(app.start_date, app.end_date, app.app_id, app.app_id)
+        self.attach(app)
+
+    def _changed(self, app: EventApplication) -> None:
+        # Systems pickled before the hook existed lack the attribute.
+        on_change = getattr(self, "on_change", None)
+        if on_change is not None:
+            on_change(app)
+
+    def _reindex_status(self, app: EventApplication, old_status: EventApplicationStatus) -> None:
+        with self._lock:
+            self._by_status[old_status].pop(app.app_id, None)
+            self._by_status[app.status][app.app_id] = app
+
     def review_application(self, app_id: int, role: Role, 
                          decision: EventApplicationStatus, comment: str) -> EventApplication:
         app = self.get_application_by_id(app_id)
 
-        if role is Role.FIN_MANAGER:
-            if app.status is not EventApplicationStatus.FORWARDED:
-                raise ValueError("FM can only act after SCS has forwarded the application.")
-        elif role is Role.ADM_MANAGER:
-            last_roles = [r[1] for r in app.history]
-            if Role.FIN_MANAGER not in last_roles:
-                raise ValueError("AM cannot act before FM has reviewed the application.")
+        # The workflow checks and the update must see the same state.
+        with app._lock:
+            app.update_status(role, REVIEW_WORKFLOW.check(app, decision, role), comment)
 
-        if decision not in [EventApplicationStatus.FORWARDED, EventApplicationStatus.APPROVED, EventApplicationStatus.REJECTED]:
-            raise ValueError(f"Invalid decision: {decision}")
+            if role is Role.FIN_MANAGER and comment:
+                app.comment = comment
+            self._changed(app)
 
-        app.update_status(role, decision, comment)
+        return app
 
-        if role is Role.FIN_MANAGER and comment:
-            app.comment = comment
+    def review_many(self, decisions: Sequence[Tuple[int, EventApplicationStatus, str]],
+                    role: Role) -> List[ReviewResult]:
+        """Review many applications as `role`, all or none.
 
-        return app
+        Every (app_id, decision, comment) is checked against the workflow in
+        one pass, in order, so a batch may both forward an application and
+        act on it after. Only if all are valid are they applied, while every
+        application involved is locked. Returns a result per decision; any
+        with an error means nothing was changed."""
+        apps: Dict[int, EventApplication] = {}
+        for app_id, _, _ in decisions:
+            if app_id not in apps and app_id in self._by_id:
+                apps[app_id] = self._by_id[app_id]
+        with ExitStack() as stack:
+            # Lock ordering: applications by ID, then the system, then the history.
+            for app_id in sorted(apps):
+                stack.enter_context(apps[app_id]._lock)
+            stages = {app_id: REVIEW_WORKFLOW.state_of(app) for app_id, app in apps.items()}
+            results: List[ReviewResult] = []
+            for app_id, decision, _ in decisions:
+                stage = stages.get(app_id)
+                if stage is None:
+                    results.append(ReviewResult(app_id, decision, f"No application found with ID {app_id}"))
+                    continue
+                try:
+                    status = REVIEW_WORKFLOW.target(stage, decision, role)
+                except ValueError as e:
+                    results.append(ReviewResult(app_id, decision, str(e)))
+                    continue
+                stages[app_id] = (status, stage[1] or role is Role.FIN_MANAGER)
+                results.append(ReviewResult(app_id, decision, None))
+            if any(result.error is not None for result in results):
+                return results
+
+            stack.enter_context(self._lock)
+            stack.enter_context(self.history._lock)
+            for app_id, decision, comment in decisions:
+                app = apps[app_id]
+                app.update_status(role, decision, comment)
+                if role is Role.FIN_MANAGER and comment:
+                    app.comment = comment
+            for app in apps.values():
+                self._changed(app)
+        return results
+
+    def __contains__(self, app_id: int) -> bool:
+        return app_id in self._by_id
 
     def get_application_by_id(self, app_id: int) -> EventApplication:
-        for app in self.applications:
-            if app.app_id == app_id:
-                return app
-        raise ValueError(f"No application found with ID {app_id}")
+        app = self._by_id.get(app_id)
+        if app is None:
+            raise ValueError(f"No application found with ID {app_id}")
+        return app
+
+    def get_many(self, ids: Iterable[int]) -> List[EventApplication]:
+        return [self.get_application_by_id(app_id) for app_id in ids]
+
+    def iter_pages(self, page_size: int = 100) -> Iterator[List[EventApplication]]:
+        if page_size <= 0:
+            raise ValueError("Page size must be positive.")
+        for start in range(0, len(self.applications), page_size):
+            with self._lock:
+                page = self.applications[start:start + page_size]
+            yield page
+
+    def starting_between(self, lo: datetime, hi: datetime) -> List[EventApplication]:
+        self._ensure_indexed()
+        with self._lock:
+            start = bisect_left(self._by_start, (lo,))
+            stop = bisect_right(self._by_start, (hi, self.next_id))
+            return [self._by_id[app_id] for _, app_id in self._by_start[start:stop]]
+
+    def overlapping(self, lo: datetime, hi: datetime) -> List[EventApplication]:
+        self._ensure_indexed()
+        with self._lock:
+            by_period = getattr(self, "_by_period", None)
+            if by_period is None:
+                by_period = self._by_period = IntervalTree.build(
+                    (start, self._by_id[app_id].end_date, app_id, app_id) for start, app_id in self._by_start)
+            return [self._by_id[app_id] for _, _, app_id in by_period.overlapping(lo, hi)]
+
+    def query(self, status: Optional[EventApplicationStatus] = None,
+              client_name: Optional[str] = None, event_type: Optional[str] = None,
+              between: Optional[Tuple[datetime, datetime]] = None) -> List[EventApplication]:
+        self._ensure_indexed()
+        with self._lock:
+            return self._query(status, client_name, event_type, between)
+
+    def _query(self, status: Optional[EventApplicationStatus], client_name: Optional[str],
+               event_type: Optional[str], between: Optional[Tuple[datetime, datetime]]) -> List[EventApplication]:
+        buckets: List[Dict[int, EventApplication]] = []
+        if status is not None:
+            buckets.append(self._by_status[status])
+        if client_name is not None:
+            buckets.append(self._by_client.get(client_name, {}))
+        if event_type is not None:
+            buckets.append(self._by_type.get(event_type, {}))
+
+        if buckets:
+            buckets.sort(key=len)
+            candidates = list(buckets.pop(0).values())
+            if between is not None:
+                lo, hi = between
+                candidates = [app for app in candidates if app.start_date <= hi and app.end_date >= lo]
+        elif between is not None:
+            candidates = self.overlapping(*between)
+        else:
+            candidates = list(self.applications)
+
+        result = [app for app in candidates if all(app.app_id in b for b in buckets)]
+        result.sort(key=lambda a: a.app_id)
+        return result
+
+    def iter_applications(self, after: int = 0, limit: Optional[int] = None) -> Iterator[EventApplication]:
+        """Applications with IDs above the `after` cursor, in ID order, produced lazily."""
+        return by_id(self._by_id, after, self.next_id, limit)
 
-    def list_applications(self) -> List[str]:
-        return [str(app) for app in self.applications]
\ No newline at end of file
+    def list_applications(self, after: int = 0, limit: Optional[int] = None) -> List[str]:
+        return [str(app) for app in self.iter_applications(after, limit)]
\ No newline at end of file
@@ -1,5 +1,10 @@
+from dataclasses import dataclass
 from enum import Enum
 
+from .journal import DomainEvent, record
+from .observers import Observable
+from .workflow import Transition, Workflow
+
 class BudgetRequestStatus(Enum):
     PENDING = "Pending"
     APPROVED = "Approved"
@@ -11,40 +16,101 @@ class BudgetNegotiationStatus(Enum):
     REJECTED = "Rejected"
     COUNTER_OFFER = "Counter Offer"
 
-class BudgetRequest:
+@dataclass(frozen=True, slots=True)
+class BudgetRequestOpened(DomainEvent):
+    request_id: int
+    event_id: int
+    amount: float
+    reason: str
+
+@dataclass(frozen=True, slots=True)
+class BudgetRequestDecided(DomainEvent):
+    request_id: int
+    status: BudgetRequestStatus
+
+@dataclass(frozen=True, slots=True)
+class NegotiationOpened(DomainEvent):
+    negotiation_id: int
+    request_id: int
+
+@dataclass(frozen=True, slots=True)
+class CounterOffered(DomainEvent):
+    negotiation_id: int
+    amount: float
+
+@dataclass(frozen=True, slots=True)
+class NegotiationDecided(DomainEvent):
+    negotiation_id: int
+    status: BudgetNegotiationStatus
+
+class BudgetRequest(Observable):
+    __slots__ = ("request_id", "event_id", "amount", "requested_amount", "reason", "status")
+
     def __init__(self, request_id: int, event_id: int, amount: float, reason: str):
+        super().__init__()
         self.request_id = request_id
         self.event_id = event_id
         self.amount = amount
+        # What was originally asked for; `amount` follows counter-offers.
+        self.requested_amount = amount
         self.reason = reason
         self.status = BudgetRequestStatus.PENDING
 
     def approve(self):
-        self.status = BudgetRequestStatus.APPROVED
+        with self._lock:
+            self.status = BudgetRequestStatus.APPROVED
+            record(BudgetRequestDecided(self.request_id, self.status))
+            self._notify()
 
     def reject(self):
-        self.status = BudgetRequestStatus.REJECTED
+        with self._lock:
+            self.status = BudgetRequestStatus.REJECTED
+            record(BudgetRequestDecided(self.request_id, self.status))
+            self._notify()
+
+    def set_amount(self, amount: float):
+        with self._lock:
+            self.amount = amount
+            self._notify()
+
+_OPEN = frozenset({BudgetNegotiationStatus.PENDING, BudgetNegotiationStatus.COUNTER_OFFER})
+
+NEGOTIATION_WORKFLOW: "Workflow[BudgetNegotiation]" = Workflow(BudgetNegotiationStatus, [
+    Transition("approve", frozenset(BudgetNegotiationStatus) - {BudgetNegotiationStatus.REJECTED},
+               BudgetNegotiationStatus.APPROVED, "Cannot approve a rejected negotiation"),
+    Transition("reject", frozenset(BudgetNegotiationStatus) - {BudgetNegotiationStatus.APPROVED},
+               BudgetNegotiationStatus.REJECTED, "Cannot reject an already approved negotiation"),
+    Transition("counter_offer", _OPEN, BudgetNegotiationStatus.COUNTER_OFFER,
+               "Cannot counter offer after approval/rejection"),
+])
+
+class BudgetNegotiation(Observable):
+    # Lock ordering: negotiation before its request.
+    __slots__ = ("negotiation_id", "request", "status")
 
-class BudgetNegotiation:
     def __init__(self, negotiation_id: int, request: BudgetRequest):
+        super().__init__()
         self.negotiation_id = negotiation_id
         self.request = request
         self.status = BudgetNegotiationStatus.PENDING
 
     def approve(self):
-        if self.status == BudgetNegotiationStatus.REJECTED:
-            raise ValueError("Cannot approve a rejected negotiation")
-        self.status = BudgetNegotiationStatus.APPROVED
-        self.request.approve()
+        with self._lock:
+            self.status = NEGOTIATION_WORKFLOW.check(self, "approve")
+            self.request.approve()
+            record(NegotiationDecided(self.negotiation_id, self.status))
+            self._notify()
 
     def reject(self):
-        if self.status == BudgetNegotiationStatus.APPROVED:
-            raise ValueError("Cannot reject an already approved negotiation")
-        self.status = BudgetNegotiationStatus.REJECTED
-        self.request.reject()
+        with self._lock:
+            self.status = NEGOTIATION_WORKFLOW.check(self, "reject")
+            self.request.reject()
+            record(NegotiationDecided(self.negotiation_id, self.status))
+            self._notify()
 
     def counter_offer(self, new_amount: float):
-        if self.status not in [BudgetNegotiationStatus.PENDING, BudgetNegotiationStatus.COUNTER_OFFER]:
-            raise ValueError("Cannot counter offer after approval/rejection")
-        self.status = BudgetNegotiationStatus.COUNTER_OFFER
-        self.request.amount = new_amount
\ No newline at end of file
+        with self._lock:
+            self.status = NEGOTIATION_WORKFLOW.check(self, "counter_offer")
+            self.request.set_amount(new_amount)
+            record(CounterOffered(self.negotiation_id, new_amount))
+            self._notify()
\ No newline at end of file
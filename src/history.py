@@ -0,0 +1,252 @@
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import reduce
+from itertools import chain, compress
+from operator import and_
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .concurrency import Lockable
+from .models import Role
+
+ROLES: List[Role] = list(Role)
+ROLE_CODES: Dict[Role, int] = {role: code for code, role in enumerate(ROLES)}
+
+# Timestamps are stored as microseconds since this (naive) epoch.
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+class HistoryEntry(NamedTuple):
+    timestamp: datetime
+    role: Role
+    action: str
+    comment: str
+
+def _to_micros(ts: datetime) -> int:
+    return (ts - EPOCH) // _MICROSECOND
+
+def _from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+class _Interned:
+    # Small string table: the same few actions and many repeated comments
+    # are stored once and referenced by code.
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+class HistoryColumns(NamedTuple):
+    """Everything a HistoryStore holds, as flat arrays (see `export_columns`)."""
+    app_ids: array
+    timestamps: array
+    roles: array
+    actions: array
+    comments: array
+    action_names: List[str]
+    comment_texts: List[str]
+    # Rows grouped per application: rows[offsets[app_id]:offsets[app_id + 1]].
+    offsets: array
+    rows: array
+    acted: bytes
+    dead: int
+
+class HistoryStore(Lockable):
+    """History of many applications kept as parallel arrays, one row per entry.
+
+    Scans run over whole columns with map/compress, so audit queries over all
+    history don't touch a Python object per entry."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._app_ids = array("q")
+        self._timestamps = array("q")
+        self._roles = array("B")
+        self._actions = array("B")
+        self._comments = array("L")
+        self._action_names = _Interned()
+        self._comment_texts = _Interned()
+        # Per-application row offsets, in insertion order.
+        self._rows: Dict[int, array] = {}
+        # One bit per role that has acted on the application, indexed by app_id.
+        self._acted = bytearray()
+        # Rows dropped by `replace`; their app_id column is set to -1.
+        self._dead = 0
+        # Per-application rows of a store loaded by `from_columns`, kept as the
+        # flat offsets/rows arrays they were saved as instead of one array per
+        # application. Applications whose history was replaced since are "thawed".
+        self._frozen: Optional[Tuple[array, array]] = None
+        self._thawed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._app_ids) - self._dead
+
+    def append(self, app_id: int, entry: HistoryEntry) -> None:
+        with self._lock:
+            self._append(app_id, entry)
+
+    def extend(self, app_id: int, entries: Iterable[HistoryEntry]) -> None:
+        with self._lock:
+            for entry in entries:
+                self._append(app_id, entry)
+
+    def append_each(self, app_ids: Sequence[int], entry: HistoryEntry) -> None:
+        """Append the same entry to every application in `app_ids`, a column at a time."""
+        timestamp, role, action, comment = entry
+        role_code = ROLE_CODES[role]
+        count = len(app_ids)
+        with self._lock:
+            first = len(self._app_ids)
+            self._app_ids.extend(app_ids)
+            self._timestamps.extend(array("q", [_to_micros(timestamp)]) * count)
+            self._roles.extend(array("B", [role_code]) * count)
+            self._actions.extend(array("B", [self._action_names.code(action)]) * count)
+            self._comments.extend(array("L", [self._comment_texts.code(comment)]) * count)
+            rows = self._rows
+            for row, app_id in enumerate(app_ids, first):
+                if app_id in rows:
+                    rows[app_id].append(row)
+                else:
+                    rows[app_id] = array("L", (row,))
+            acted = self._acted
+            top = max(app_ids, default=-1)
+            if top >= len(acted):
+                acted.extend(bytes(top + 1 - len(acted)))
+            bit = 1 << role_code
+            for app_id in app_ids:
+                acted[app_id] |= bit
+
+    def _append(self, app_id: int, entry: HistoryEntry) -> None:
+        timestamp, role, action, comment = entry
+        role_code = ROLE_CODES[role]
+        row = len(self._app_ids)
+        self._app_ids.append(app_id)
+        self._timestamps.append(_to_micros(timestamp))
+        self._roles.append(role_code)
+        self._actions.append(self._action_names.code(action))
+        self._comments.append(self._comment_texts.code(comment))
+        rows = self._rows.get(app_id)
+        if rows is None:
+            rows = self._rows[app_id] = array("L")
+        rows.append(row)
+        acted = self._acted
+        if app_id >= len(acted):
+            acted.extend(bytes(app_id + 1 - len(acted)))
+        acted[app_id] |= 1 << role_code
+
+    def _row_ids(self, app_id: int) -> Iterable[int]:
+        rows = self._rows.get(app_id, ())
+        if self._frozen is None or app_id in self._thawed:
+            return rows
+        offsets, frozen = self._frozen
+        if app_id + 1 >= len(offsets):
+            return rows
+        return chain(frozen[offsets[app_id]:offsets[app_id + 1]], rows)
+
+    def replace(self, app_id: int, entries: Iterable[HistoryEntry]) -> None:
+        entries = list(entries)
+        with self._lock:
+            for row in list(self._row_ids(app_id)):
+                self._app_ids[row] = -1
+                self._dead += 1
+            self._rows.pop(app_id, None)
+            if self._frozen is not None:
+                self._thawed.add(app_id)
+            if app_id < len(self._acted):
+                self._acted[app_id] = 0
+            for entry in entries:
+                self._append(app_id, entry)
+
+    def _entry(self, row: int) -> HistoryEntry:
+        return HistoryEntry(
+            _from_micros(self._timestamps[row]),
+            ROLES[self._roles[row]],
+            self._action_names.values[self._actions[row]],
+            self._comment_texts.values[self._comments[row]],
+        )
+
+    def entries(self, app_id: int) -> List[HistoryEntry]:
+        with self._lock:
+            return [self._entry(row) for row in self._row_ids(app_id)]
+
+    def has_acted(self, app_id: int, role: Role) -> bool:
+        return app_id < len(self._acted) and bool(self._acted[app_id] & (1 << ROLE_CODES[role]))
+
+    # -- Bulk save / load -------------------------------------------------
+    def export_columns(self) -> HistoryColumns:
+        with self._lock:
+            offsets, rows = array("q", [0]), array("L")
+            for app_id in range(len(self._acted)):
+                rows.extend(self._row_ids(app_id))
+                offsets.append(len(rows))
+            return HistoryColumns(self._app_ids, self._timestamps, self._roles, self._actions, self._comments,
+                                  self._action_names.values, self._comment_texts.values, offsets, rows,
+                                  bytes(self._acted), self._dead)
+
+    @classmethod
+    def from_columns(cls, columns: HistoryColumns) -> "HistoryStore":
+        """A store over saved columns; per-application rows stay in the flat arrays."""
+        store = cls()
+        store._app_ids, store._timestamps, store._roles, store._actions, store._comments = columns[:5]
+        for table, values in ((store._action_names, columns.action_names), (store._comment_texts, columns.comment_texts)):
+            table.values = list(values)
+            table.codes = {value: code for code, value in enumerate(table.values)}
+        store._frozen = (columns.offsets, columns.rows)
+        store._acted = bytearray(columns.acted)
+        store._dead = columns.dead
+        return store
+
+    # -- Audit scans ------------------------------------------------------
+    def _matching_rows(self, role: Optional[Role], action: Optional[str],
+                       between: Optional[Tuple[datetime, datetime]]) -> Iterator[int]:
+        masks: List[Iterable[bool]] = []
+        if self._dead:
+            masks.append(map((-1).__ne__, self._app_ids))
+        if role is not None:
+            masks.append(map(ROLE_CODES[role].__eq__, self._roles))
+        if action is not None:
+            code = self._action_names.codes.get(action)
+            if code is None:
+                return iter(())
+            masks.append(map(code.__eq__, self._actions))
+        if between is not None:
+            lo, hi = (_to_micros(ts) for ts in between)
+            masks.append(map(lo.__le__, self._timestamps))
+            masks.append(map(hi.__ge__, self._timestamps))
+        rows = range(len(self._app_ids))
+        if not masks:
+            return iter(rows)
+        return compress(rows, reduce(lambda a, b: map(and_, a, b), masks))
+
+    def scan(self, role: Optional[Role] = None, action: Optional[str] = None,
+             between: Optional[Tuple[datetime, datetime]] = None) -> List[Tuple[int, HistoryEntry]]:
+        """(app_id, entry) for every entry matching all the given filters, oldest row first."""
+        with self._lock:
+            return [(self._app_ids[row], self._entry(row)) for row in self._matching_rows(role, action, between)]
+
+    def count_by_role(self) -> Dict[Role, int]:
+        with self._lock:
+            counts = Counter(self._live(self._roles))
+        return {ROLES[code]: n for code, n in sorted(counts.items())}
+
+    def count_by_action(self) -> Dict[str, int]:
+        with self._lock:
+            counts = Counter(self._live(self._actions))
+            return {self._action_names.values[code]: n for code, n in sorted(counts.items())}
+
+    def acted_on_by(self, role: Role) -> List[int]:
+        """IDs of every application `role` has acted on."""
+        bit = 1 << ROLE_CODES[role]
+        with self._lock:
+            return list(compress(range(len(self._acted)), map(bit.__and__, self._acted)))
+
+    def _live(self, column: array) -> Iterable[int]:
+        if not self._dead:
+            return column
+        return compress(column, map((-1).__ne__, self._app_ids))
@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+from .concurrency import Lockable
+
+class DomainEvent:
+    """Base of the typed events recorded for every state transition.
+
+    Concrete events are frozen slotted dataclasses defined next to the
+    objects that emit them."""
+    __slots__ = ()
+
+
+class Journal(Lockable):
+    """Append-only, in-order log of domain events.
+
+    Sequence numbers start at 1. A checkpoint is a serialized read model
+    covering every event up to its sequence number; once one exists the
+    events it covers may be compacted away, and rebuilding starts from the
+    checkpoint instead of from the first event."""
+
+    def __init__(self, checkpoint_every: int = 0) -> None:
+        super().__init__()
+        self.checkpoint_every: int = checkpoint_every
+        self._events: List[DomainEvent] = []
+        self._first_seq: int = 1
+        self._checkpoint: Optional[Tuple[int, Union[bytes, Callable[[], bytes]]]] = None
+
+    def __len__(self) -> int:
+        return self.last_seq
+
+    @property
+    def last_seq(self) -> int:
+        return self._first_seq + len(self._events) - 1
+
+    def append(self, event: DomainEvent) -> int:
+        with self._lock:
+            self._events.append(event)
+            return self.last_seq
+
+    def events(self, after: int = 0) -> List[DomainEvent]:
+        """Events with a sequence number greater than `after`."""
+        with self._lock:
+            if after + 1 < self._first_seq:
+                raise ValueError(f"Events up to #{self._first_seq - 1} were compacted; start from the checkpoint")
+            return self._events[after + 1 - self._first_seq:]
+
+    # -- Checkpoints ------------------------------------------------------
+    @property
+    def checkpoint(self) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            if self._checkpoint is not None and callable(self._checkpoint[1]):
+                seq, produce = self._checkpoint
+                self._checkpoint = (seq, produce())
+            return self._checkpoint  # type: ignore[return-value]
+
+    @property
+    def needs_checkpoint(self) -> bool:
+        covered = self._checkpoint[0] if self._checkpoint else 0
+        return bool(self.checkpoint_every) and self.last_seq - covered >= self.checkpoint_every
+
+    def save_checkpoint(self, seq: int, data: Union[bytes, Callable[[], bytes]], compact: bool = False) -> None:
+        """`data` may be a function producing the bytes; it is called the first
+        time the checkpoint is read, and must not depend on state changed since `seq`."""
+        with self._lock:
+            if seq > self.last_seq:
+                raise ValueError(f"Checkpoint #{seq} is ahead of the journal (#{self.last_seq})")
+            self._checkpoint = (seq, data)
+            if compact and seq >= self._first_seq:
+                del self._events[:seq + 1 - self._first_seq]
+                self._first_seq = seq + 1
+
+
+# The journal transitions are recorded to. None (the default) records nothing,
+# so domain objects used on their own pay only for the check.
+_active: Optional[Journal] = None
+
+# Also called with every recorded event, e.g. an EventBus's `publish`.
+_publish: Optional[Callable[[DomainEvent], None]] = None
+
+def record(event: DomainEvent) -> None:
+    journal = _active
+    if journal is not None:
+        journal.append(event)
+    publish = _publish
+    if publish is not None:
+        publish(event)
+
+def active() -> Optional[Journal]:
+    """The journal events are being recorded to, if any."""
+    return _active
+
+def wanted() -> bool:
+    """Whether recorded events go anywhere; lets bulk paths skip building events."""
+    return _active is not None or _publish is not None
+
+def publish_to(publish: Optional[Callable[[DomainEvent], None]]) -> Optional[Callable[[DomainEvent], None]]:
+    """Also pass every recorded event to `publish`; returns the previous one."""
+    global _publish
+    previous, _publish = _publish, publish
+    return previous
+
+def install(journal: Optional[Journal]) -> Optional[Journal]:
+    """Make `journal` receive every recorded event; returns the previous one."""
+    global _active
+    previous, _active = _active, journal
+    return previous
+
+@contextmanager
+def recording(journal: Optional[Journal]) -> Iterator[Optional[Journal]]:
+    previous = install(journal)
+    try:
+        yield journal
+    finally:
+        install(previous)
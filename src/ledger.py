@@ -0,0 +1,142 @@
+from collections import ChainMap
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Set, Tuple
+
+from .concurrency import Lockable
+from .event_request import EventApplication
+from .financial_request import BudgetNegotiation, BudgetNegotiationStatus, BudgetRequest, BudgetRequestStatus
+from .task_distribution import Task
+
+# Column order of a ledger row.
+ORIGINAL, REQUESTED, APPROVED, NEGOTIATING, WORKER_ASKS = range(5)
+_EMPTY = (0.0,) * 5
+
+class EventBudget(NamedTuple):
+    original: float       # budget on the event application
+    requested: float      # budget requests still pending a decision
+    approved: float       # approved budget requests
+    negotiating: float    # part of `requested` under an open counter-offer
+    worker_asks: float    # budget asked for by workers on the event's tasks
+
+    @property
+    def committed(self) -> float:
+        return self.original + self.approved
+
+class BudgetLedger(Lockable):
+    """Per-event budget roll-up, kept current by listening to its sources.
+
+    Each source (application, budget request, task) remembers what it last
+    contributed, so a change only moves that difference and reading an
+    event's totals never walks the sources. Negotiations are not sources of
+    their own: a pending request with any open negotiation also counts its
+    current amount as negotiating, once however many negotiations it has."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._events: Dict[int, List[float]] = {}
+        self._contributions: Dict[object, Tuple[int, Tuple[float, ...]]] = {}
+        # Application budgets never change, so they are looked up rather than
+        # copied into rows; `use_originals` can put a lazily read mapping behind them.
+        self._originals: ChainMap = ChainMap({})
+        # Worker asks already counted per task; tasks also notify on status and assignment.
+        self._asks_seen: Dict[Task, int] = {}
+        # Open negotiations per request.
+        self._negotiating: Dict[BudgetRequest, Set[BudgetNegotiation]] = {}
+
+    def _apply(self, source: object, event_id: int, contribution: Tuple[float, ...]) -> None:
+        with self._lock:
+            old_event, old = self._contributions.get(source, (event_id, _EMPTY))
+            row = self._events.setdefault(old_event, [0.0] * 5)
+            for column, amount in enumerate(old):
+                row[column] -= amount
+            row = self._events.setdefault(event_id, [0.0] * 5)
+            for column, amount in enumerate(contribution):
+                row[column] += amount
+            self._contributions[source] = (event_id, contribution)
+
+    def _column(self, column: int, amount: float) -> Tuple[float, ...]:
+        contribution = [0.0] * 5
+        contribution[column] = amount
+        return tuple(contribution)
+
+    # -- Sources ----------------------------------------------------------
+    def track_application(self, app: EventApplication) -> None:
+        # The application budget is fixed once submitted, so it needs no listener.
+        with self._lock:
+            self._originals.maps[0][app.app_id] = app.budget
+
+    def use_originals(self, budgets: Mapping[int, float]) -> None:
+        """Read the budgets of applications not tracked one by one from `budgets` (event_id -> budget)."""
+        with self._lock:
+            self._originals = ChainMap(self._originals.maps[0], budgets)
+
+    def track_request(self, request: BudgetRequest) -> None:
+        self._request_changed(request)
+        request.add_listener(self._request_changed)
+
+    def track_negotiation(self, negotiation: BudgetNegotiation) -> None:
+        self._negotiation_changed(negotiation)
+        negotiation.add_listener(self._negotiation_changed)
+
+    def track_task(self, task: Task) -> None:
+        self._asks_seen[task] = len(task.budget_requests)
+        self._apply(task, task.event_id, self._column(WORKER_ASKS, sum(r.amount for r in task.budget_requests)))
+        task.add_listener(self._task_changed)
+
+    def rebuild(self, applications: Iterable[EventApplication], requests: Iterable[BudgetRequest],
+                negotiations: Iterable[BudgetNegotiation], tasks: Iterable[Task]) -> None:
+        for app in applications:
+            self.track_application(app)
+        for request in requests:
+            self.track_request(request)
+        for negotiation in negotiations:
+            self.track_negotiation(negotiation)
+        for task in tasks:
+            self.track_task(task)
+
+    def _request_changed(self, request: BudgetRequest) -> None:
+        with self._lock:
+            if request.status is BudgetRequestStatus.PENDING:
+                contribution = [0.0] * 5
+                contribution[REQUESTED] = request.amount
+                if self._negotiating.get(request):
+                    contribution[NEGOTIATING] = request.amount
+                self._apply(request, request.event_id, tuple(contribution))
+            elif request.status is BudgetRequestStatus.APPROVED:
+                self._apply(request, request.event_id, self._column(APPROVED, request.amount))
+            else:
+                self._apply(request, request.event_id, _EMPTY)
+
+    def _negotiation_changed(self, negotiation: BudgetNegotiation) -> None:
+        request = negotiation.request
+        with self._lock:
+            negotiations = self._negotiating.setdefault(request, set())
+            if negotiation.status in (BudgetNegotiationStatus.PENDING, BudgetNegotiationStatus.COUNTER_OFFER):
+                negotiations.add(negotiation)
+            else:
+                negotiations.discard(negotiation)
+            self._request_changed(request)
+
+    def _task_changed(self, task: Task) -> None:
+        # Workers only ever add asks, so only those past the seen count are new.
+        seen = self._asks_seen[task]
+        if seen == len(task.budget_requests):
+            return
+        self._asks_seen[task] = len(task.budget_requests)
+        _, old = self._contributions[task]
+        added = sum(r.amount for r in task.budget_requests[seen:])
+        self._apply(task, task.event_id, self._column(WORKER_ASKS, old[WORKER_ASKS] + added))
+
+    # -- Queries ----------------------------------------------------------
+    def _budget(self, event_id: int) -> EventBudget:
+        row = list(self._events.get(event_id, _EMPTY))
+        row[ORIGINAL] = self._originals.get(event_id, 0.0)
+        return EventBudget(*row)
+
+    def get(self, event_id: int) -> EventBudget:
+        with self._lock:
+            return self._budget(event_id)
+
+    def events(self) -> Dict[int, EventBudget]:
+        with self._lock:
+            event_ids = sorted(self._events.keys() | self._originals.keys())
+            return {event_id: budget for event_id in event_ids if any(budget := self._budget(event_id))}
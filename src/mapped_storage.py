@@ -0,0 +1,454 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping, Sequence
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .concurrency import Lockable
+from .event_request import EventApplication, EventApplicationStatus, EventSystem
+from .financial_request import BudgetNegotiation, BudgetNegotiationStatus, BudgetRequest, BudgetRequestStatus
+from .history import ROLES, HistoryColumns, HistoryStore, _from_micros, _to_micros
+from .models import Employee, Role
+from .staff_recruitment import HRRequest, HRRequestStatus
+from .storage import FileStorage
+from .task_distribution import Comment, Department, InternalBudgetRequest, Manager, Task, TaskStatus, Worker
+
+# File layout: header, section table, then the sections, each 8-byte aligned.
+# Records are fixed-width structs; text is stored once in the string table and
+# referenced by index, and enums by their position in the enum.
+MAGIC = b"SEPSNAP1"
+HEADER = struct.Struct("<8sBI")     # magic, array("L") item size, section count
+SECTION = struct.Struct("<QQ")      # offset, length in bytes
+
+SECTIONS = ("meta", "string_offsets", "strings", "users", "applications", "application_ids",
+            "history_app_ids", "history_timestamps", "history_roles", "history_actions", "history_comments",
+            "history_action_names", "history_comment_texts", "history_offsets", "history_rows", "history_acted",
+            "tasks", "task_workers", "task_comments", "task_budgets", "hr_requests", "hr_hired",
+            "budget_requests", "negotiations")
+
+# Typecodes of the HistoryStore columns (stored raw) and of the index sections.
+ARRAYS = {"string_offsets": "Q", "application_ids": "q", "history_app_ids": "q", "history_timestamps": "q",
+          "history_roles": "B", "history_actions": "B", "history_comments": "L", "history_action_names": "I",
+          "history_comment_texts": "I", "history_offsets": "q", "history_rows": "L"}
+
+META = struct.Struct("<qqqqqq")     # WAL seq, next HR / budget / negotiation / application ID, dead history rows
+USER = struct.Struct("<IIBBI")      # email, name, role, department, duty
+APPLICATION = struct.Struct("<qIIqqdIBBI")  # id, client, type, start, end, budget, preferences, created by, status, comment
+TASK = struct.Struct("<qIqIIBBq")   # id, manager email, event, title, description, department, status, created at
+TASK_WORKER = struct.Struct("<II")  # task position, worker email
+TASK_COMMENT = struct.Struct("<IIIq")       # task position, worker, comment, timestamp
+TASK_BUDGET = struct.Struct("<IIdIq")       # task position, worker, amount, reason, timestamp
+HR = struct.Struct("<qIB")          # id, type, status
+HR_HIRED = struct.Struct("<qI")     # request id, worker email
+BUDGET = struct.Struct("<qqdIBd")   # id, event, amount, reason, status, requested amount
+NEGOTIATION = struct.Struct("<qqB") # id, request id, status
+
+NONE = 0xFFFFFFFF       # string index of None
+NO_DEPARTMENT = 0xFF
+NO_ID = -1
+
+DEPARTMENTS = list(Department)
+TASK_STATUSES = list(TaskStatus)
+APP_STATUSES = list(EventApplicationStatus)
+HR_STATUSES = list(HRRequestStatus)
+BUDGET_STATUSES = list(BudgetRequestStatus)
+NEGOTIATION_STATUSES = list(BudgetNegotiationStatus)
+
+def _index_of(values: List[Any]) -> Dict[Any, int]:
+    return {value: position for position, value in enumerate(values)}
+
+ROLE_INDEX, DEPARTMENT_INDEX, TASK_STATUS_INDEX = _index_of(ROLES), _index_of(DEPARTMENTS), _index_of(TASK_STATUSES)
+APP_STATUS_INDEX, HR_STATUS_INDEX = _index_of(APP_STATUSES), _index_of(HR_STATUSES)
+BUDGET_STATUS_INDEX, NEGOTIATION_STATUS_INDEX = _index_of(BUDGET_STATUSES), _index_of(NEGOTIATION_STATUSES)
+
+
+class MappedSnapshot:
+    """A binary snapshot read in place from a buffer, usually a read-only mmap.
+
+    `state()` decodes users, tasks and requests, and gives the applications as
+    `MappedApplications` so each is only built from its record when accessed."""
+
+    def __init__(self, buffer: Any) -> None:
+        self.buffer = buffer
+        view = memoryview(buffer)
+        magic, item_size, count = HEADER.unpack_from(view)
+        if magic != MAGIC or count != len(SECTIONS):
+            raise ValueError("Not a snapshot file, or written by another version")
+        if item_size != array("L").itemsize:
+            raise ValueError("Snapshot was written on a platform with other integer sizes")
+        self.sections: Dict[str, memoryview] = {}
+        for position, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(view, HEADER.size + position * SECTION.size)
+            section = view[offset:offset + length]
+            self.sections[name] = section.cast(ARRAYS[name]) if name in ARRAYS else section
+        self.seq, *self.next_ids, self.next_app_id, self.dead_history = META.unpack(self.sections["meta"])
+        self._offsets = self.sections["string_offsets"]
+        self._strings = self.sections["strings"]
+
+    @property
+    def string_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def string(self, index: int) -> Optional[str]:
+        if index == NONE:
+            return None
+        return str(self._strings[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def records(self, name: str, layout: struct.Struct) -> Iterator[Tuple[Any, ...]]:
+        return layout.iter_unpack(self.sections[name])
+
+    def application(self, position: int, history: HistoryStore) -> EventApplication:
+        (app_id, client, event_type, start, end, budget, preferences, created_by, status,
+         comment) = APPLICATION.unpack_from(self.sections["applications"], position * APPLICATION.size)
+        s = self.string
+        app = EventApplication(app_id, s(client), s(event_type), _from_micros(start), _from_micros(end), budget,
+                               s(preferences), ROLES[created_by], history, log_creation=False)
+        app.status = APP_STATUSES[status]
+        app.comment = s(comment)
+        return app
+
+    def application_record(self, position: int) -> memoryview:
+        start = position * APPLICATION.size
+        return self.sections["applications"][start:start + APPLICATION.size]
+
+    def _column(self, name: str) -> array:
+        values = array(ARRAYS[name])
+        values.frombytes(self.sections[name].cast("B"))
+        return values
+
+    def history(self) -> HistoryStore:
+        s = self.string
+        return HistoryStore.from_columns(HistoryColumns(
+            *(self._column(name) for name in ("history_app_ids", "history_timestamps", "history_roles",
+                                              "history_actions", "history_comments")),
+            [s(i) for i in self.sections["history_action_names"]],
+            [s(i) for i in self.sections["history_comment_texts"]],
+            self._column("history_offsets"), self._column("history_rows"),
+            bytes(self.sections["history_acted"]), self.dead_history))
+
+    def state(self) -> Dict[str, Any]:
+        """The state dict `FileStorage` snapshots hold, plus "budgets" (application
+        budgets read from the records) and "reload" (decodes the state afresh)."""
+        s = self.string
+        users: Dict[str, Employee] = {}
+        emails: List[str] = []
+        for email, name, role, department, duty in self.records("users", USER):
+            email = s(email)
+            match ROLES[role]:
+                case Role.MANAGER:
+                    users[email] = Manager(s(name), DEPARTMENTS[department])
+                case Role.WORKER:
+                    users[email] = Worker(s(name), DEPARTMENTS[department], s(duty))
+                case other:
+                    users[email] = Employee(s(name), other)
+            emails.append(email)
+
+        history = self.history()
+        applications = MappedApplications(self, history)
+        system = EventSystem.loaded_lazily(applications, MappedIndex(self.sections["application_ids"], applications),
+                                           history, self.next_app_id)
+        applications.on_load = system.attach
+
+        tasks: List[Task] = []
+        for task_id, manager, event_id, title, description, department, status, created_at in self.records("tasks", TASK):
+            task = Task(event_id, s(title), s(description), DEPARTMENTS[department])
+            task.task_id = None if task_id == NO_ID else task_id
+            task.status = TASK_STATUSES[status]
+            task.created_at = _from_micros(created_at)
+            users[emails[manager]].tasks.append(task)
+            tasks.append(task)
+        for position, worker in self.records("task_workers", TASK_WORKER):
+            tasks[position].assigned_workers.append(users[emails[worker]])
+            users[emails[worker]].tasks.append(tasks[position])
+        for position, worker, comment, at in self.records("task_comments", TASK_COMMENT):
+            tasks[position].comments.append(Comment(s(worker), s(comment), _from_micros(at)))
+        for position, worker, amount, reason, at in self.records("task_budgets", TASK_BUDGET):
+            tasks[position].budget_requests.append(InternalBudgetRequest(s(worker), amount, s(reason), _from_micros(at)))
+
+        hr_requests: Dict[int, HRRequest] = {}
+        for request_id, req_type, status in self.records("hr_requests", HR):
+            request = hr_requests[request_id] = HRRequest(request_id, s(req_type))
+            request.status = HR_STATUSES[status]
+        for request_id, worker in self.records("hr_hired", HR_HIRED):
+            hr_requests[request_id].hired_staff.append(users[emails[worker]])
+
+        budget_requests: Dict[int, BudgetRequest] = {}
+        for request_id, event_id, amount, reason, status, requested in self.records("budget_requests", BUDGET):
+            request = budget_requests[request_id] = BudgetRequest(request_id, event_id, amount, s(reason))
+            request.status = BUDGET_STATUSES[status]
+            request.requested_amount = requested
+        negotiations: Dict[int, BudgetNegotiation] = {}
+        for negotiation_id, request_id, status in self.records("negotiations", NEGOTIATION):
+            negotiation = negotiations[negotiation_id] = BudgetNegotiation(negotiation_id, budget_requests[request_id])
+            negotiation.status = NEGOTIATION_STATUSES[status]
+
+        return {
+            "users": users,
+            "system": system,
+            "hr_requests": hr_requests,
+            "budget_requests": budget_requests,
+            "budget_negotiations": negotiations,
+            "next_ids": tuple(self.next_ids),
+            "budgets": MappedBudgets(self),
+            "reload": self.state,
+        }
+
+
+class MappedApplications(Lockable, Sequence):
+    """The applications of a snapshot, each built from its record on first access.
+
+    Applications added after loading are kept as objects. `on_load` is called
+    with every application built here, so its EventSystem can attach to it."""
+
+    def __init__(self, snapshot: MappedSnapshot, history: HistoryStore) -> None:
+        super().__init__()
+        self.snapshot = snapshot
+        self.history = history
+        self.on_load: Optional[Callable[[EventApplication], None]] = None
+        self._loaded: List[Optional[EventApplication]] = [None] * len(snapshot.sections["application_ids"])
+        self._added: List[EventApplication] = []
+
+    def __len__(self) -> int:
+        return len(self._loaded) + len(self._added)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if position >= len(self._loaded):
+            return self._added[position - len(self._loaded)]
+        app = self._loaded[position]
+        if app is None:
+            with self._lock:
+                app = self._loaded[position]
+                if app is None:
+                    app = self._loaded[position] = self.snapshot.application(position, self.history)
+                    if self.on_load is not None:
+                        self.on_load(app)
+        return app
+
+    def append(self, app: EventApplication) -> None:
+        self._added.append(app)
+
+    def extend(self, apps: List[EventApplication]) -> None:
+        self._added.extend(apps)
+
+    @property
+    def loaded(self) -> int:
+        return len(self._added) + sum(app is not None for app in self._loaded)
+
+    def encoded(self, pack: Callable[[EventApplication], bytes]) -> Iterator[Tuple[int, Any]]:
+        """(app_id, record) per application. Records never built are copied as
+        they are; they can only be unchanged, as changing one builds it first."""
+        ids = self.snapshot.sections["application_ids"]
+        for position, app in enumerate(self._loaded):
+            if app is None:
+                yield ids[position], self.snapshot.application_record(position)
+            else:
+                yield app.app_id, pack(app)
+        for app in self._added:
+            yield app.app_id, pack(app)
+
+    def __reduce__(self):
+        # Copies (e.g. journal checkpoints) get a plain list.
+        return list, (list(self),)
+
+
+class MappedIndex(MutableMapping):
+    """ID -> application for `MappedApplications`: loaded IDs are found by
+    bisecting the snapshot's sorted ID section, later ones in a dict."""
+
+    def __init__(self, ids: Sequence, applications: MappedApplications) -> None:
+        self._ids = ids
+        self._applications = applications
+        self._added: Dict[int, EventApplication] = {}
+
+    def _position(self, app_id: int) -> int:
+        position = bisect_left(self._ids, app_id)
+        return position if position < len(self._ids) and self._ids[position] == app_id else -1
+
+    def __getitem__(self, app_id: int) -> EventApplication:
+        app = self._added.get(app_id)
+        if app is not None:
+            return app
+        position = self._position(app_id) if isinstance(app_id, int) else -1
+        if position < 0:
+            raise KeyError(app_id)
+        return self._applications[position]
+
+    def __contains__(self, app_id: object) -> bool:
+        return app_id in self._added or (isinstance(app_id, int) and self._position(app_id) >= 0)
+
+    def __setitem__(self, app_id: int, app: EventApplication) -> None:
+        self._added[app_id] = app
+
+    def __delitem__(self, app_id: int) -> None:
+        del self._added[app_id]
+
+    def __iter__(self) -> Iterator[int]:
+        yield from self._ids
+        yield from self._added
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._added)
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+
+class MappedBudgets(Mapping):
+    """Budget per application ID, read straight from the application records."""
+
+    def __init__(self, snapshot: MappedSnapshot) -> None:
+        self._snapshot = snapshot
+        self._ids = snapshot.sections["application_ids"]
+        self._records = snapshot.sections["applications"]
+
+    def __getitem__(self, app_id: int) -> float:
+        position = bisect_left(self._ids, app_id)
+        if position == len(self._ids) or self._ids[position] != app_id:
+            raise KeyError(app_id)
+        return APPLICATION.unpack_from(self._records, position * APPLICATION.size)[5]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class _StringTable:
+    def __init__(self, base: Optional[MappedSnapshot] = None) -> None:
+        # Starting from the table of the snapshot being rewritten keeps the
+        # indices in records copied from it valid.
+        self.blob = bytearray()
+        self.offsets = array("Q", [0])
+        self.codes: Dict[str, int] = {}
+        if base is not None:
+            self.blob += base.sections["strings"]
+            self.offsets = array("Q", base.sections["string_offsets"])
+            self.codes = {base.string(i): i for i in range(base.string_count)}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.offsets) - 1
+            self.blob += value.encode()
+            self.offsets.append(len(self.blob))
+        return code
+
+
+def _raw(values: array, typecode: str) -> bytes:
+    return (values if values.typecode == typecode else array(typecode, values)).tobytes()
+
+def write_snapshot(f: BinaryIO, seq: int, state: Dict[str, Any]) -> None:
+    """Write `state` (as returned by `MappedSnapshot.state` or main's snapshot_state) to `f`."""
+    users: Dict[str, Employee] = state["users"]
+    system: EventSystem = state["system"]
+    applications = system.applications
+    strings = _StringTable(applications.snapshot if isinstance(applications, MappedApplications) else None)
+    code = strings.code
+    sections: Dict[str, bytes] = {}
+
+    emails = {id(user): position for position, user in enumerate(users.values())}
+    sections["users"] = b"".join(
+        USER.pack(code(email), code(u.name), ROLE_INDEX[u.role],
+                  DEPARTMENT_INDEX[u.department] if isinstance(u, (Manager, Worker)) else NO_DEPARTMENT,
+                  code(getattr(u, "duty", None)))
+        for email, u in users.items())
+
+    def pack(a: EventApplication) -> bytes:
+        return APPLICATION.pack(a.app_id, code(a.client_name), code(a.event_type), _to_micros(a.start_date),
+                                _to_micros(a.end_date), a.budget, code(a.preferences), ROLE_INDEX[a.created_by],
+                                APP_STATUS_INDEX[a.status], code(a.comment))
+
+    if isinstance(applications, MappedApplications):
+        records = list(applications.encoded(pack))
+    else:
+        records = [(a.app_id, pack(a)) for a in applications]
+    if any(records[i][0] > records[i + 1][0] for i in range(len(records) - 1)):
+        records.sort(key=lambda record: record[0])
+    sections["applications"] = b"".join(record for _, record in records)
+    sections["application_ids"] = array("q", (app_id for app_id, _ in records)).tobytes()
+
+    columns = system.history.export_columns()
+    for name, values in zip(("history_app_ids", "history_timestamps", "history_roles", "history_actions",
+                             "history_comments"), columns):
+        sections[name] = _raw(values, ARRAYS[name])
+    sections["history_action_names"] = array("I", map(code, columns.action_names)).tobytes()
+    sections["history_comment_texts"] = array("I", map(code, columns.comment_texts)).tobytes()
+    sections["history_offsets"] = _raw(columns.offsets, "q")
+    sections["history_rows"] = _raw(columns.rows, "L")
+    sections["history_acted"] = columns.acted
+
+    tasks = [(emails[id(u)], t) for u in users.values() if isinstance(u, Manager) for t in u.tasks]
+    sections["tasks"] = b"".join(
+        TASK.pack(NO_ID if t.task_id is None else t.task_id, manager, t.event_id, code(t.title), code(t.description),
+                  DEPARTMENT_INDEX[t.department], TASK_STATUS_INDEX[t.status], _to_micros(t.created_at))
+        for manager, t in tasks)
+    sections["task_workers"] = b"".join(
+        TASK_WORKER.pack(i, emails[id(w)]) for i, (_, t) in enumerate(tasks) for w in t.assigned_workers)
+    sections["task_comments"] = b"".join(
+        TASK_COMMENT.pack(i, code(c.worker), code(c.comment), _to_micros(c.timestamp))
+        for i, (_, t) in enumerate(tasks) for c in t.comments)
+    sections["task_budgets"] = b"".join(
+        TASK_BUDGET.pack(i, code(b.worker), b.amount, code(b.reason), _to_micros(b.timestamp))
+        for i, (_, t) in enumerate(tasks) for b in t.budget_requests)
+
+    hr_requests: Dict[int, HRRequest] = state["hr_requests"]
+    sections["hr_requests"] = b"".join(
+        HR.pack(r.request_id, code(r.type), HR_STATUS_INDEX[r.status]) for r in hr_requests.values())
+    sections["hr_hired"] = b"".join(
+        HR_HIRED.pack(r.request_id, emails[id(w)]) for r in hr_requests.values() for w in r.hired_staff)
+    budget_requests: Dict[int, BudgetRequest] = state["budget_requests"]
+    sections["budget_requests"] = b"".join(
+        BUDGET.pack(r.request_id, r.event_id, r.amount, code(r.reason), BUDGET_STATUS_INDEX[r.status],
+                    r.requested_amount)
+        for r in budget_requests.values())
+    negotiations: Dict[int, BudgetNegotiation] = state["budget_negotiations"]
+    sections["negotiations"] = b"".join(
+        NEGOTIATION.pack(n.negotiation_id, n.request.request_id, NEGOTIATION_STATUS_INDEX[n.status])
+        for n in negotiations.values())
+
+    sections["meta"] = META.pack(seq, *state["next_ids"], system.next_id, columns.dead)
+    # The string table last, once every record has added its strings.
+    sections["string_offsets"] = strings.offsets.tobytes()
+    sections["strings"] = bytes(strings.blob)
+
+    offset = HEADER.size + len(SECTIONS) * SECTION.size
+    table = []
+    for name in SECTIONS:
+        offset += -offset % 8
+        table.append(SECTION.pack(offset, len(sections[name])))
+        offset += len(sections[name])
+    f.write(HEADER.pack(MAGIC, array("L").itemsize, len(SECTIONS)))
+    f.write(b"".join(table))
+    position = HEADER.size + len(SECTIONS) * SECTION.size
+    for name in SECTIONS:
+        f.write(bytes(-position % 8))
+        position += -position % 8
+        f.write(sections[name])
+        position += len(sections[name])
+
+
+class MappedFileStorage(FileStorage):
+    """FileStorage with a binary snapshot that is memory-mapped when loaded.
+
+    Loading reads only the header and the small sections; applications are
+    built from their records as they are accessed (see `MappedSnapshot`)."""
+
+    SNAPSHOT_FILE = "snapshot.bin"
+
+    def _load_snapshot(self) -> Tuple[int, Any]:
+        with open(self.snapshot_path, "rb") as f:
+            # The mapping stays valid after the file is closed or replaced.
+            snapshot = MappedSnapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        return snapshot.seq, snapshot.state()
+
+    def _dump_snapshot(self, f: BinaryIO, state: Any) -> None:
+        write_snapshot(f, self._seq, state)
+
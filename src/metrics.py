@@ -0,0 +1,37 @@
+import time
+from typing import Dict, List
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples, `q` in [0, 100]."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, round(q / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+class LatencyRecorder:
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+        self.started: float = time.perf_counter()
+        self.elapsed: float = 0.0
+
+    def record(self, name: str, seconds: float) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def count(self) -> int:
+        return sum(len(s) for s in self.samples.values())
+
+    def report(self) -> List[str]:
+        elapsed = self.elapsed or time.perf_counter() - self.started
+        rate = self.count / elapsed if elapsed else 0.0
+        lines = [
+            f"{self.count} commands in {elapsed:.3f}s ({rate:,.0f} commands/sec)",
+            f"{'command':<28}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}",
+        ]
+        for name, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            lines.append(f"{name:<28}{len(ordered):>8}{percentile(ordered, 50) * 1000:>10.3f}{percentile(ordered, 99) * 1000:>10.3f}")
+        return lines
@@ -1,5 +1,7 @@
 from enum import Enum
 
+from .concurrency import Lockable
+
 class Role(Enum):
     ADM_MANAGER = "Administration Department Manager"
     FIN_MANAGER = "Financial Manager"
@@ -10,7 +12,10 @@ class Role(Enum):
     MANAGER = "Manager"
     WORKER = "Staff Member"
 
-class Employee():
+class Employee(Lockable):
+    __slots__ = ("name", "role")
+
     def __init__(self, name: str, role: Role) -> None:
+        super().__init__()
         self.name = name
         self.role = role
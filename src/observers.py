@@ -0,0 +1,20 @@
+from typing import Any, Callable, Tuple
+
+from .concurrency import Lockable
+
+class Observable(Lockable):
+    """A lockable object that derived views (analytics, ledgers) can follow.
+
+    Listeners are called with the object after each change, while its lock is
+    held. Objects nobody listens to carry no listener storage, and listeners
+    are not pickled: whoever restores state subscribes again."""
+
+    __slots__ = ("listeners",)
+    _transient_slots = ("listeners",)
+
+    def add_listener(self, callback: Callable[[Any], None]) -> None:
+        self.listeners: Tuple[Callable[[Any], None], ...] = getattr(self, "listeners", ()) + (callback,)
+
+    def _notify(self) -> None:
+        for callback in getattr(self, "listeners", ()):
+            callback(self)
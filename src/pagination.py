@@ -0,0 +1,19 @@
+from itertools import islice
+from typing import Iterator, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+
+def by_id(items: Mapping[int, T], after: int = 0, stop: Optional[int] = None,
+          limit: Optional[int] = None) -> Iterator[T]:
+    """Items of an ID-keyed mapping with IDs above `after`, in ID order.
+
+    IDs come from an IdAllocator, so walking the ID range up to `stop` (its
+    next ID) visits each item once plus any unused IDs, without copying or
+    sorting the mapping. `after` is the cursor: the last ID a caller has seen,
+    which stays valid however many items are added meanwhile."""
+    if limit is not None and limit < 0:
+        raise ValueError("Limit must not be negative.")
+    if stop is None:
+        stop = max(items, default=0) + 1
+    found = (items.get(item_id) for item_id in range(after + 1, stop))
+    return islice((item for item in found if item is not None), limit)
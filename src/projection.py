@@ -0,0 +1,169 @@
+import pickle
+from typing import Callable, Dict, Iterable
+
+from .event_request import ApplicationStatusChanged, ApplicationSubmitted, EventApplication, EventSystem
+from .financial_request import (BudgetNegotiation, BudgetNegotiationStatus, BudgetRequest, BudgetRequestDecided,
+                                BudgetRequestOpened, CounterOffered, NegotiationDecided, NegotiationOpened)
+from .history import HistoryEntry
+from .journal import DomainEvent, Journal
+from .models import Role
+from .staff_recruitment import HRRequest, HRRequestDecided, HRRequestOpened, HRRequestStatus, StaffHired
+from .task_distribution import (Comment, InternalBudgetRequest, Task, TaskAssigned, TaskBudgetAsked, TaskCommented,
+                                TaskCreated, TaskStatusChanged, Worker)
+
+class DomainState:
+    """The domain objects rebuilt from nothing but journal events.
+
+    Events are applied by setting the recorded outcome directly rather than
+    calling the domain methods: the checks already passed when the event was
+    recorded, and replay must not record new events of its own."""
+
+    def __init__(self) -> None:
+        self.seq: int = 0
+        self.system: EventSystem = EventSystem()
+        self.hr_requests: Dict[int, HRRequest] = {}
+        self.budget_requests: Dict[int, BudgetRequest] = {}
+        self.negotiations: Dict[int, BudgetNegotiation] = {}
+        self.tasks: Dict[int, Task] = {}
+        # Assigned workers by name, so a worker on several tasks is one object.
+        self.workers: Dict[str, Worker] = {}
+
+    @classmethod
+    def of(cls, system: EventSystem, hr_requests: Dict[int, HRRequest], budget_requests: Dict[int, BudgetRequest],
+           negotiations: Dict[int, BudgetNegotiation], tasks: Iterable[Task], seq: int = 0) -> "DomainState":
+        """A state over existing objects, e.g. to checkpoint state restored by
+        other means. `seq` is the last journal event they already reflect."""
+        state = cls()
+        state.seq = seq
+        state.system = system
+        state.hr_requests = hr_requests
+        state.budget_requests = budget_requests
+        state.negotiations = negotiations
+        state.tasks = {t.task_id: t for t in tasks if t.task_id is not None}
+        state.workers = {w.name: w for t in state.tasks.values() for w in t.assigned_workers}
+        return state
+
+    def apply(self, event: DomainEvent) -> None:
+        _HANDLERS[type(event)](self, event)
+        self.seq += 1
+
+    def apply_all(self, events: Iterable[DomainEvent]) -> None:
+        handlers = _HANDLERS
+        applied = 0
+        for event in events:
+            handlers[type(event)](self, event)
+            applied += 1
+        self.seq += applied
+
+    def catch_up(self, journal: Journal) -> int:
+        """Apply the journal events this state hasn't seen yet; returns how many."""
+        events = journal.events(self.seq)
+        self.apply_all(events)
+        return len(events)
+
+    def snapshot(self) -> bytes:
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def checkpoint(self, journal: Journal, compact: bool = False) -> None:
+        self.catch_up(journal)
+        journal.save_checkpoint(self.seq, self.snapshot(), compact)
+
+    @classmethod
+    def rebuild(cls, journal: Journal) -> "DomainState":
+        """Latest checkpoint (if any) plus the events recorded after it."""
+        checkpoint = journal.checkpoint
+        state: DomainState = pickle.loads(checkpoint[1]) if checkpoint else cls()
+        state.catch_up(journal)
+        return state
+
+    # -- Event handlers ---------------------------------------------------
+    def _application_submitted(self, e: ApplicationSubmitted) -> None:
+        app = EventApplication(e.app_id, e.client_name, e.event_type, e.start_date, e.end_date, e.budget,
+                               e.preferences, e.created_by, self.system.history, e.at)
+        self.system.add_application(app)
+
+    def _application_status_changed(self, e: ApplicationStatusChanged) -> None:
+        app = self.system.get_application_by_id(e.app_id)
+        old_status, app.status = app.status, e.status
+        if app.on_status_change is not None and old_status is not e.status:
+            app.on_status_change(app, old_status)
+        if e.comment and e.role is Role.FIN_MANAGER:
+            app.comment = e.comment
+        app.history_store.append(e.app_id, HistoryEntry(e.at, e.role, e.status.value, e.comment))
+
+    def _hr_request_opened(self, e: HRRequestOpened) -> None:
+        self.hr_requests[e.request_id] = HRRequest(e.request_id, e.type)
+
+    def _hr_request_decided(self, e: HRRequestDecided) -> None:
+        self.hr_requests[e.request_id].status = e.status
+
+    def _staff_hired(self, e: StaffHired) -> None:
+        request = self.hr_requests[e.request_id]
+        request.hired_staff.append(Worker(e.name, e.department, e.duty))
+        request.status = HRRequestStatus.HIRED
+
+    def _budget_request_opened(self, e: BudgetRequestOpened) -> None:
+        self.budget_requests[e.request_id] = BudgetRequest(e.request_id, e.event_id, e.amount, e.reason)
+
+    def _budget_request_decided(self, e: BudgetRequestDecided) -> None:
+        self.budget_requests[e.request_id].status = e.status
+
+    def _negotiation_opened(self, e: NegotiationOpened) -> None:
+        self.negotiations[e.negotiation_id] = BudgetNegotiation(e.negotiation_id, self.budget_requests[e.request_id])
+
+    def _counter_offered(self, e: CounterOffered) -> None:
+        negotiation = self.negotiations[e.negotiation_id]
+        negotiation.status = BudgetNegotiationStatus.COUNTER_OFFER
+        negotiation.request.amount = e.amount
+
+    def _negotiation_decided(self, e: NegotiationDecided) -> None:
+        self.negotiations[e.negotiation_id].status = e.status
+
+    def _task_created(self, e: TaskCreated) -> None:
+        if e.task_id is not None:
+            task = Task(e.event_id, e.title, e.description, e.department)
+            task.task_id = e.task_id
+            self.tasks[e.task_id] = task
+
+    def _task_status_changed(self, e: TaskStatusChanged) -> None:
+        task = self.tasks.get(e.task_id)
+        if task is not None:
+            task.status = e.status
+
+    def _task_assigned(self, e: TaskAssigned) -> None:
+        task = self.tasks.get(e.task_id)
+        if task is not None:
+            worker = self.workers.get(e.worker)
+            if worker is None:
+                worker = self.workers[e.worker] = Worker(e.worker, e.department, e.duty)
+            task.assigned_workers.append(worker)
+            worker.tasks.append(task)
+
+    def _task_commented(self, e: TaskCommented) -> None:
+        task = self.tasks.get(e.task_id)
+        if task is not None:
+            task.comments.append(Comment(e.worker, e.comment, e.at))
+
+    def _task_budget_asked(self, e: TaskBudgetAsked) -> None:
+        task = self.tasks.get(e.task_id)
+        if task is not None:
+            task.budget_requests.append(InternalBudgetRequest(e.worker, e.amount, e.reason, e.at))
+
+
+_HANDLERS: Dict[type, Callable[[DomainState, DomainEvent], None]] = {
+    ApplicationSubmitted: DomainState._application_submitted,
+    ApplicationStatusChanged: DomainState._application_status_changed,
+    HRRequestOpened: DomainState._hr_request_opened,
+    HRRequestDecided: DomainState._hr_request_decided,
+    StaffHired: DomainState._staff_hired,
+    BudgetRequestOpened: DomainState._budget_request_opened,
+    BudgetRequestDecided: DomainState._budget_request_decided,
+    NegotiationOpened: DomainState._negotiation_opened,
+    CounterOffered: DomainState._counter_offered,
+    NegotiationDecided: DomainState._negotiation_decided,
+    TaskCreated: DomainState._task_created,
+    TaskStatusChanged: DomainState._task_status_changed,
+    TaskAssigned: DomainState._task_assigned,
+    TaskCommented: DomainState._task_commented,
+    TaskBudgetAsked: DomainState._task_budget_asked,
+}
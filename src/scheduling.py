@@ -0,0 +1,283 @@
+import random
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, Generic, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .concurrency import Lockable
+from .task_distribution import Department, Task, TaskStatus, Worker
+
+V = TypeVar("V")
+Period = Tuple[datetime, datetime]
+
+class _Node:
+    __slots__ = ("key", "end", "value", "priority", "left", "right", "max_end")
+
+    def __init__(self, key: Tuple[Any, ...], end: Any, value: Any) -> None:
+        self.key = key
+        self.end = end
+        self.value = value
+        self.priority = random.random()
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.max_end = end
+
+def _update(node: _Node) -> _Node:
+    node.max_end = node.end
+    for child in (node.left, node.right):
+        if child is not None and child.max_end > node.max_end:
+            node.max_end = child.max_end
+    return node
+
+def _split(node: Optional[_Node], key: Tuple[Any, ...], inclusive: bool) -> Tuple[Optional[_Node], Optional[_Node]]:
+    # Nodes with keys below `key` (or equal, if inclusive) go left.
+    if node is None:
+        return None, None
+    if node.key < key or (inclusive and node.key == key):
+        node.right, right = _split(node.right, key, inclusive)
+        return _update(node), right
+    left, node.left = _split(node.left, key, inclusive)
+    return left, _update(node)
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+class IntervalTree(Generic[V]):
+    """Closed intervals [start, end] with a value each.
+
+    A treap ordered by (start, end, tiebreak), where each node also keeps the
+    latest end in its subtree: a search skips every subtree ending before the
+    query starts and every node starting after it ends. Adding, removing and
+    finding whether anything overlaps take O(log n); listing the k overlaps
+    takes O(log n + k)."""
+
+    def __init__(self) -> None:
+        self._root: Optional[_Node] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def build(cls, intervals: Iterable[Tuple[Any, Any, V, Hashable]]) -> "IntervalTree[V]":
+        """A tree of (start, end, value, tiebreak) intervals. Sorts once and links the
+        nodes in a single pass, instead of splitting and merging per `add`."""
+        tree: IntervalTree[V] = cls()
+        nodes = sorted((_Node((start, end, tiebreak), end, value) for start, end, value, tiebreak in intervals),
+                       key=lambda node: node.key)
+        # The right spine of the tree so far; priorities fall towards its end.
+        spine: List[_Node] = []
+        for node in nodes:
+            last: Optional[_Node] = None
+            while spine and spine[-1].priority < node.priority:
+                last = _update(spine.pop())
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        for node in reversed(spine):
+            _update(node)
+        tree._root = spine[0] if spine else None
+        tree._size = len(nodes)
+        return tree
+
+    def add(self, start: Any, end: Any, value: V, tiebreak: Hashable = 0) -> None:
+        """`tiebreak` tells apart intervals with the same bounds; (start, end, tiebreak) must be unique."""
+        key = (start, end, tiebreak)
+        left, right = _split(self._root, key, inclusive=False)
+        self._root = _merge(_merge(left, _Node(key, end, value)), right)
+        self._size += 1
+
+    def remove(self, start: Any, end: Any, tiebreak: Hashable = 0) -> None:
+        key = (start, end, tiebreak)
+        left, rest = _split(self._root, key, inclusive=False)
+        middle, right = _split(rest, key, inclusive=True)
+        if middle is None:
+            self._root = _merge(left, right)
+            raise KeyError(key)
+        self._root = _merge(left, right)
+        self._size -= 1
+
+    def overlapping(self, lo: Any, hi: Any) -> Iterator[Tuple[Any, Any, V]]:
+        """(start, end, value) of intervals overlapping [lo, hi], in start order."""
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            # Go left while the left subtree can still reach `lo`.
+            while node is not None and node.max_end >= lo:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            start = node.key[0]
+            if start > hi:
+                return
+            if node.end >= lo:
+                yield start, node.end, node.value
+            node = node.right
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any, V]]:
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key[0], node.end, node.value
+            node = node.right
+
+
+class Schedule(Lockable):
+    """Which workers are booked for which events, kept current from the tasks.
+
+    A worker is booked for an event while assigned to one of its tasks that
+    is not closed. Bookings are kept in an interval tree per worker and per
+    department, keyed by the event's period from `event_dates(event_id)`
+    (None for unknown events, which are not checked). A worker may have many
+    tasks for one event but may not be booked for two overlapping events.
+    `capacity` optionally caps how many workers of a department can be booked
+    at events overlapping any one period."""
+
+    # Lock ordering: a task's lock may be held while taking the schedule lock.
+
+    def __init__(self, event_dates: Callable[[int], Optional[Period]],
+                 capacity: Optional[Dict[Department, int]] = None) -> None:
+        super().__init__()
+        self.event_dates = event_dates
+        self.capacity: Dict[Department, int] = dict(capacity or {})
+        # Workers per department and per (department, duty), split by whether
+        # they have any dated booking: idle ones are free in every period.
+        self._idle: Dict[Hashable, Dict[Worker, None]] = {}
+        self._engaged: Dict[Hashable, Dict[Worker, None]] = {}
+        self._by_worker: Dict[Worker, IntervalTree[int]] = {}
+        self._by_department: Dict[Department, IntervalTree[Worker]] = {d: IntervalTree() for d in Department}
+        # Open tasks per worker and event; a booking exists while the count is positive.
+        self._tasks: Dict[Worker, Dict[int, int]] = {}
+        self._counted: Dict[Task, FrozenSet[Worker]] = {}
+        self._numbers: Dict[Worker, int] = {}
+        # Called with a worker whenever their open task count changes.
+        self.on_change: Optional[Callable[[Worker], None]] = None
+
+    def add_worker(self, worker: Worker) -> None:
+        with self._lock:
+            if worker not in self._numbers:
+                self._numbers[worker] = len(self._numbers)
+                for key in self._keys(worker):
+                    self._idle.setdefault(key, {})[worker] = None
+                self._by_worker[worker] = IntervalTree()
+                self._tasks[worker] = {}
+
+    def track(self, task: Task) -> None:
+        self._task_changed(task)
+        task.add_listener(self._task_changed)
+
+    def load(self, worker: Worker) -> int:
+        """Open tasks assigned to `worker`."""
+        return sum(self._tasks.get(worker, {}).values())
+
+    def _task_changed(self, task: Task) -> None:
+        with self._lock:
+            counted = frozenset(task.assigned_workers) if task.status is not TaskStatus.CLOSED else frozenset()
+            before = self._counted.get(task, frozenset())
+            if counted == before:
+                return
+            self._counted[task] = counted
+            for worker in before - counted:
+                self._adjust(worker, task.event_id, -1)
+            for worker in counted - before:
+                self.add_worker(worker)
+                self._adjust(worker, task.event_id, 1)
+
+    def _adjust(self, worker: Worker, event_id: int, delta: int) -> None:
+        tasks = self._tasks[worker]
+        before = tasks.get(event_id, 0)
+        tasks[event_id] = before + delta
+        if not tasks[event_id]:
+            del tasks[event_id]
+        period = self.event_dates(event_id)
+        bookings = self._by_worker[worker]
+        if period is not None and not before:
+            bookings.add(*period, event_id, event_id)
+            self._by_department[worker.department].add(*period, worker, (self._numbers[worker], event_id))
+            if len(bookings) == 1:
+                self._move(worker, self._idle, self._engaged)
+        elif period is not None and not tasks.get(event_id):
+            bookings.remove(*period, event_id)
+            self._by_department[worker.department].remove(*period, (self._numbers[worker], event_id))
+            if not bookings:
+                self._move(worker, self._engaged, self._idle)
+        if self.on_change is not None:
+            self.on_change(worker)
+
+    @staticmethod
+    def _keys(worker: Worker) -> Tuple[Hashable, Hashable]:
+        return worker.department, (worker.department, worker.duty.casefold())
+
+    def _move(self, worker: Worker, source: Dict[Hashable, Dict[Worker, None]],
+              target: Dict[Hashable, Dict[Worker, None]]) -> None:
+        for key in self._keys(worker):
+            source[key].pop(worker, None)
+            target.setdefault(key, {})[worker] = None
+
+    # -- Queries ----------------------------------------------------------
+    def clashes(self, worker: Worker, period: Optional[Period], event_id: Optional[int] = None) -> Iterator[int]:
+        """Events other than `event_id` that `worker` is booked for during `period`."""
+        if period is None or worker not in self._by_worker:
+            return iter(())
+        return (other for _, _, other in self._by_worker[worker].overlapping(*period) if other != event_id)
+
+    def is_busy(self, worker: Worker, period: Optional[Period], event_id: Optional[int] = None) -> bool:
+        with self._lock:
+            return next(self.clashes(worker, period, event_id), None) is not None
+
+    def booked(self, department: Department, start: datetime, end: datetime) -> Dict[Worker, None]:
+        """Workers of `department` booked for events overlapping [start, end]."""
+        with self._lock:
+            return {worker: None for _, _, worker in self._by_department[department].overlapping(start, end)}
+
+    def free_workers(self, department: Department, start: datetime, end: datetime,
+                     duty: Optional[str] = None) -> List[Worker]:
+        """Workers of `department` (with `duty`, if given) not booked during [start, end],
+        in the order they were added. Idle workers are taken as they are; only
+        those booked for some event are checked against the period."""
+        key = department if duty is None else (department, duty.casefold())
+        with self._lock:
+            booked = self.booked(department, start, end)
+            free = list(self._idle.get(key, {}))
+            free.extend(w for w in self._engaged.get(key, {}) if w not in booked)
+            free.sort(key=self._numbers.__getitem__)
+            return free
+
+    def conflicts(self, task: Task, workers: List[Worker]) -> List[str]:
+        """Why assigning `workers` to `task` would double-book someone or exceed
+        the department's capacity; empty if it would not."""
+        period = self.event_dates(task.event_id)
+        if period is None:
+            return []
+        reasons: List[str] = []
+        with self._lock:
+            for worker in workers:
+                for other in self.clashes(worker, period, task.event_id):
+                    start, end = self.event_dates(other) or period
+                    reasons.append(f"{worker.name} is already booked for Event #{other} "
+                                   f"({start:%Y-%m-%d %H:%M} - {end:%Y-%m-%d %H:%M}).")
+                    break
+            capacity = self.capacity.get(task.department)
+            if capacity is not None:
+                booked = self.booked(task.department, *period)
+                added = {w: None for w in workers if w not in booked}
+                if len(booked) + len(added) > capacity:
+                    reasons.append(f"{task.department.value} would have {len(booked) + len(added)} workers booked "
+                                   f"around Event #{task.event_id}, above its capacity of {capacity}.")
+        return reasons
+
+    def check(self, task: Task, workers: List[Worker]) -> None:
+        reasons = self.conflicts(task, workers)
+        if reasons:
+            raise ValueError(" ".join(reasons))
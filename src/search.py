@@ -0,0 +1,162 @@
+import math
+import re
+from bisect import bisect_left, insort
+from heapq import nlargest
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .concurrency import Lockable
+from .event_request import EventApplication
+from .financial_request import BudgetRequest
+from .task_distribution import Task
+
+_TOKEN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+class Document(NamedTuple):
+    kind: str           # APPLICATION, BUDGET_REQUEST, TASK_COMMENT or TASK_BUDGET
+    id: int             # application, request or task ID
+    position: int = 0   # which comment / budget ask of the task
+
+APPLICATION = "application"
+BUDGET_REQUEST = "budget request"
+TASK_COMMENT = "task comment"
+TASK_BUDGET = "task budget ask"
+
+class SearchIndex(Lockable):
+    """Inverted index over application preferences, budget request reasons
+    and task comments and budget asks, updated as they are written.
+
+    Each term maps to the documents containing it with their term counts.
+    Every query word matches the terms it is a prefix of, found by bisecting
+    the sorted vocabulary; a document must match all words. Results are
+    ranked by tf-idf, intersecting from the rarest word, so a query costs
+    about the size of its rarest word's postings, not of the index."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._postings: Dict[str, Dict[Document, int]] = {}
+        self._terms: List[str] = []
+        self._docs: Dict[Document, str] = {}
+        # Task comments and asks indexed so far, per task.
+        self._seen: Dict[Task, Tuple[int, int]] = {}
+        # Loaders to run before the first search (see `defer`).
+        self._pending: List[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def defer(self, load: Callable[[], None]) -> None:
+        """Run `load` (e.g. a `rebuild`) on the first search instead of now, so
+        startup need not read every document. Indexing is idempotent, so it
+        may cover documents also added directly meanwhile."""
+        with self._lock:
+            self._pending.append(load)
+
+    def _load_pending(self) -> None:
+        with self._lock:
+            while self._pending:
+                self._pending.pop(0)()
+
+    # -- Documents --------------------------------------------------------
+    def index(self, doc: Document, text: str) -> None:
+        with self._lock:
+            old = self._docs.get(doc)
+            if old == text:
+                return
+            if old is not None:
+                self.remove(doc)
+            self._docs[doc] = text
+            for term in tokenize(text):
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._terms, term)
+                postings[doc] = postings.get(doc, 0) + 1
+
+    def remove(self, doc: Document) -> None:
+        with self._lock:
+            text = self._docs.pop(doc, None)
+            for term in set(tokenize(text or "")):
+                # Emptied terms stay in the vocabulary; prefix scans skip them.
+                self._postings[term].pop(doc, None)
+
+    def track_application(self, app: EventApplication) -> None:
+        # Preferences are fixed once submitted, so no listener is needed.
+        self.index(Document(APPLICATION, app.app_id), app.preferences)
+
+    def track_request(self, request: BudgetRequest) -> None:
+        self.index(Document(BUDGET_REQUEST, request.request_id), request.reason)
+
+    def track_task(self, task: Task) -> None:
+        self._task_changed(task)
+        task.add_listener(self._task_changed)
+
+    def _task_changed(self, task: Task) -> None:
+        with self._lock:
+            comments, asks = self._seen.get(task, (0, 0))
+            for position in range(comments, len(task.comments)):
+                self.index(Document(TASK_COMMENT, task.task_id, position), task.comments[position].comment)
+            for position in range(asks, len(task.budget_requests)):
+                self.index(Document(TASK_BUDGET, task.task_id, position), task.budget_requests[position].reason)
+            self._seen[task] = (len(task.comments), len(task.budget_requests))
+
+    def rebuild(self, applications: Iterable[EventApplication], requests: Iterable[BudgetRequest],
+                tasks: Iterable[Task]) -> None:
+        for app in applications:
+            self.track_application(app)
+        for request in requests:
+            self.track_request(request)
+        for task in tasks:
+            self.track_task(task)
+
+    # -- Queries ----------------------------------------------------------
+    def _matches(self, word: str) -> Dict[Document, float]:
+        """Documents containing a term starting with `word`, with its tf-idf weight."""
+        weights: Dict[Document, float] = {}
+        total = len(self._docs)
+        for i in range(bisect_left(self._terms, word), len(self._terms)):
+            term = self._terms[i]
+            if not term.startswith(word):
+                break
+            postings = self._postings[term]
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for doc, count in postings.items():
+                weights[doc] = weights.get(doc, 0.0) + (1 + math.log(count)) * idf
+        return weights
+
+    def _estimate(self, word: str) -> int:
+        # Postings a word would expand to, to pick the rarest word first.
+        size = 0
+        for i in range(bisect_left(self._terms, word), len(self._terms)):
+            if not self._terms[i].startswith(word):
+                break
+            size += len(self._postings[self._terms[i]])
+        return size
+
+    def search(self, query: str, limit: int = 10,
+               visible: Optional[Callable[[Document], bool]] = None) -> List[Tuple[float, Document]]:
+        """The `limit` best (score, document) matches for all words of `query`
+        among the documents `visible` accepts, best first."""
+        if limit < 0:
+            raise ValueError("Limit must not be negative.")
+        self._load_pending()
+        words = sorted(set(tokenize(query)))
+        if not words:
+            return []
+        with self._lock:
+            words.sort(key=self._estimate)
+            scores = self._matches(words[0])
+            for word in words[1:]:
+                if not scores:
+                    break
+                weights = self._matches(word)
+                scores = {doc: score + weights[doc] for doc, score in scores.items() if doc in weights}
+        if visible is not None:
+            scores = {doc: score for doc, score in scores.items() if visible(doc)}
+        # Ties go to the lower ID, so results are stable.
+        best = nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0].id, -item[0].position))
+        return [(score, doc) for doc, score in best]
@@ -0,0 +1,330 @@
+import json
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .event_request import EventApplication, EventApplicationStatus, EventSystem, HistoryEntry
+from .financial_request import BudgetNegotiation, BudgetNegotiationStatus, BudgetRequest, BudgetRequestStatus
+from .models import Employee, Role
+from .staff_recruitment import HRRequest, HRRequestStatus
+from .storage import Record, Storage
+from .task_distribution import Comment, Department, InternalBudgetRequest, Manager, Task, TaskStatus, Worker
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS wal (seq INTEGER PRIMARY KEY, record TEXT NOT NULL);
+
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY, name TEXT NOT NULL, role TEXT NOT NULL,
+    department TEXT, duty TEXT
+);
+
+CREATE TABLE IF NOT EXISTS applications (
+    app_id INTEGER PRIMARY KEY, client_name TEXT NOT NULL, event_type TEXT NOT NULL,
+    start_date TEXT NOT NULL, end_date TEXT NOT NULL, budget REAL NOT NULL,
+    preferences TEXT NOT NULL, created_by TEXT NOT NULL, status TEXT NOT NULL, comment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS application_history (
+    app_id INTEGER NOT NULL, timestamp TEXT NOT NULL, role TEXT NOT NULL, action TEXT NOT NULL, comment TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY, manager_email TEXT NOT NULL, event_id INTEGER NOT NULL,
+    title TEXT NOT NULL, description TEXT NOT NULL, department TEXT NOT NULL,
+    status TEXT NOT NULL, created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_event ON tasks (event_id);
+CREATE TABLE IF NOT EXISTS task_workers (task_id INTEGER NOT NULL, worker_email TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_task_workers_task ON task_workers (task_id);
+CREATE TABLE IF NOT EXISTS comments (
+    task_id INTEGER NOT NULL, worker TEXT NOT NULL, comment TEXT NOT NULL, timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_comments_task ON comments (task_id);
+CREATE TABLE IF NOT EXISTS task_budget_requests (
+    task_id INTEGER NOT NULL, worker TEXT NOT NULL, amount REAL NOT NULL, reason TEXT NOT NULL, timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_budget_task ON task_budget_requests (task_id);
+
+CREATE TABLE IF NOT EXISTS hr_requests (request_id INTEGER PRIMARY KEY, type TEXT NOT NULL, status TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS hr_hired_staff (request_id INTEGER NOT NULL, worker_email TEXT NOT NULL);
+
+CREATE TABLE IF NOT EXISTS budget_requests (
+    request_id INTEGER PRIMARY KEY, event_id INTEGER NOT NULL, amount REAL NOT NULL,
+    reason TEXT NOT NULL, status TEXT NOT NULL, requested_amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_budget_requests_event ON budget_requests (event_id);
+CREATE TABLE IF NOT EXISTS negotiations (
+    negotiation_id INTEGER PRIMARY KEY, request_id INTEGER NOT NULL, status TEXT NOT NULL
+);
+"""
+
+# Tables rewritten from scratch by every snapshot.
+SNAPSHOT_TABLES = (
+    "users", "applications", "application_history", "tasks", "task_workers", "comments",
+    "task_budget_requests", "hr_requests", "hr_hired_staff", "budget_requests", "negotiations",
+)
+
+# Statements are module constants so each pooled connection's statement cache
+# compiles them once and reuses the prepared statement afterwards.
+INSERT_WAL = "INSERT INTO wal (seq, record) VALUES (?, ?)"
+INSERT_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+INSERT_USER = "INSERT INTO users VALUES (?, ?, ?, ?, ?)"
+INSERT_APPLICATION = "INSERT INTO applications VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_HISTORY = "INSERT INTO application_history VALUES (?, ?, ?, ?, ?)"
+INSERT_TASK = "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_TASK_WORKER = "INSERT INTO task_workers VALUES (?, ?)"
+INSERT_COMMENT = "INSERT INTO comments VALUES (?, ?, ?, ?)"
+INSERT_TASK_BUDGET = "INSERT INTO task_budget_requests VALUES (?, ?, ?, ?, ?)"
+INSERT_HR_REQUEST = "INSERT INTO hr_requests VALUES (?, ?, ?)"
+INSERT_HIRED = "INSERT INTO hr_hired_staff VALUES (?, ?)"
+INSERT_BUDGET_REQUEST = "INSERT INTO budget_requests VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_NEGOTIATION = "INSERT INTO negotiations VALUES (?, ?, ?)"
+
+SELECT_BUDGET_REQUESTS = "SELECT * FROM budget_requests ORDER BY request_id"
+
+
+class ConnectionPool:
+    def __init__(self, path: str, size: int = 4) -> None:
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class SQLiteStorage(Storage):
+    """Relational store for the SEP state.
+
+    Like `FileStorage`, this is a snapshot plus a log, and the state is only
+    read back as a whole by `load`. Each snapshot rewrites every table with
+    `executemany` in a single transaction, so its cost grows with the state
+    and is spread over `snapshot_every` records; log records are buffered
+    and inserted in batches."""
+
+    def __init__(self, path: str, pool_size: int = 4, group_size: int = 32, max_delay: float = 0.05,
+                 snapshot_every: int = 1000) -> None:
+        super().__init__(snapshot_every)
+        self.pool: ConnectionPool = ConnectionPool(path, pool_size)
+        self.group_size: int = group_size
+        self.max_delay: float = max_delay
+        self._seq: int = 0
+        self._buffer: List[Tuple[int, str]] = []
+        self._last_sync: float = time.monotonic()
+        self._has_snapshot: bool = False
+        with self.pool.connection() as conn, conn:
+            conn.executescript(SCHEMA)
+
+    # -- Storage interface ------------------------------------------------
+    def load(self) -> Tuple[Optional[Any], List[Record]]:
+        with self.pool.connection() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            snapshot_seq = int(meta.get("wal_seq", 0))
+            records = [json.loads(r) for (r,) in conn.execute(
+                "SELECT record FROM wal WHERE seq > ? ORDER BY seq", (snapshot_seq,))]
+            state = self._read_state(conn, meta) if "next_ids" in meta else None
+        self._has_snapshot = state is not None
+
+        self._seq = records[-1]["seq"] if records else snapshot_seq
+        self.records_since_snapshot = len(records)
+        return state, records
+
+    def read_snapshot(self) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            return self._read_state(conn, meta) if "next_ids" in meta else None
+
+    def append(self, record: Record) -> None:
+        with self._lock:
+            self._seq += 1
+            self._buffer.append((self._seq, json.dumps({"seq": self._seq, **record}, default=str)))
+            self.records_since_snapshot += 1
+            due = len(self._buffer) >= self.group_size or time.monotonic() - self._last_sync >= self.max_delay
+        if due and self.auto_commit:
+            self.commit()
+
+    def commit(self) -> None:
+        with self._sync_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if rows:
+                with self.pool.connection() as conn, conn:
+                    conn.executemany(INSERT_WAL, rows)
+            self._last_sync = time.monotonic()
+
+    def write_snapshot(self, state: Dict[str, Any]) -> None:
+        with self._sync_lock:
+            self.commit()
+            # As in FileStorage, a snapshot with no records since is still current.
+            if self.records_since_snapshot == 0 and self._has_snapshot:
+                return
+            with self.pool.connection() as conn, conn:
+                for table in reversed(SNAPSHOT_TABLES):
+                    conn.execute(f"DELETE FROM {table}")
+                self._write_state(conn, state)
+                conn.executemany(INSERT_META, [
+                    ("wal_seq", str(self._seq)),
+                    ("next_ids", json.dumps(state["next_ids"])),
+                ])
+                conn.execute("DELETE FROM wal WHERE seq <= ?", (self._seq,))
+            self.records_since_snapshot = 0
+            self._has_snapshot = True
+
+    def close(self) -> None:
+        with self._sync_lock:
+            self.commit()
+            self.pool.close()
+
+    # -- Object graph <-> rows --------------------------------------------
+    def _write_state(self, conn: sqlite3.Connection, state: Dict[str, Any]) -> None:
+        users: Dict[str, Employee] = state["users"]
+        system: EventSystem = state["system"]
+        emails = {id(user): email for email, user in users.items()}
+
+        conn.executemany(INSERT_USER, [
+            (email, u.name, u.role.name, getattr(u, "department", None) and u.department.name, getattr(u, "duty", None))
+            for email, u in users.items()
+        ])
+        conn.executemany(INSERT_APPLICATION, [
+            (a.app_id, a.client_name, a.event_type, a.start_date.isoformat(), a.end_date.isoformat(),
+             a.budget, a.preferences, a.created_by.name, a.status.name, a.comment)
+            for a in system.applications
+        ])
+        conn.executemany(INSERT_HISTORY, [
+            (a.app_id, ts.isoformat(), role.name, action, comment)
+            for a in system.applications for ts, role, action, comment in a.history
+        ])
+
+        # Rows are keyed by task ID. Tasks never registered (no ID) get negative
+        # keys that still sort in their original order.
+        owned = [(email, t) for email, u in users.items() if isinstance(u, Manager) for t in u.tasks]
+        tasks = [(t.task_id if t.task_id is not None else i - len(owned), email, t)
+                 for i, (email, t) in enumerate(owned)]
+        conn.executemany(INSERT_TASK, [
+            (key, email, t.event_id, t.title, t.description, t.department.name, t.status.name, t.created_at.isoformat())
+            for key, email, t in tasks
+        ])
+        conn.executemany(INSERT_TASK_WORKER, [
+            (key, emails[id(w)]) for key, _, t in tasks for w in t.assigned_workers
+        ])
+        conn.executemany(INSERT_COMMENT, [
+            (key, c.worker, c.comment, c.timestamp.isoformat())
+            for key, _, t in tasks for c in t.comments
+        ])
+        conn.executemany(INSERT_TASK_BUDGET, [
+            (key, b.worker, b.amount, b.reason, b.timestamp.isoformat())
+            for key, _, t in tasks for b in t.budget_requests
+        ])
+
+        hr_requests: Dict[int, HRRequest] = state["hr_requests"]
+        conn.executemany(INSERT_HR_REQUEST, [(r.request_id, r.type, r.status.name) for r in hr_requests.values()])
+        conn.executemany(INSERT_HIRED, [
+            (r.request_id, emails[id(w)]) for r in hr_requests.values() for w in r.hired_staff
+        ])
+
+        budget_requests: Dict[int, BudgetRequest] = state["budget_requests"]
+        conn.executemany(INSERT_BUDGET_REQUEST, [
+            (r.request_id, r.event_id, r.amount, r.reason, r.status.name, r.requested_amount)
+            for r in budget_requests.values()
+        ])
+        negotiations: Dict[int, BudgetNegotiation] = state["budget_negotiations"]
+        conn.executemany(INSERT_NEGOTIATION, [
+            (n.negotiation_id, n.request.request_id, n.status.name) for n in negotiations.values()
+        ])
+
+    def _read_state(self, conn: sqlite3.Connection, meta: Dict[str, str]) -> Dict[str, Any]:
+        users: Dict[str, Employee] = {}
+        for email, name, role, department, duty in conn.execute("SELECT * FROM users ORDER BY rowid"):
+            match Role[role]:
+                case Role.MANAGER:
+                    users[email] = Manager(name, Department[department])
+                case Role.WORKER:
+                    users[email] = Worker(name, Department[department], duty)
+                case other:
+                    users[email] = Employee(name, other)
+
+        system = EventSystem()
+        history: Dict[int, List[HistoryEntry]] = {}
+        for app_id, *row in conn.execute("SELECT * FROM application_history ORDER BY rowid"):
+            history.setdefault(app_id, []).append(_history_from_row(row))
+        for row in conn.execute("SELECT * FROM applications ORDER BY app_id"):
+            app = _application_from_row(row)
+            app.history = history.get(app.app_id, [])
+            system.add_application(app)
+
+        tasks: Dict[int, Task] = {}
+        for task_id, email, event_id, title, description, department, status, created_at in conn.execute(
+                "SELECT * FROM tasks ORDER BY task_id"):
+            task = Task(event_id, title, description, Department[department])
+            task.task_id = task_id if task_id >= 0 else None
+            task.status = TaskStatus[status]
+            task.created_at = datetime.fromisoformat(created_at)
+            users[email].tasks.append(task)
+            tasks[task_id] = task
+        for task_id, email in conn.execute("SELECT * FROM task_workers ORDER BY rowid"):
+            worker = users[email]
+            tasks[task_id].assigned_workers.append(worker)
+            worker.tasks.append(tasks[task_id])
+        for task_id, worker, comment, ts in conn.execute("SELECT * FROM comments ORDER BY rowid"):
+            tasks[task_id].comments.append(Comment(worker, comment, datetime.fromisoformat(ts)))
+        for task_id, worker, amount, reason, ts in conn.execute("SELECT * FROM task_budget_requests ORDER BY rowid"):
+            tasks[task_id].budget_requests.append(InternalBudgetRequest(worker, amount, reason, datetime.fromisoformat(ts)))
+
+        hr_requests: Dict[int, HRRequest] = {}
+        for request_id, req_type, status in conn.execute("SELECT * FROM hr_requests ORDER BY request_id"):
+            req = HRRequest(request_id, req_type)
+            req.status = HRRequestStatus[status]
+            hr_requests[request_id] = req
+        for request_id, email in conn.execute("SELECT * FROM hr_hired_staff ORDER BY rowid"):
+            hr_requests[request_id].hired_staff.append(users[email])
+
+        budget_requests = {r.request_id: r for r in map(_budget_request_from_row, conn.execute(SELECT_BUDGET_REQUESTS))}
+        negotiations: Dict[int, BudgetNegotiation] = {}
+        for negotiation_id, request_id, status in conn.execute("SELECT * FROM negotiations ORDER BY negotiation_id"):
+            negotiation = BudgetNegotiation(negotiation_id, budget_requests[request_id])
+            negotiation.status = BudgetNegotiationStatus[status]
+            negotiations[negotiation_id] = negotiation
+
+        return {
+            "users": users,
+            "system": system,
+            "hr_requests": hr_requests,
+            "budget_requests": budget_requests,
+            "budget_negotiations": negotiations,
+            "next_ids": tuple(json.loads(meta["next_ids"])),
+        }
+
+
+def _application_from_row(row: Tuple[Any, ...]) -> EventApplication:
+    app_id, client_name, event_type, start, end, budget, preferences, created_by, status, comment = row
+    app = EventApplication(app_id, client_name, event_type, datetime.fromisoformat(start),
+                           datetime.fromisoformat(end), budget, preferences, Role[created_by])
+    app.status = EventApplicationStatus[status]
+    app.comment = comment
+    return app
+
+def _history_from_row(row: Tuple[Any, ...]) -> HistoryEntry:
+    ts, role, action, comment = row
+    return HistoryEntry(datetime.fromisoformat(ts), Role[role], action, comment)
+
+def _budget_request_from_row(row: Tuple[Any, ...]) -> BudgetRequest:
+    request_id, event_id, amount, reason, status, requested_amount = row
+    req = BudgetRequest(request_id, event_id, amount, reason)
+    req.status = BudgetRequestStatus[status]
+    req.requested_amount = requested_amount
+    return req
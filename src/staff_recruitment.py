@@ -1,7 +1,11 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import List
 
-from .task_distribution import Worker
+from .journal import DomainEvent, record
+from .observers import Observable
+from .task_distribution import Department, Worker
+from .workflow import Transition, Workflow
 
 class HRRequestStatus(Enum):
     PENDING = "Pending"
@@ -9,25 +13,58 @@ class HRRequestStatus(Enum):
     REJECTED = "Rejected"
     HIRED = "Hired"
 
-class HRRequest:
+@dataclass(frozen=True, slots=True)
+class HRRequestOpened(DomainEvent):
+    request_id: int
+    type: str
+
+@dataclass(frozen=True, slots=True)
+class HRRequestDecided(DomainEvent):
+    request_id: int
+    status: HRRequestStatus
+
+@dataclass(frozen=True, slots=True)
+class StaffHired(DomainEvent):
+    request_id: int
+    name: str
+    department: Department
+    duty: str
+
+HR_WORKFLOW: "Workflow[HRRequest]" = Workflow(HRRequestStatus, [
+    Transition("approve", frozenset({HRRequestStatus.PENDING}), HRRequestStatus.APPROVED,
+               "Only Pending requests can be approved"),
+    Transition("reject", frozenset({HRRequestStatus.PENDING}), HRRequestStatus.REJECTED,
+               "Only Pending requests can be rejected"),
+    Transition("hire", frozenset({HRRequestStatus.APPROVED}), HRRequestStatus.HIRED,
+               "Request must be approved before staff hiring"),
+])
+
+class HRRequest(Observable):
+    __slots__ = ("request_id", "type", "status", "hired_staff")
+
     def __init__(self, request_id: int, req_type: str):
+        super().__init__()
         self.request_id = request_id
         self.type = req_type
         self.status = HRRequestStatus.PENDING
         self.hired_staff: List[Worker] = []
 
     def approve(self):
-        if self.status != HRRequestStatus.PENDING:
-            raise ValueError("Only Pending requests can be approved")
-        self.status = HRRequestStatus.APPROVED
+        with self._lock:
+            self.status = HR_WORKFLOW.check(self, "approve")
+            record(HRRequestDecided(self.request_id, self.status))
+            self._notify()
 
     def reject(self):
-        if self.status != HRRequestStatus.PENDING:
-            raise ValueError("Only Pending requests can be rejected")
-        self.status = HRRequestStatus.REJECTED
+        with self._lock:
+            self.status = HR_WORKFLOW.check(self, "reject")
+            record(HRRequestDecided(self.request_id, self.status))
+            self._notify()
 
     def hire_staff(self, staff: Worker):
-        if self.status != HRRequestStatus.APPROVED:
-            raise ValueError("Request must be approved before staff hiring")
-        self.hired_staff.append(staff)
-        self.status = HRRequestStatus.HIRED
\ No newline at end of file
+        with self._lock:
+            status = HR_WORKFLOW.check(self, "hire")
+            self.hired_staff.append(staff)
+            self.status = status
+            record(StaffHired(self.request_id, staff.name, staff.department, staff.duty))
+            self._notify()
@@ -0,0 +1,178 @@
+import json
+import os
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+Record = Dict[str, Any]
+
+class Storage(ABC):
+    """A compacted snapshot of the whole state plus an append-only log of the
+    records written since. `load` returns both so only the tail is replayed.
+
+    Records are appended from one thread, but `commit` may run on another so
+    the caller need not wait for the disk: `_lock` guards the buffered records
+    and `_sync_lock` keeps the writes that drain them in order. With
+    `auto_commit` off, `append` only buffers and the caller commits, and
+    takes the snapshots that fall due."""
+
+    def __init__(self, snapshot_every: int = 1000) -> None:
+        self.snapshot_every: int = snapshot_every
+        self.records_since_snapshot: int = 0
+        self.auto_commit: bool = True
+        self._lock = threading.Lock()
+        self._sync_lock = threading.RLock()
+
+    @abstractmethod
+    def load(self) -> Tuple[Optional[Any], List[Record]]:
+        ...
+
+    @abstractmethod
+    def append(self, record: Record) -> None:
+        ...
+
+    @abstractmethod
+    def write_snapshot(self, state: Any) -> None:
+        ...
+
+    def read_snapshot(self) -> Optional[Any]:
+        """The state in the last snapshot, decoded afresh; None if there is none."""
+        return None
+
+    def commit(self) -> None:
+        pass
+
+    def mark_changed(self) -> None:
+        """Note a change made without a log record (e.g. a bulk import), so the next snapshot is written."""
+        with self._lock:
+            self.records_since_snapshot += 1
+
+    def close(self) -> None:
+        self.commit()
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self.records_since_snapshot >= self.snapshot_every
+
+
+class MemoryStorage(Storage):
+    """Default backend: nothing survives the session."""
+
+    def load(self) -> Tuple[Optional[Any], List[Record]]:
+        return None, []
+
+    def append(self, record: Record) -> None:
+        pass
+
+    def write_snapshot(self, state: Any) -> None:
+        pass
+
+
+class FileStorage(Storage):
+    """Pickled snapshot plus a JSON-lines write-ahead log in `directory`.
+
+    Appends are fsync'ed in groups (group commit). Records carry a sequence
+    number and the snapshot stores the last one it covers, so records already
+    in the snapshot are skipped if we crash before the log is truncated."""
+
+    SNAPSHOT_FILE = "snapshot.pickle"
+    WAL_FILE = "wal.log"
+
+    def __init__(self, directory: str, group_size: int = 32, max_delay: float = 0.05,
+                 snapshot_every: int = 1000) -> None:
+        super().__init__(snapshot_every)
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path: str = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.wal_path: str = os.path.join(directory, self.WAL_FILE)
+        self.group_size: int = group_size
+        self.max_delay: float = max_delay
+
+        self._seq: int = 0
+        self._buffer: List[bytes] = []
+        self._last_sync: float = time.monotonic()
+        self._wal = open(self.wal_path, "ab")
+
+    def load(self) -> Tuple[Optional[Any], List[Record]]:
+        state, snapshot_seq = None, 0
+        if os.path.exists(self.snapshot_path):
+            snapshot_seq, state = self._load_snapshot()
+
+        records: List[Record] = []
+        valid_bytes = 0
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                if record["seq"] > snapshot_seq:
+                    records.append(record)
+        # Drop a torn write at the tail so new appends follow the last good record.
+        if valid_bytes < os.path.getsize(self.wal_path):
+            os.truncate(self.wal_path, valid_bytes)
+
+        self._seq = records[-1]["seq"] if records else snapshot_seq
+        self.records_since_snapshot = len(records)
+        return state, records
+
+    def read_snapshot(self) -> Optional[Any]:
+        if not os.path.exists(self.snapshot_path):
+            return None
+        return self._load_snapshot()[1]
+
+    def append(self, record: Record) -> None:
+        with self._lock:
+            self._seq += 1
+            line = json.dumps({"seq": self._seq, **record}, default=str)
+            self._buffer.append(line.encode() + b"\n")
+            self.records_since_snapshot += 1
+            due = len(self._buffer) >= self.group_size or time.monotonic() - self._last_sync >= self.max_delay
+
+        if due and self.auto_commit:
+            self.commit()
+
+    def commit(self) -> None:
+        with self._sync_lock:
+            with self._lock:
+                lines, self._buffer = self._buffer, []
+            if lines:
+                self._wal.write(b"".join(lines))
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+            self._last_sync = time.monotonic()
+
+    def write_snapshot(self, state: Any) -> None:
+        with self._sync_lock:
+            self.commit()
+            # State only changes through logged records (or `mark_changed`), so
+            # with none since the last snapshot it is still current.
+            if self.records_since_snapshot == 0 and os.path.exists(self.snapshot_path):
+                return
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                self._dump_snapshot(f, state)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            self._wal.close()
+            self._wal = open(self.wal_path, "wb")
+            self.records_since_snapshot = 0
+
+    def close(self) -> None:
+        with self._sync_lock:
+            self.commit()
+            self._wal.close()
+
+    # Snapshot encoding; subclasses may store the state in another format.
+    def _load_snapshot(self) -> Tuple[int, Any]:
+        with open(self.snapshot_path, "rb") as f:
+            return pickle.load(f)
+
+    def _dump_snapshot(self, f: BinaryIO, state: Any) -> None:
+        pickle.dump((self._seq, state), f, protocol=pickle.HIGHEST_PROTOCOL)
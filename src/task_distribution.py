@@ -1,8 +1,17 @@
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
-from typing import List, TypedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
+from . import clock
+from .concurrency import IdAllocator, Lockable
+from .journal import DomainEvent, record
 from .models import Employee, Role
+from .observers import Observable
+from .workflow import Transition, Workflow
+
+if TYPE_CHECKING:
+    from .scheduling import Schedule
 
 class Department(Enum):
     PRODUCTION = "Production"
@@ -13,19 +22,71 @@ class TaskStatus(Enum):
     IN_PROGRESS = "In Progress"
     CLOSED = "Closed"
 
-class Comment(TypedDict):
+class _Record:
+    # Compact records keep the mapping-style access (`c["worker"]`) of the
+    # dicts they replaced.
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+@dataclass(slots=True)
+class Comment(_Record):
+    worker: str
+    comment: str
+    timestamp: datetime = field(default_factory=clock.now)
+
+@dataclass(slots=True)
+class InternalBudgetRequest(_Record):
+    worker: str
+    amount: float
+    reason: str
+    timestamp: datetime = field(default_factory=clock.now)
+
+@dataclass(frozen=True, slots=True)
+class TaskCreated(DomainEvent):
+    task_id: Optional[int]
+    event_id: int
+    title: str
+    description: str
+    department: Department
+
+@dataclass(frozen=True, slots=True)
+class TaskStatusChanged(DomainEvent):
+    task_id: Optional[int]
+    status: TaskStatus
+
+@dataclass(frozen=True, slots=True)
+class TaskAssigned(DomainEvent):
+    task_id: Optional[int]
+    worker: str
+    department: Department
+    duty: str
+
+@dataclass(frozen=True, slots=True)
+class TaskCommented(DomainEvent):
+    task_id: Optional[int]
     worker: str
     comment: str
-    timestamp: datetime
+    at: datetime
 
-class InternalBudgetRequest(TypedDict):
+@dataclass(frozen=True, slots=True)
+class TaskBudgetAsked(DomainEvent):
+    task_id: Optional[int]
     worker: str
     amount: float
     reason: str
-    timestamp: datetime
+    at: datetime
+
+class Task(Observable):
+    __slots__ = ("task_id", "event_id", "title", "description", "department", "assigned_workers",
+                 "status", "comments", "budget_requests", "created_at")
 
-class Task():
     def __init__(self, event_id: int, title: str, description: str, department: Department) -> None:
+        super().__init__()
+        self.task_id: Optional[int] = None
         self.event_id: int = event_id
         self.title: str = title
         self.description: str = description
@@ -34,27 +95,33 @@ class Task():
         self.status: TaskStatus = TaskStatus.OPEN
         self.comments: List[Comment] = []
         self.budget_requests: List[InternalBudgetRequest] = []
-        self.created_at: datetime = datetime.now()
+        self.created_at: datetime = clock.now()
 
     def add_comment(self, worker_name: str, comment: str) -> None:
-        self.comments.append({
-            "worker": worker_name, 
-            "comment": comment, 
-            "timestamp": datetime.now()
-        })
+        with self._lock:
+            entry = Comment(worker_name, comment)
+            self.comments.append(entry)
+            record(TaskCommented(self.task_id, worker_name, comment, entry.timestamp))
+            self._notify()
 
     def add_budget_request(self, worker_name: str, amount: float, reason: str) -> None:
-        self.budget_requests.append({
-            "worker": worker_name,
-            "amount": amount,
-            "reason": reason,
-            "timestamp": datetime.now()
-        })
+        with self._lock:
+            ask = InternalBudgetRequest(worker_name, amount, reason)
+            self.budget_requests.append(ask)
+            record(TaskBudgetAsked(self.task_id, worker_name, amount, reason, ask.timestamp))
+            self._notify()
 
     def __repr__(self) -> str:
         return f"<Task [EID: {self.event_id}] '{self.title}' ({self.status.value})>"
 
+TASK_WORKFLOW: "Workflow[Task]" = Workflow(TaskStatus, [
+    Transition(status, frozenset(TaskStatus) - {status}, status, "Cannot update task to same status.")
+    for status in TaskStatus
+], unknown="Invalid task status: {action}")
+
 class Worker(Employee):
+    __slots__ = ("department", "duty", "tasks")
+
     def __init__(self, name: str, department: Department, duty: str) -> None:
         super().__init__(name, Role.WORKER)
         self.department: Department = department
@@ -77,25 +144,52 @@ class Worker(Employee):
         task.add_budget_request(self.name, amount, reason)
 
 class Manager(Employee):
-    def __init__(self, name: str, department: Department) -> None:
+    __slots__ = ("department", "tasks", "registry")
+
+    def __init__(self, name: str, department: Department, registry: Optional["TaskRegistry"] = None) -> None:
         super().__init__(name, Role.MANAGER)
         self.department: Department = department
         self.tasks: List[Task] = []
+        self.registry: Optional[TaskRegistry] = registry
     
     def create_task(self, event_id: int, title: str, description: str) -> Task:
         task = Task(event_id, title, description, self.department)
-        self.tasks.append(task)
+        with self._lock:
+            self.tasks.append(task)
+        if self.registry is not None:
+            self.registry.register(self, task)
+        record(TaskCreated(task.task_id, event_id, title, description, self.department))
         return task
     
+    def create_tasks(self, rows: Sequence[Tuple[int, str, str]]) -> List[Task]:
+        """Create one task per (event_id, title, description) row, registered in one batch."""
+        tasks = [Task(event_id, title, description, self.department) for event_id, title, description in rows]
+        with self._lock:
+            self.tasks.extend(tasks)
+        if self.registry is not None:
+            self.registry.register_many(self, tasks)
+        for task in tasks:
+            record(TaskCreated(task.task_id, task.event_id, task.title, task.description, self.department))
+        return tasks
+
     def assign_task(self, task: Task, workers: List[Worker]) -> None:
         if task.department != self.department:
             raise PermissionError("Cannot assign tasks outside your department.")
         
-        for worker in workers:
-            if worker.department != self.department:
-                raise ValueError(f"{worker.name} is not in {self.department} department.")
-            task.assigned_workers.append(worker)
-            worker.tasks.append(task)
+        # Lock ordering: task before worker.
+        with task._lock:
+            if self.registry is not None and self.registry.schedule is not None:
+                self.registry.schedule.check(task, workers)
+            for worker in workers:
+                if worker.department != self.department:
+                    raise ValueError(f"{worker.name} is not in {self.department} department.")
+                task.assigned_workers.append(worker)
+                with worker._lock:
+                    worker.tasks.append(task)
+                if self.registry is not None:
+                    self.registry.assigned(task, worker)
+                record(TaskAssigned(task.task_id, worker.name, worker.department, worker.duty))
+            task._notify()
     
     def view_tasks(self) -> List[Task]:
         return self.tasks
@@ -104,10 +198,13 @@ class Manager(Employee):
         if task.department != self.department:
             raise PermissionError("Cannot review tasks outside your department.")
 
-        if new_status is task.status:
-            raise ValueError("Cannot update task to same status.")
-
-        task.status = new_status
+        with task._lock:
+            old_status = task.status
+            task.status = TASK_WORKFLOW.check(task, new_status)
+            if self.registry is not None:
+                self.registry.status_changed(task, old_status)
+            record(TaskStatusChanged(task.task_id, new_status))
+            task._notify()
 
     def review_feedback(self, task: Task) -> List[Comment]:
         if task.department != self.department:
@@ -121,3 +218,92 @@ class Manager(Employee):
         
         return task.budget_requests
 
+
+class TaskRegistry(Lockable):
+    """Unique task IDs plus lookup indexes, kept in sync by the managers using it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._ids: IdAllocator = IdAllocator()
+        self._by_id: Dict[int, Task] = {}
+        # Keyed by the manager / worker object; the first task with a title wins,
+        # matching the old linear search.
+        self._by_manager_title: Dict[Tuple[Manager, str], Task] = {}
+        self._by_worker_title: Dict[Tuple[Worker, str], Task] = {}
+        self._by_event: Dict[int, Dict[int, Task]] = {}
+        self._by_department: Dict[Department, Dict[int, Task]] = {d: {} for d in Department}
+        self._by_status: Dict[TaskStatus, Dict[int, Task]] = {s: {} for s in TaskStatus}
+        self._managers: Dict[int, Manager] = {}
+        # Checks assignments for double bookings; not pickled, whoever
+        # restores the registry attaches one again.
+        self.schedule: Optional["Schedule"] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state["schedule"] = None
+        return state
+
+    def register(self, manager: Manager, task: Task) -> Task:
+        with self._lock:
+            if task.task_id is None:
+                task.task_id = self._ids.allocate()
+            else:
+                self._ids.advance_past(task.task_id)
+            self._by_id[task.task_id] = task
+            self._managers[task.task_id] = manager
+            self._by_manager_title.setdefault((manager, task.title), task)
+            self._by_event.setdefault(task.event_id, {})[task.task_id] = task
+            self._by_department[task.department][task.task_id] = task
+            self._by_status[task.status][task.task_id] = task
+        return task
+
+    def register_many(self, manager: Manager, tasks: Sequence[Task]) -> None:
+        """Register new tasks under one range of IDs reserved for the batch."""
+        with self._lock:
+            for task_id, task in zip(self._ids.reserve(len(tasks)), tasks):
+                task.task_id = task_id
+                self.register(manager, task)
+
+    def adopt(self, manager: Manager) -> None:
+        """Attach an existing manager (e.g. restored from storage) and index its tasks."""
+        manager.registry = self
+        for task in manager.tasks:
+            self.register(manager, task)
+            for worker in task.assigned_workers:
+                self.assigned(task, worker)
+
+    def assigned(self, task: Task, worker: Worker) -> None:
+        with self._lock:
+            self._by_worker_title.setdefault((worker, task.title), task)
+
+    def status_changed(self, task: Task, old_status: TaskStatus) -> None:
+        with self._lock:
+            self._by_status[old_status].pop(task.task_id, None)
+            self._by_status[task.status][task.task_id] = task
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._by_id.get(task_id)
+
+    def manager_of(self, task: Task) -> Optional[Manager]:
+        return self._managers.get(task.task_id)
+
+    def find(self, manager: Manager, title: str) -> Optional[Task]:
+        return self._by_manager_title.get((manager, title))
+
+    def find_assigned(self, worker: Worker, title: str) -> Optional[Task]:
+        return self._by_worker_title.get((worker, title))
+
+    def for_event(self, event_id: int) -> List[Task]:
+        with self._lock:
+            return list(self._by_event.get(event_id, {}).values())
+
+    def for_department(self, department: Department, status: Optional[TaskStatus] = None) -> List[Task]:
+        with self._lock:
+            tasks = self._by_department[department]
+            if status is None:
+                return list(tasks.values())
+            by_status = self._by_status[status]
+            smaller, larger = (tasks, by_status) if len(tasks) <= len(by_status) else (by_status, tasks)
+            result = [t for task_id, t in smaller.items() if task_id in larger]
+        result.sort(key=lambda t: t.task_id)
+        return result
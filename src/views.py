@@ -0,0 +1,93 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .concurrency import Lockable
+from .observers import Observable
+
+S = TypeVar("S", bound=Observable)
+
+# Group key for views that also list every source.
+ALL = "all"
+
+class MaterializedView(Lockable, Generic[S]):
+    """Rendered rows grouped by key, kept current by listening to their sources.
+
+    `keys(source)` names the groups a source belongs to and `render(source)`
+    formats its row; both run only when that source changes, so reading a
+    group costs a copy of its rows. Rows are ordered by `id_of(source)`,
+    which also serves as the cursor for reading a group page by page."""
+
+    # Rows copied per lock acquisition while streaming a group.
+    chunk_size = 256
+
+    def __init__(self, id_of: Callable[[S], int], keys: Callable[[S], Iterable[Hashable]],
+                 render: Callable[[S], str]) -> None:
+        super().__init__()
+        self._id_of = id_of
+        self._keys = keys
+        self._render = render
+        self._groups: Dict[Hashable, Dict[int, str]] = {}
+        # Sorted row IDs per group, for cursor lookups.
+        self._order: Dict[Hashable, List[int]] = {}
+        self._placed: Dict[int, Tuple[Hashable, ...]] = {}
+
+    def track(self, source: S) -> None:
+        self.refresh(source)
+        source.add_listener(self.refresh)
+
+    def rebuild(self, sources: Iterable[S]) -> None:
+        for source in sources:
+            self.track(source)
+
+    def refresh(self, source: S) -> None:
+        row_id = self._id_of(source)
+        keys = tuple(self._keys(source))
+        row = self._render(source)
+        with self._lock:
+            for key in self._placed.get(row_id, ()):
+                if key not in keys:
+                    self._remove(key, row_id)
+            for key in keys:
+                group = self._groups.setdefault(key, {})
+                if row_id not in group:
+                    order = self._order.setdefault(key, [])
+                    if not order or order[-1] < row_id:
+                        order.append(row_id)
+                    else:
+                        insort(order, row_id)
+                group[row_id] = row
+            self._placed[row_id] = keys
+
+    def _remove(self, key: Hashable, row_id: int) -> None:
+        group = self._groups[key]
+        del group[row_id]
+        order = self._order[key]
+        del order[bisect_left(order, row_id)]
+        if not group:
+            del self._groups[key]
+            del self._order[key]
+
+    def iter_rows(self, key: Hashable, after: int = 0, limit: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """(id, row) for rows of `key` with IDs above `after`, streamed a chunk at a time."""
+        if limit is not None and limit < 0:
+            raise ValueError("Limit must not be negative.")
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+            with self._lock:
+                order = self._order.get(key, ())
+                start = bisect_right(order, after)
+                group = self._groups.get(key, {})
+                chunk = [(row_id, group[row_id]) for row_id in order[start:start + size]]
+            if not chunk:
+                return
+            yield from chunk
+            after = chunk[-1][0]
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    def rows(self, key: Hashable, after: int = 0, limit: Optional[int] = None) -> List[str]:
+        return [row for _, row in self.iter_rows(key, after, limit)]
+
+    def count(self, key: Hashable) -> int:
+        return len(self._groups.get(key, ()))
@@ -0,0 +1,189 @@
+import heapq
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .concurrency import Lockable
+from .event_request import EventApplication, EventApplicationStatus
+from .financial_request import BudgetRequest, BudgetRequestDecided, BudgetRequestOpened, BudgetRequestStatus
+from .journal import DomainEvent
+from .models import Role
+from .staff_recruitment import HRRequest, HRRequestDecided, HRRequestOpened, HRRequestStatus, StaffHired
+
+APPLICATION = "application"
+HR_REQUEST = "hr request"
+BUDGET_REQUEST = "budget request"
+
+class WorkItem(NamedTuple):
+    kind: str  # APPLICATION, HR_REQUEST or BUDGET_REQUEST
+    id: int
+
+def application_reviewer(app: EventApplication) -> Optional[Role]:
+    """Who the application waits for: SCS, then FM once forwarded, then AM."""
+    if app.status is EventApplicationStatus.PENDING_REVIEW:
+        return Role.CS_MANAGER
+    if not app.has_acted(Role.FIN_MANAGER):
+        return Role.FIN_MANAGER if app.status is EventApplicationStatus.FORWARDED else None
+    if app.status is EventApplicationStatus.REJECTED or app.has_acted(Role.ADM_MANAGER):
+        return None
+    return Role.ADM_MANAGER
+
+_HR_HANDLERS = {HRRequestStatus.PENDING: Role.HR_MANAGER, HRRequestStatus.APPROVED: Role.HR_WORKER}
+
+def hr_request_handler(request: HRRequest) -> Optional[Role]:
+    return _HR_HANDLERS.get(request.status)
+
+def budget_request_handler(request: BudgetRequest) -> Optional[Role]:
+    return Role.FIN_MANAGER if request.status is BudgetRequestStatus.PENDING else None
+
+class WorkQueues(Lockable):
+    """What each role has waiting for it, soonest event first.
+
+    Every application and request is re-filed whenever it moves on, under
+    the role its new state waits for (if any): applications through
+    `track_application` (the system's `on_change` hook), HR and budget
+    requests through `apply`, subscribed to their events on an EventBus.
+    Each role has a heap ordered by (due, arrival); entries left behind by a
+    move are skipped when they reach the top, so filing, peeking and popping
+    an item all take O(log n) amortized. Applications are due when their event starts, budget
+    requests when their event does (see `event_dates`) and HR requests last."""
+
+    def __init__(self, event_dates: Callable[[int], Optional[Tuple[datetime, datetime]]]) -> None:
+        super().__init__()
+        self.event_dates = event_dates
+        self._heaps: Dict[Role, List[Tuple[datetime, int, WorkItem]]] = {role: [] for role in Role}
+        # Where each item is currently filed: its role and heap entry number.
+        self._filed: Dict[WorkItem, Tuple[Role, int]] = {}
+        self._counts: Dict[Role, int] = {role: 0 for role in Role}
+        self._seq = 0
+        self._pending: List[Callable[[], None]] = []
+
+    def defer(self, load: Callable[[], None]) -> None:
+        """Run `load` before the queues are next read instead of now (see `SearchIndex.defer`)."""
+        with self._lock:
+            self._pending.append(load)
+
+    def _load_pending(self) -> None:
+        with self._lock:
+            while self._pending:
+                self._pending.pop(0)()
+
+    # -- Filing -------------------------------------------------------------
+    def file(self, item: WorkItem, role: Optional[Role], due: datetime = datetime.max) -> None:
+        """Queue `item` for `role`, or for nobody if None, replacing where it was."""
+        with self._lock:
+            filed = self._filed.pop(item, None)
+            if filed is not None:
+                self._counts[filed[0]] -= 1
+            if role is None:
+                return
+            if filed is not None and filed[0] is role:
+                # Still waiting for the same role: keep its place in line.
+                self._filed[item] = filed
+                self._counts[role] += 1
+                return
+            self._seq += 1
+            heapq.heappush(self._heaps[role], (due, self._seq, item))
+            self._filed[item] = (role, self._seq)
+            self._counts[role] += 1
+
+    def track_application(self, app: EventApplication) -> None:
+        self.file(WorkItem(APPLICATION, app.app_id), application_reviewer(app), app.start_date)
+
+    def file_hr_request(self, request: HRRequest) -> None:
+        self.file(WorkItem(HR_REQUEST, request.request_id), hr_request_handler(request))
+
+    def file_budget_request(self, request: BudgetRequest) -> None:
+        self._file_budget(request.request_id, request.event_id, budget_request_handler(request))
+
+    def _file_budget(self, request_id: int, event_id: int, role: Optional[Role]) -> None:
+        dates = self.event_dates(event_id)
+        self.file(WorkItem(BUDGET_REQUEST, request_id), role, datetime.max if dates is None else dates[0])
+
+    def rebuild(self, applications: Iterable[EventApplication], hr_requests: Iterable[HRRequest],
+                budget_requests: Iterable[BudgetRequest]) -> None:
+        """File everything given as it is now. Filing is idempotent, so items
+        already filed from their events keep their place."""
+        for app in applications:
+            self.track_application(app)
+        for request in hr_requests:
+            self.file_hr_request(request)
+        for budget_request in budget_requests:
+            self.file_budget_request(budget_request)
+
+    def apply(self, event: DomainEvent) -> None:
+        """Re-file the request an event in `EVENT_TYPES` is about."""
+        _EVENT_HANDLERS[type(event)](self, event)
+
+    def _hr_opened(self, e: HRRequestOpened) -> None:
+        self.file(WorkItem(HR_REQUEST, e.request_id), _HR_HANDLERS[HRRequestStatus.PENDING])
+
+    def _hr_decided(self, e: HRRequestDecided) -> None:
+        self.file(WorkItem(HR_REQUEST, e.request_id), _HR_HANDLERS.get(e.status))
+
+    def _staff_hired(self, e: StaffHired) -> None:
+        self.file(WorkItem(HR_REQUEST, e.request_id), None)
+
+    def _budget_opened(self, e: BudgetRequestOpened) -> None:
+        self._file_budget(e.request_id, e.event_id, Role.FIN_MANAGER)
+
+    def _budget_decided(self, e: BudgetRequestDecided) -> None:
+        self.file(WorkItem(BUDGET_REQUEST, e.request_id), None)
+
+    # -- Reading ------------------------------------------------------------
+    def _top(self, role: Role) -> Optional[Tuple[datetime, int, WorkItem]]:
+        heap = self._heaps[role]
+        while heap:
+            entry = heap[0]
+            if self._filed.get(entry[2]) == (role, entry[1]):
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def count(self, role: Role) -> int:
+        self._load_pending()
+        return self._counts[role]
+
+    def pop(self, role: Role, limit: int = 1) -> List[WorkItem]:
+        """Take up to `limit` of `role`'s most urgent items off its queue. An
+        item that changes again later is filed again if it waits for someone.
+
+        Popping is not persisted: the queues are rebuilt from the state on
+        restart, so an item still waiting for the role is queued again."""
+        self._load_pending()
+        items: List[WorkItem] = []
+        with self._lock:
+            while len(items) < limit:
+                entry = self._top(role)
+                if entry is None:
+                    break
+                heapq.heappop(self._heaps[role])
+                del self._filed[entry[2]]
+                self._counts[role] -= 1
+                items.append(entry[2])
+        return items
+
+    def peek(self, role: Role, limit: int = 1) -> List[WorkItem]:
+        """`role`'s `limit` most urgent items, left on the queue."""
+        self._load_pending()
+        with self._lock:
+            entries = []
+            while len(entries) < limit:
+                entry = self._top(role)
+                if entry is None:
+                    break
+                entries.append(heapq.heappop(self._heaps[role]))
+            for entry in entries:
+                heapq.heappush(self._heaps[role], entry)
+        return [entry[2] for entry in entries]
+
+
+_EVENT_HANDLERS: Dict[type, Callable[[WorkQueues, DomainEvent], None]] = {
+    HRRequestOpened: WorkQueues._hr_opened,
+    HRRequestDecided: WorkQueues._hr_decided,
+    StaffHired: WorkQueues._staff_hired,
+    BudgetRequestOpened: WorkQueues._budget_opened,
+    BudgetRequestDecided: WorkQueues._budget_decided,
+}
+
+# The events `WorkQueues.apply` takes, to subscribe it with.
+EVENT_TYPES = tuple(_EVENT_HANDLERS)
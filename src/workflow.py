@@ -0,0 +1,100 @@
+from contextlib import nullcontext
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Callable, Dict, FrozenSet, Generic, Hashable, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from .models import Role
+
+E = TypeVar("E")
+
+ANY = None  # In a rule: any role, or any action.
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """`action` moves an entity in one of `sources` to `target`; from any other
+    state it fails with `error`."""
+    action: Hashable
+    sources: FrozenSet[Hashable]
+    target: Any
+    error: str
+    roles: Optional[FrozenSet[Optional[Role]]] = ANY
+
+@dataclass(frozen=True, slots=True)
+class Require:
+    """`roles` may only take `actions` in one of `states`; elsewhere they fail
+    with `error`. Checked in rule order, before later transitions."""
+    states: FrozenSet[Hashable]
+    error: str
+    roles: Optional[FrozenSet[Optional[Role]]] = ANY
+    actions: Optional[FrozenSet[Hashable]] = ANY
+
+Rule = Union[Transition, Require]
+
+def _matches(allowed: Optional[FrozenSet[Any]], value: Any) -> bool:
+    return allowed is None or value in allowed
+
+class Workflow(Generic[E]):
+    """A state machine declared as an ordered list of rules and compiled into
+    a (role, state, action) -> target table, so checking a transition is one
+    dictionary lookup.
+
+    For each key the first rule matching its role and action decides: a
+    `Require` fails unless the state is one of its own, a `Transition`
+    succeeds from its sources and fails from anywhere else. Actions no rule
+    takes fail with `unknown`, formatted with the action; list them in
+    `actions` for earlier `Require` rules to apply to them. `state_of` gives an
+    entity's state, which may combine several fields. Workflows without roles
+    are checked with role None."""
+
+    def __init__(self, states: Iterable[Hashable], rules: Sequence[Rule],
+                 unknown: str = "Invalid action: {action}",
+                 roles: Iterable[Optional[Role]] = (None, *Role), actions: Iterable[Hashable] = (),
+                 state_of: Callable[[E], Hashable] = lambda entity: entity.status) -> None:  # type: ignore[attr-defined]
+        self.unknown = unknown
+        self.state_of = state_of
+        self._table: Dict[Tuple[Optional[Role], Hashable, Hashable], Tuple[bool, Any]] = {}
+        actions = {*actions, *(rule.action for rule in rules if isinstance(rule, Transition))}
+        for role, state, action in product(roles, states, actions):
+            for rule in rules:
+                if not _matches(rule.roles, role):
+                    continue
+                if isinstance(rule, Require):
+                    if _matches(rule.actions, action) and state not in rule.states:
+                        self._table[role, state, action] = (False, rule.error)
+                        break
+                elif rule.action == action:
+                    self._table[role, state, action] = ((True, rule.target) if state in rule.sources
+                                                        else (False, rule.error))
+                    break
+            else:
+                self._table[role, state, action] = (False, unknown.format(action=action))
+
+    def target(self, state: Hashable, action: Hashable, role: Optional[Role] = None) -> Any:
+        """Where `action` by `role` leads from `state`; ValueError if it is not allowed."""
+        try:
+            allowed, outcome = self._table[role, state, action]
+        except (KeyError, TypeError):  # TypeError: unhashable action
+            raise ValueError(self.unknown.format(action=action)) from None
+        if not allowed:
+            raise ValueError(outcome)
+        return outcome
+
+    def check(self, entity: E, action: Hashable, role: Optional[Role] = None) -> Any:
+        return self.target(self.state_of(entity), action, role)
+
+    def apply_many(self, items: Iterable[Tuple[E, Hashable]], apply: Callable[[E, Any], None],
+                   role: Optional[Role] = None) -> List[Optional[str]]:
+        """Take each (entity, action), calling `apply(entity, target)` for those allowed.
+
+        Each entity's lock (if it has one) is held from the check through
+        `apply`. Returns, per item, None if it was applied or why not."""
+        errors: List[Optional[str]] = []
+        for entity, action in items:
+            try:
+                with getattr(entity, "_lock", None) or nullcontext():
+                    apply(entity, self.check(entity, action, role))
+            except ValueError as e:
+                errors.append(str(e))
+            else:
+                errors.append(None)
+        return errors
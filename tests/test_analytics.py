@@ -0,0 +1,72 @@
+import unittest
+
+from src import BudgetRequest, BudgetRequestStatus, BudgetNegotiation
+from src.analytics import BudgetAnalytics
+
+class TestBudgetAnalytics(unittest.TestCase):
+    def setUp(self) -> None:
+        """Track four requests over two events."""
+        self.analytics = BudgetAnalytics()
+        self.requests = [
+            BudgetRequest(1, 10, 1000.0, "Lights"),
+            BudgetRequest(2, 10, 3000.0, "Stage"),
+            BudgetRequest(3, 20, 500.0, "Catering"),
+            BudgetRequest(4, 20, 2000.0, "Audio"),
+        ]
+        for request in self.requests:
+            self.analytics.track(request)
+
+    def test_totals_follow_status_changes(self) -> None:
+        """Approving or rejecting a tracked request updates its row."""
+        self.requests[0].approve()
+        self.requests[2].reject()
+
+        by_status = self.analytics.by_status()
+        self.assertEqual(by_status[BudgetRequestStatus.APPROVED], (1, 1000.0))
+        self.assertEqual(by_status[BudgetRequestStatus.PENDING], (2, 5000.0))
+        self.assertEqual(self.analytics.total(), 6500.0)
+        self.assertEqual(self.analytics.approval_rate(), 0.5)
+
+    def test_group_by_event(self) -> None:
+        """Sums are grouped per event, optionally for one status."""
+        self.requests[1].approve()
+
+        self.assertEqual(self.analytics.by_event(), {10: 4000.0, 20: 2500.0})
+        self.assertEqual(self.analytics.by_event(BudgetRequestStatus.APPROVED), {10: 3000.0})
+
+    def test_percentiles(self) -> None:
+        """Percentiles use nearest rank over the current amounts."""
+        self.assertEqual(self.analytics.percentiles((50, 99)), {50: 1000.0, 99: 3000.0})
+        self.assertEqual(self.analytics.percentiles((50,), BudgetRequestStatus.APPROVED), {50: 0.0})
+
+    def test_counter_offer_deltas(self) -> None:
+        """Counter-offers are compared against the originally requested amount."""
+        negotiation = BudgetNegotiation(1, self.requests[1])
+        self.analytics.track_negotiation(negotiation)
+        negotiation.counter_offer(2500.0)
+
+        offers = self.analytics.counter_offers()
+        self.assertEqual((offers.count, offers.requested, offers.offered), (1, 3000.0, 2500.0))
+        self.assertEqual(offers.delta, -500.0)
+        self.assertEqual(self.analytics.total(), 6000.0)
+
+    def test_rebuild_matches_incremental_state(self) -> None:
+        """A rebuilt instance answers the same as the one updated in place."""
+        negotiation = BudgetNegotiation(1, self.requests[0])
+        self.analytics.track_negotiation(negotiation)
+        negotiation.counter_offer(800.0)
+        negotiation.approve()
+
+        rebuilt = BudgetAnalytics()
+        rebuilt.rebuild(self.requests, [negotiation])
+
+        self.assertEqual(rebuilt.by_status(), self.analytics.by_status())
+        self.assertEqual(rebuilt.counter_offers(), self.analytics.counter_offers())
+
+    def test_request_is_tracked_once(self) -> None:
+        """Tracking the same request twice is an error."""
+        with self.assertRaises(ValueError):
+            self.analytics.track(self.requests[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime
+
+from src import Manager, Worker, Department, TaskRegistry, TaskStatus
+from src.assignment import AssignmentEngine
+from src.scheduling import Schedule
+
+EVENTS = {
+    1: (datetime(2025, 12, 1), datetime(2025, 12, 3)),
+    2: (datetime(2025, 12, 2), datetime(2025, 12, 4)),
+    3: (datetime(2025, 12, 10), datetime(2025, 12, 11)),
+}
+
+class TestAssignmentEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        """A production manager with three workers, two of them photographers."""
+        self.manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+        self.tobias = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        self.antony = Worker("Antony", Department.PRODUCTION, "Audio Specialist")
+        self.petra = Worker("Petra", Department.PRODUCTION, "Photographer")
+        self.schedule = Schedule(EVENTS.get)
+        self.engine = AssignmentEngine(self.schedule)
+        self.engine.rebuild([self.tobias, self.antony, self.petra, Worker("Helen", Department.SERVICES, "Chef")])
+
+    def task(self, event_id: int, title: str = "Task"):
+        task = self.manager.create_task(event_id, title, "")
+        self.schedule.track(task)
+        return task
+
+    def test_least_loaded_workers_first(self) -> None:
+        """Work spreads evenly, with ties broken by name."""
+        assigned = [self.engine.assign(self.manager, self.task(1))[0].name for _ in range(6)]
+        self.assertEqual(assigned, ["Antony", "Petra", "Tobias"] * 2)
+        self.assertEqual(self.engine.load(self.tobias), 2)
+
+    def test_duty_filter_and_closed_tasks(self) -> None:
+        """Only workers with the duty are picked; closing a task frees its load."""
+        first = self.task(1, "Portraits")
+        self.assertEqual(self.engine.assign(self.manager, first, 2, duty="photographer"), [self.petra, self.tobias])
+        self.manager.change_task_status(first, TaskStatus.CLOSED)
+        self.assertEqual(self.engine.load(self.petra), 0)
+        with self.assertRaises(ValueError):
+            self.engine.assign(self.manager, self.task(1), 3, duty="Photographer")
+
+    def test_busy_at_overlapping_event(self) -> None:
+        """Workers on an overlapping event are skipped; the same or a later event is fine."""
+        self.manager.assign_task(self.task(1), [self.antony, self.petra])
+        self.assertEqual(self.engine.assign(self.manager, self.task(2))[0], self.tobias)
+        self.assertEqual(self.engine.assign(self.manager, self.task(1))[0], self.antony)
+        self.assertEqual(self.engine.assign(self.manager, self.task(3), 3),
+                         [self.petra, self.tobias, self.antony])
+
+    def test_busy_worker_returns_once_free(self) -> None:
+        """A worker skipped as busy is picked again after the clashing task closes."""
+        clash = self.task(2)
+        self.manager.assign_task(clash, [self.antony])
+        self.assertEqual(self.engine.assign(self.manager, self.task(1), 2), [self.petra, self.tobias])
+        self.manager.change_task_status(clash, TaskStatus.CLOSED)
+        self.assertEqual(self.engine.assign(self.manager, self.task(1))[0], self.antony)
+
+    def test_nothing_assigned_when_short(self) -> None:
+        """A request for more workers than are free assigns none."""
+        task = self.task(1)
+        with self.assertRaises(ValueError):
+            self.engine.assign(self.manager, task, 4)
+        self.assertEqual(task.assigned_workers, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import EventSystem, EventApplicationStatus, Manager, Department, TaskRegistry, Role
+from src.bulk import APPLICATION_FIELDS, export_file, import_file
+
+class TestBulkImport(unittest.TestCase):
+    def setUp(self) -> None:
+        """A temporary directory and an empty system to import into."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.system = EventSystem()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def import_applications(self, path: str, **options):
+        return import_file(path, "applications", lambda rows: self.system.create_many(rows) and [], **options)
+
+    def test_csv_import_skips_invalid_rows(self) -> None:
+        """Valid rows become applications; invalid ones are reported by line."""
+        path = self.write("apps.csv", "client_name,event_type,start_date,end_date,budget,preferences\n"
+                                      "A,Workshop,2025-12-03,2025-12-04,100,Jazz\n"
+                                      "B,Workshop,2025-12-01,2025-12-02,lots,\n"
+                                      "C,Gala,2025-12-01,2025-12-02,300,\n")
+
+        report = self.import_applications(path, chunk_size=1)
+
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(report.rejected, [(3, "Invalid budget: 'lots'")])
+        self.assertEqual([a.client_name for a in self.system.applications], ["A", "C"])
+        app = self.system.get_application_by_id(2)
+        self.assertEqual((app.budget, app.start_date), (300.0, datetime(2025, 12, 1)))
+        self.assertEqual(app.history[0].action, "Created")
+        self.assertTrue(app.has_acted(Role.CS_WORKER))
+
+    def test_create_many_keeps_indexes(self) -> None:
+        """Bulk-created applications get one ID range and show up in the indexes."""
+        self.system.create_event_application("First", "Workshop", datetime(2025, 12, 5), datetime(2025, 12, 6), 1, "")
+        rows = [("A", "Gala", datetime(2025, 12, 9), datetime(2025, 12, 10), 1.0, ""),
+                ("B", "Gala", datetime(2025, 12, 1), datetime(2025, 12, 2), 2.0, "")]
+
+        apps = self.system.create_many(rows)
+
+        self.assertEqual([a.app_id for a in apps], [2, 3])
+        self.assertEqual(self.system.next_id, 4)
+        self.assertEqual([a.app_id for a in self.system.starting_between(datetime(2025, 12, 1), datetime(2025, 12, 31))],
+                         [3, 1, 2])
+        self.assertEqual(len(self.system.query(status=EventApplicationStatus.PENDING_REVIEW, event_type="Gala")), 2)
+
+    def test_export_then_import_jsonl(self) -> None:
+        """An export can be imported again; bad lines are rejected."""
+        self.system.create_event_application("A", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "Jazz")
+        path = os.path.join(self.tmp.name, "apps.jsonl")
+        written = export_file(path, ("app_id", *APPLICATION_FIELDS, "status"),
+                              ((a.app_id, a.client_name, a.event_type, a.start_date, a.end_date, a.budget,
+                                a.preferences, a.status) for a in self.system.iter_applications()))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("{broken\n" + json.dumps(["not", "an", "object"]) + "\n")
+
+        self.system = EventSystem()
+        report = self.import_applications(path)
+
+        self.assertEqual(written, 1)
+        self.assertEqual(report.imported, 1)
+        self.assertEqual([line for line, _ in report.rejected], [2, 3])
+        self.assertEqual(self.system.get_application_by_id(1).preferences, "Jazz")
+
+    def test_refused_rows_are_reported(self) -> None:
+        """Rows the creator refuses are reported with their own line numbers."""
+        manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+        path = self.write("tasks.csv", "event_id,title,description\n1,Stage,Lights\n7,Ghost,\n1,Sound,\n")
+
+        def create(rows):
+            refused = [(i, "No event") for i, row in enumerate(rows) if row[0] != 1]
+            manager.create_tasks([row for row in rows if row[0] == 1])
+            return refused
+
+        report = import_file(path, "tasks", create)
+
+        self.assertEqual(report.rejected, [(3, "No event")])
+        self.assertEqual([(t.task_id, t.title) for t in manager.tasks], [(1, "Stage"), (2, "Sound")])
+
+    def test_process_pool_gives_same_result(self) -> None:
+        """Parsing in worker processes keeps file order."""
+        lines = "".join(f"Client {i},Workshop,2025-12-01,2025-12-02,{i},\n" for i in range(50))
+        path = self.write("apps.csv", ",".join(APPLICATION_FIELDS) + "\n" + lines)
+
+        report = self.import_applications(path, chunk_size=7, workers=2)
+
+        self.assertEqual(report.imported, 50)
+        self.assertEqual([a.budget for a in self.system.applications], [float(i) for i in range(50)])
+
+    def test_unknown_format(self) -> None:
+        """Only .csv and .jsonl files are accepted."""
+        with self.assertRaises(ValueError):
+            self.import_applications(self.write("apps.txt", ""))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from typing import List
+
+from src import Employee, Role
+from src.commands import CommandRegistry
+
+class TestCommandRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        """Register a couple of commands that record their calls."""
+        self.registry = CommandRegistry()
+        self.calls: List[List[str]] = []
+
+        @self.registry.command("create-hr-request", Role.MANAGER, Role.HR_WORKER,
+                               usage="create-hr-request <type>", help="Create a HR request", min_args=1, mutates=True)
+        def create_hr_request(user: Employee, args: List[str]) -> None:
+            self.calls.append(args)
+
+        self.manager = Employee("Jack", Role.MANAGER)
+        self.finance = Employee("Alice", Role.FIN_MANAGER)
+
+    def dispatch(self, user: Employee, name: str, args: List[str]):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            command = self.registry.dispatch(user, name, args)
+        return command, out.getvalue()
+
+    def test_dispatch_runs_allowed_command(self) -> None:
+        """An allowed role with enough arguments runs the handler."""
+        command, _ = self.dispatch(self.manager, "create-hr-request", ["Photographer"])
+
+        self.assertTrue(command.mutates)
+        self.assertEqual(self.calls, [["Photographer"]])
+
+    def test_dispatch_denies_other_roles(self) -> None:
+        """Roles not registered for the command get a permission error."""
+        command, output = self.dispatch(self.finance, "create-hr-request", ["Photographer"])
+
+        self.assertIsNone(command)
+        self.assertIn("Permission denied", output)
+        self.assertEqual(self.calls, [])
+
+    def test_dispatch_checks_argument_count(self) -> None:
+        """Too few arguments prints the usage instead of calling the handler."""
+        command, output = self.dispatch(self.manager, "create-hr-request", [])
+
+        self.assertIsNone(command)
+        self.assertIn("Usage: create-hr-request <type>", output)
+
+    def test_unknown_command(self) -> None:
+        """Unregistered names are reported as unknown."""
+        _, output = self.dispatch(self.manager, "launch-rocket", [])
+        self.assertIn("Unknown command", output)
+
+    def test_failing_handler_is_reported(self) -> None:
+        """A handler raising prints the error and is not reported as having run."""
+        @self.registry.command("close-task", Role.MANAGER, min_args=1, mutates=True)
+        def close_task(user: Employee, args: List[str]) -> None:
+            raise ValueError("Cannot update task to same status.")
+
+        command, output = self.dispatch(self.manager, "close-task", ["X"])
+
+        self.assertIsNone(command)
+        self.assertIn("❌ Cannot update task to same status.", output)
+
+    def test_help_lines_follow_roles(self) -> None:
+        """Help is generated only from the commands a role may run."""
+        self.assertEqual(len(self.registry.help_lines(Role.HR_WORKER)), 1)
+        self.assertEqual(self.registry.help_lines(Role.FIN_MANAGER), [])
+
+    def test_duplicate_registration_is_rejected(self) -> None:
+        """A command name can only be registered once."""
+        with self.assertRaises(ValueError):
+            self.registry.register("create-hr-request", lambda user, args: None, [Role.MANAGER])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import pickle
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src import (Role, EventSystem, EventApplicationStatus, Manager, Worker, Department, HRRequest,
+                 BudgetRequest, BudgetNegotiation)
+from src.concurrency import IdAllocator
+
+WRITERS = 16
+PER_WRITER = 250
+
+class TestConcurrentWriters(unittest.TestCase):
+    def run_concurrently(self, fn, count: int = WRITERS) -> list:
+        """Start `count` calls of `fn` at the same time and wait for all of them."""
+        barrier = threading.Barrier(count)
+
+        def start(i: int):
+            barrier.wait()
+            return fn(i)
+
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            return list(pool.map(start, range(count)))
+
+    def test_id_allocator_never_hands_out_duplicates(self) -> None:
+        """Concurrent allocations and reservations yield disjoint IDs."""
+        ids = IdAllocator()
+
+        def allocate(i: int) -> list:
+            taken = [ids.allocate() for _ in range(PER_WRITER)]
+            taken.extend(ids.reserve(10))
+            return taken
+
+        taken = [x for batch in self.run_concurrently(allocate) for x in batch]
+        self.assertEqual(sorted(taken), list(range(1, WRITERS * (PER_WRITER + 10) + 1)))
+
+    def test_concurrent_application_creation_and_review(self) -> None:
+        """No application or status change is lost under many concurrent writers."""
+        system = EventSystem()
+
+        def create_and_forward(i: int) -> None:
+            for n in range(PER_WRITER):
+                app = system.create_event_application(f"Client {i}", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), n, "")
+                system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "ok")
+
+        self.run_concurrently(create_and_forward)
+
+        total = WRITERS * PER_WRITER
+        self.assertEqual([a.app_id for a in system.applications], list(range(1, total + 1)))
+        self.assertEqual(len(system.query(status=EventApplicationStatus.FORWARDED)), total)
+        self.assertEqual(system.query(status=EventApplicationStatus.PENDING_REVIEW), [])
+
+    def test_only_one_concurrent_reviewer_wins(self) -> None:
+        """Racing approvals of one HR request succeed exactly once."""
+        request = HRRequest(1, "Photographer")
+
+        def approve(i: int) -> bool:
+            try:
+                request.approve()
+                return True
+            except ValueError:
+                return False
+
+        self.assertEqual(sum(self.run_concurrently(approve)), 1)
+
+    def test_concurrent_comments_and_assignments_on_one_task(self) -> None:
+        """Comments and worker assignments on the same task are all kept."""
+        manager = Manager("Jack", Department.PRODUCTION)
+        task = manager.create_task(1, "Prepare Stage", "Lights")
+        workers = [Worker(f"Worker {i}", Department.PRODUCTION, "Technician") for i in range(WRITERS)]
+
+        def work(i: int) -> None:
+            manager.assign_task(task, [workers[i]])
+            for n in range(PER_WRITER):
+                workers[i].comment_on_task(task, f"update {n}")
+
+        self.run_concurrently(work)
+
+        self.assertEqual(len(task.assigned_workers), WRITERS)
+        self.assertEqual(len(task.comments), WRITERS * PER_WRITER)
+
+    def test_counter_offers_race_with_approval(self) -> None:
+        """Once a negotiation is approved no later counter-offer changes the amount."""
+        request = BudgetRequest(1, 1, 1000.0, "Equipment")
+        negotiation = BudgetNegotiation(1, request)
+
+        def act(i: int) -> None:
+            try:
+                if i == 0:
+                    negotiation.approve()
+                else:
+                    negotiation.counter_offer(float(i))
+            except ValueError:
+                pass
+
+        self.run_concurrently(act)
+        amount = request.amount
+        with self.assertRaises(ValueError):
+            negotiation.counter_offer(-1.0)
+        self.assertEqual(request.amount, amount)
+
+    def test_locked_objects_can_be_pickled(self) -> None:
+        """Snapshots pickle domain objects; their locks are recreated on load."""
+        system = EventSystem()
+        system.create_event_application("TestCorp", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+
+        restored = pickle.loads(pickle.dumps(system))
+
+        self.assertEqual(restored.create_event_application("B", "Party", datetime(2025, 12, 1), datetime(2025, 12, 2), 1, "").app_id, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
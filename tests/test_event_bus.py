@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import unittest
+from datetime import datetime
+
+from src import journal
+from src import EventSystem, EventApplicationStatus, Role, Manager, Worker, Department, TaskRegistry
+from src.event_bus import EventBus
+from src.event_request import ApplicationStatusChanged
+from src.staff_recruitment import StaffHired
+from src.task_distribution import TaskBudgetAsked, TaskCommented, TaskCreated
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self) -> None:
+        """A bus receiving every recorded event for the length of the test."""
+        self.bus = EventBus(max_workers=2)
+        previous = journal.publish_to(self.bus.publish)
+        self.addCleanup(journal.publish_to, previous)
+        self.addCleanup(self.bus.close)
+
+    def test_domain_changes_are_published(self) -> None:
+        """Status changes and task notes reach synchronous subscribers, filtered by type."""
+        seen = []
+        self.bus.subscribe(seen.append, ApplicationStatusChanged, TaskCommented, TaskBudgetAsked)
+        system = EventSystem()
+        app = system.create_event_application("A", "Party", datetime(2025, 12, 1), datetime(2025, 12, 2), 1, "")
+        system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "")
+        manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+        worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        task = manager.create_task(app.app_id, "Photos", "")
+        manager.assign_task(task, [worker])
+        worker.comment_on_task(task, "On it")
+        worker.request_more_budget(task, 50, "Film")
+
+        self.assertEqual([type(e) for e in seen], [ApplicationStatusChanged, TaskCommented, TaskBudgetAsked])
+        self.assertEqual((seen[1].task_id, seen[1].comment), (task.task_id, "On it"))
+
+    def test_slow_threaded_subscriber_drops_when_full(self) -> None:
+        """Publishing never waits for a slow pool subscriber; overflow is counted."""
+        release, handled = threading.Event(), []
+        def slow(event) -> None:
+            release.wait(5)
+            handled.append(event)
+        subscription = self.bus.subscribe_threaded(slow, maxsize=2)
+        events = [TaskCreated(i, 1, "T", "", Department.PRODUCTION) for i in range(10)]
+        for event in events:
+            self.bus.publish(event)
+        release.set()
+        self.assertTrue(subscription.join(5))
+        self.assertEqual(len(handled) + subscription.dropped, 10)
+        self.assertGreaterEqual(subscription.dropped, 7)
+        self.assertEqual(handled, sorted(handled, key=lambda e: e.task_id))
+
+    def test_blocking_subscriber_sees_every_event(self) -> None:
+        """With `block`, a full queue makes the publisher wait instead of dropping."""
+        handled = []
+        subscription = self.bus.subscribe_threaded(handled.append, StaffHired, maxsize=1, block=True)
+        for i in range(50):
+            self.bus.publish(StaffHired(i, "Helen", Department.SERVICES, "Chef"))
+        self.assertTrue(subscription.join(5))
+        self.assertEqual([e.request_id for e in handled], list(range(50)))
+        self.assertEqual(subscription.dropped, 0)
+
+    def test_async_subscriber_and_errors(self) -> None:
+        """Coroutine handlers run on their loop in order; a failing handler is counted, not raised."""
+        handled = []
+        async def handler(event) -> None:
+            await asyncio.sleep(0)
+            handled.append(event.task_id)
+
+        async def main() -> None:
+            subscription = self.bus.subscribe_async(handler, asyncio.get_running_loop(), TaskCreated)
+            failing = self.bus.subscribe(lambda event: 1 / 0)
+            for i in range(5):
+                self.bus.publish(TaskCreated(i, 1, "T", "", Department.PRODUCTION))
+            while not await asyncio.to_thread(subscription.join, 0.01):
+                pass
+            self.assertEqual(failing.errors, 5)
+            self.assertIsInstance(failing.last_error, ZeroDivisionError)
+
+        asyncio.run(main())
+        self.assertEqual(handled, [0, 1, 2, 3, 4])
+
+if __name__ == "__main__":
+    unittest.main()
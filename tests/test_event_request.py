@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from datetime import datetime
 from src import Role, EventSystem, EventApplicationStatus
@@ -110,3 +111,109 @@ class TestEventRequestWorkflow(unittest.TestCase):
         with self.assertRaises(ValueError) as cm:
             self.system.review_application(event_application.app_id, Role.ADM_MANAGER, EventApplicationStatus.APPROVED, "All good")
         self.assertIn("AM cannot act before FM has reviewed", str(cm.exception))
+
+    def test_get_application_by_id_unknown_id_raises(self) -> None:
+        """Looking up an application that was never created should raise."""
+        with self.assertRaises(ValueError):
+            self.system.get_application_by_id(42)
+
+    def test_get_many_returns_applications_in_requested_order(self) -> None:
+        """`get_many` should return the applications in the order of the given IDs."""
+        for client in ("A", "B", "C"):
+            self.system.create_event_application(client, "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+
+        apps = self.system.get_many([3, 1])
+
+        self.assertEqual([a.client_name for a in apps], ["C", "A"])
+
+    def test_iter_pages_splits_applications_into_pages(self) -> None:
+        """Paged iteration should cover every application exactly once."""
+        for i in range(5):
+            self.system.create_event_application(f"Client {i}", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+
+        pages = list(self.system.iter_pages(page_size=2))
+
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        self.assertEqual([a.app_id for p in pages for a in p], [1, 2, 3, 4, 5])
+
+    def test_iter_applications_resumes_after_cursor(self) -> None:
+        """Cursor iteration should list applications by ID from just after `after`."""
+        for i in range(5):
+            self.system.create_event_application(f"Client {i}", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+
+        self.assertEqual([a.app_id for a in self.system.iter_applications(after=2, limit=2)], [3, 4])
+        self.assertEqual([a.app_id for a in self.system.iter_applications(after=4)], [5])
+        self.assertEqual(self.system.list_applications(limit=1), ["[#1] Client 0 - Workshop (EventApplicationStatus.PENDING_REVIEW)"])
+
+    def test_query_by_status_follows_reviews(self) -> None:
+        """The status index should move applications as they are reviewed."""
+        first = self.system.create_event_application("A", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+        second = self.system.create_event_application("B", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+
+        self.system.review_application(first.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "Forward to FM")
+
+        self.assertEqual(self.system.query(status=EventApplicationStatus.FORWARDED), [first])
+        self.assertEqual(self.system.query(status=EventApplicationStatus.PENDING_REVIEW), [second])
+
+    def test_query_combines_client_type_and_date_filters(self) -> None:
+        """Filters on client, event type and date range should be intersected."""
+        match = self.system.create_event_application("TestCorp", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 3), 100, "")
+        self.system.create_event_application("TestCorp", "Party", datetime(2025, 12, 1), datetime(2025, 12, 3), 100, "")
+        self.system.create_event_application("TestCorp", "Workshop", datetime(2026, 1, 10), datetime(2026, 1, 11), 100, "")
+        self.system.create_event_application("Other", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 3), 100, "")
+
+        result = self.system.query(client_name="TestCorp", event_type="Workshop",
+                                   between=(datetime(2025, 12, 2), datetime(2025, 12, 31)))
+
+        self.assertEqual(result, [match])
+
+    def test_overlapping_finds_events_that_started_earlier(self) -> None:
+        """A long event that started before the window should still overlap it."""
+        long_event = self.system.create_event_application("A", "Festival", datetime(2025, 11, 1), datetime(2025, 12, 20), 100, "")
+        self.system.create_event_application("B", "Workshop", datetime(2025, 11, 2), datetime(2025, 11, 3), 100, "")
+        next_month = self.system.create_event_application("C", "Workshop", datetime(2025, 12, 5), datetime(2025, 12, 6), 100, "")
+
+        self.assertEqual(self.system.overlapping(datetime(2025, 12, 1), datetime(2025, 12, 31)), [long_event, next_month])
+        self.assertEqual(self.system.starting_between(datetime(2025, 12, 1), datetime(2025, 12, 31)), [next_month])
+
+    def test_overlapping_follows_later_applications(self) -> None:
+        """Applications created after the first overlap query, or after a pickle round trip, are found too."""
+        self.system.create_event_application("A", "Festival", datetime(2020, 1, 1), datetime(2025, 12, 31), 100, "")
+        self.assertEqual(len(self.system.overlapping(datetime(2025, 6, 1), datetime(2025, 6, 2))), 1)
+        short = self.system.create_event_application("B", "Workshop", datetime(2025, 6, 2), datetime(2025, 6, 3), 100, "")
+        self.assertEqual(self.system.overlapping(datetime(2025, 6, 3), datetime(2026, 1, 1))[1:], [short])
+
+        restored = pickle.loads(pickle.dumps(self.system))
+        restored.create_event_application("C", "Workshop", datetime(2026, 1, 5), datetime(2026, 1, 6), 100, "")
+        self.assertEqual([app.client_name for app in restored.overlapping(datetime(2025, 12, 31), datetime(2026, 1, 5))],
+                         ["A", "C"])
+
+    def test_review_many_applies_all_in_order(self) -> None:
+        """A batch may forward applications and review them again later in the same batch."""
+        apps = [self.system.create_event_application("A", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+                for _ in range(3)]
+        forward = [(app.app_id, EventApplicationStatus.FORWARDED, "Forward") for app in apps]
+        results = self.system.review_many(forward, Role.CS_MANAGER)
+        self.assertEqual([r.error for r in results], [None] * 3)
+
+        results = self.system.review_many([(1, EventApplicationStatus.FORWARDED, "Budget OK"),
+                                           (1, EventApplicationStatus.APPROVED, "Final")], Role.FIN_MANAGER)
+        self.assertEqual([r.error for r in results], [None, None])
+        self.assertEqual(apps[0].status, EventApplicationStatus.APPROVED)
+        self.assertEqual(apps[0].comment, "Final")
+        self.assertEqual(self.system.query(status=EventApplicationStatus.FORWARDED), apps[1:])
+
+    def test_review_many_changes_nothing_if_any_is_invalid(self) -> None:
+        """One invalid decision leaves every application in the batch untouched."""
+        first = self.system.create_event_application("A", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+        self.system.review_application(first.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "Forward")
+        second = self.system.create_event_application("B", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 100, "")
+
+        results = self.system.review_many([(first.app_id, EventApplicationStatus.APPROVED, ""),
+                                           (second.app_id, EventApplicationStatus.APPROVED, ""),
+                                           (99, EventApplicationStatus.APPROVED, "")], Role.FIN_MANAGER)
+
+        self.assertEqual([r.error for r in results], [None, "FM can only act after SCS has forwarded the application.",
+                                                      "No application found with ID 99"])
+        self.assertEqual(first.status, EventApplicationStatus.FORWARDED)
+        self.assertEqual(len(first.history), 2)
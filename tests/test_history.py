@@ -0,0 +1,78 @@
+import pickle
+import unittest
+from datetime import datetime
+
+from src import EventSystem, EventApplicationStatus, HistoryEntry, HistoryStore, Role
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = HistoryStore()
+        self.store.append(1, HistoryEntry(datetime(2025, 1, 1), Role.CS_WORKER, "Created", "Initial submission"))
+        self.store.append(2, HistoryEntry(datetime(2025, 1, 2), Role.CS_WORKER, "Created", "Initial submission"))
+        self.store.append(1, HistoryEntry(datetime(2025, 1, 3), Role.CS_MANAGER, "Forwarded", "ok"))
+        self.store.append(1, HistoryEntry(datetime(2025, 1, 4), Role.FIN_MANAGER, "Forwarded", "Budget fine"))
+
+    def test_entries_round_trip_per_application(self) -> None:
+        """Entries come back in order and only for the requested application."""
+        entries = self.store.entries(1)
+
+        self.assertEqual([e.role for e in entries], [Role.CS_WORKER, Role.CS_MANAGER, Role.FIN_MANAGER])
+        self.assertEqual(entries[2], HistoryEntry(datetime(2025, 1, 4), Role.FIN_MANAGER, "Forwarded", "Budget fine"))
+        self.assertEqual(len(self.store.entries(2)), 1)
+        self.assertEqual(self.store.entries(3), [])
+
+    def test_has_acted_tracks_roles_per_application(self) -> None:
+        """The reviewed-by flag is set only for applications the role acted on."""
+        self.assertTrue(self.store.has_acted(1, Role.FIN_MANAGER))
+        self.assertFalse(self.store.has_acted(2, Role.FIN_MANAGER))
+        self.assertFalse(self.store.has_acted(99, Role.FIN_MANAGER))
+        self.assertEqual(self.store.acted_on_by(Role.CS_WORKER), [1, 2])
+
+    def test_scan_combines_filters(self) -> None:
+        """Scans match role, action and time range together."""
+        forwarded = self.store.scan(action="Forwarded")
+        self.assertEqual([app_id for app_id, _ in forwarded], [1, 1])
+
+        fm = self.store.scan(role=Role.FIN_MANAGER, action="Forwarded")
+        self.assertEqual([e.comment for _, e in fm], ["Budget fine"])
+
+        early = self.store.scan(between=(datetime(2025, 1, 1), datetime(2025, 1, 2)))
+        self.assertEqual([app_id for app_id, _ in early], [1, 2])
+
+        self.assertEqual(self.store.scan(action="Approved"), [])
+
+    def test_counts(self) -> None:
+        """Counts cover every stored entry."""
+        self.assertEqual(self.store.count_by_action(), {"Created": 2, "Forwarded": 2})
+        self.assertEqual(self.store.count_by_role()[Role.CS_WORKER], 2)
+
+    def test_replace_drops_old_rows(self) -> None:
+        """Replaced entries no longer show up in scans, counts or flags."""
+        self.store.replace(1, [HistoryEntry(datetime(2025, 2, 1), Role.CS_WORKER, "Created", "Restored")])
+
+        self.assertEqual(len(self.store), 2)
+        self.assertFalse(self.store.has_acted(1, Role.FIN_MANAGER))
+        self.assertEqual(self.store.count_by_action(), {"Created": 2})
+        self.assertEqual([e.comment for _, e in self.store.scan(role=Role.CS_WORKER)],
+                         ["Initial submission", "Restored"])
+
+    def test_store_survives_pickling(self) -> None:
+        """Snapshots pickle the store with its columns."""
+        copy = pickle.loads(pickle.dumps(self.store))
+        self.assertEqual(copy.entries(1), self.store.entries(1))
+
+
+class TestEventSystemHistory(unittest.TestCase):
+    def test_applications_share_the_system_store(self) -> None:
+        """Reviews are recorded in the system-wide store."""
+        system = EventSystem()
+        app = system.create_event_application("TestCorp", "Workshop", datetime(2025, 12, 1),
+                                              datetime(2025, 12, 2), 5000.0, "Jazz")
+        system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "ok")
+
+        self.assertIs(app.history_store, system.history)
+        self.assertEqual(system.history.scan(role=Role.CS_MANAGER)[0][0], app.app_id)
+        self.assertFalse(app.has_acted(Role.FIN_MANAGER))
+
+if __name__ == "__main__":
+    unittest.main()
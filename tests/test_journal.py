@@ -0,0 +1,132 @@
+import unittest
+from datetime import datetime
+
+from src import (Role, EventSystem, EventApplicationStatus, Manager, Worker, Department, TaskRegistry, TaskStatus,
+                 HRRequest, HRRequestStatus, BudgetRequest, BudgetRequestStatus, BudgetNegotiation)
+from src.event_request import ApplicationStatusChanged, ApplicationSubmitted
+from src.financial_request import BudgetRequestOpened, NegotiationOpened
+from src.journal import Journal, record, recording
+from src.projection import DomainState
+from src.staff_recruitment import HRRequestOpened
+
+class TestJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        """Run a little of every workflow while recording to a fresh journal."""
+        self.journal = Journal()
+        with recording(self.journal):
+            self.system = EventSystem()
+            app = self.system.create_event_application("TestCorp", "Workshop", datetime(2025, 12, 1),
+                                                       datetime(2025, 12, 2), 5000.0, "Jazz")
+            self.system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "ok")
+            self.system.review_application(app.app_id, Role.FIN_MANAGER, EventApplicationStatus.FORWARDED, "Fine")
+
+            manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+            task = manager.create_task(app.app_id, "Prepare Stage", "Lights")
+            manager.assign_task(task, [Worker("Antony", Department.PRODUCTION, "Audio Specialist")])
+            manager.change_task_status(task, TaskStatus.IN_PROGRESS)
+            task.add_comment("Tobias", "Need a ladder")
+            task.add_budget_request("Tobias", 120.0, "Ladder")
+
+            hr_request = HRRequest(1, "Photographer")
+            record(HRRequestOpened(1, "Photographer"))
+            hr_request.approve()
+            hr_request.hire_staff(Worker("Tobias", Department.PRODUCTION, "Photographer"))
+
+            request = BudgetRequest(1, app.app_id, 1000.0, "Equipment")
+            record(BudgetRequestOpened(1, app.app_id, 1000.0, "Equipment"))
+            negotiation = BudgetNegotiation(1, request)
+            record(NegotiationOpened(1, 1))
+            negotiation.counter_offer(800.0)
+            negotiation.approve()
+        self.live = DomainState.of(self.system, {1: hr_request}, {1: request}, {1: negotiation}, [task])
+
+    def summary(self, state: DomainState):
+        """What replay must reproduce, as plain values."""
+        return (
+            [(a.app_id, a.status, a.comment, a.history) for a in state.system.applications],
+            [(t.task_id, t.title, t.status, [(w.name, w.duty) for w in t.assigned_workers],
+              [(c.worker, c.comment) for c in t.comments], [(b.worker, b.amount) for b in t.budget_requests])
+             for t in state.tasks.values()],
+            [(r.request_id, r.status, [w.name for w in r.hired_staff]) for r in state.hr_requests.values()],
+            [(r.request_id, r.amount, r.status) for r in state.budget_requests.values()],
+            [(n.negotiation_id, n.status) for n in state.negotiations.values()],
+        )
+
+    def test_transitions_emit_typed_events(self) -> None:
+        """Each transition appends its own event, in order."""
+        events = self.journal.events()
+
+        self.assertIsInstance(events[0], ApplicationSubmitted)
+        self.assertIsInstance(events[1], ApplicationStatusChanged)
+        self.assertEqual(events[1].role, Role.CS_MANAGER)
+        self.assertEqual(len(self.journal), len(events))
+
+    def test_nothing_is_recorded_without_a_journal(self) -> None:
+        """Outside `recording` transitions still work and record nothing."""
+        before = len(self.journal)
+        HRRequest(2, "Chef").approve()
+        self.assertEqual(len(self.journal), before)
+
+    def test_rebuild_from_events(self) -> None:
+        """Replaying the journal gives back the same domain state."""
+        state = DomainState.rebuild(self.journal)
+
+        app = state.system.get_application_by_id(1)
+        self.assertEqual(app.status, EventApplicationStatus.FORWARDED)
+        self.assertEqual(app.comment, "Fine")
+        self.assertEqual(app.history, self.system.get_application_by_id(1).history)
+        self.assertTrue(app.has_acted(Role.FIN_MANAGER))
+        self.assertEqual(state.tasks[1].status, TaskStatus.IN_PROGRESS)
+        self.assertEqual([w.name for w in state.tasks[1].assigned_workers], ["Antony"])
+        self.assertEqual(state.tasks[1].assigned_workers[0].tasks, [state.tasks[1]])
+        self.assertEqual([c.comment for c in state.tasks[1].comments], ["Need a ladder"])
+        self.assertEqual(state.tasks[1].budget_requests[0].amount, 120.0)
+        self.assertEqual(state.hr_requests[1].status, HRRequestStatus.HIRED)
+        self.assertEqual(state.hr_requests[1].hired_staff[0].name, "Tobias")
+        self.assertEqual(state.budget_requests[1].amount, 800.0)
+        self.assertEqual(state.budget_requests[1].status, BudgetRequestStatus.APPROVED)
+        self.assertIs(state.negotiations[1].request, state.budget_requests[1])
+        self.assertEqual(state.seq, len(self.journal))
+
+    def test_rebuild_from_checkpoint_after_compaction(self) -> None:
+        """A compacted journal rebuilds from its checkpoint plus the tail."""
+        DomainState().checkpoint(self.journal, compact=True)
+        with recording(self.journal):
+            self.system.review_application(1, Role.ADM_MANAGER, EventApplicationStatus.APPROVED, "Go")
+
+        self.assertEqual(len(self.journal.events(self.journal.checkpoint[0])), 1)
+        with self.assertRaises(ValueError):
+            self.journal.events()
+
+        state = DomainState.rebuild(self.journal)
+        self.assertEqual(state.system.get_application_by_id(1).status, EventApplicationStatus.APPROVED)
+        self.assertEqual(state.seq, len(self.journal))
+
+    def test_replay_matches_live_state(self) -> None:
+        """Rebuilding from events, or from a checkpoint of the live objects plus later events, gives the live state."""
+        self.assertEqual(self.summary(DomainState.rebuild(self.journal)), self.summary(self.live))
+
+        live = DomainState.of(self.live.system, self.live.hr_requests, self.live.budget_requests,
+                              self.live.negotiations, self.live.tasks.values(), self.journal.last_seq)
+        self.journal.save_checkpoint(live.seq, live.snapshot(), compact=True)
+        with recording(self.journal):
+            self.system.review_application(1, Role.ADM_MANAGER, EventApplicationStatus.APPROVED, "Go")
+            task = self.live.tasks[1]
+            Manager("Jack", Department.PRODUCTION).assign_task(task, [Worker("Tobias", Department.PRODUCTION, "Photographer")])
+
+        self.assertEqual(self.summary(DomainState.rebuild(self.journal)), self.summary(self.live))
+
+    def test_checkpoint_interval(self) -> None:
+        """needs_checkpoint follows the configured interval."""
+        journal = Journal(checkpoint_every=2)
+        with recording(journal):
+            HRRequest(1, "Chef").approve()
+            self.assertFalse(journal.needs_checkpoint)
+            HRRequest(2, "Chef").approve()
+        self.assertTrue(journal.needs_checkpoint)
+
+        DomainState.of(EventSystem(), {1: HRRequest(1, "Chef"), 2: HRRequest(2, "Chef")}, {}, {}, []).checkpoint(journal)
+        self.assertFalse(journal.needs_checkpoint)
+
+if __name__ == "__main__":
+    unittest.main()
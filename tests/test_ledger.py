@@ -0,0 +1,101 @@
+import pickle
+import unittest
+from datetime import datetime
+
+from src import EventSystem, Manager, Worker, Department, BudgetRequest, BudgetNegotiation
+from src.ledger import BudgetLedger
+
+class TestBudgetLedger(unittest.TestCase):
+    def setUp(self) -> None:
+        """One event with a 5000 SEK budget, tracked by a fresh ledger."""
+        self.ledger = BudgetLedger()
+        system = EventSystem()
+        self.app = system.create_event_application("TestCorp", "Workshop", datetime(2025, 12, 1),
+                                                   datetime(2025, 12, 2), 5000.0, "Jazz")
+        self.ledger.track_application(self.app)
+        self.event_id = self.app.app_id
+
+    def track_request(self, request_id: int, amount: float) -> BudgetRequest:
+        request = BudgetRequest(request_id, self.event_id, amount, "Equipment")
+        self.ledger.track_request(request)
+        return request
+
+    def test_new_event_starts_from_original_budget(self) -> None:
+        """Only the application budget counts before any requests."""
+        budget = self.ledger.get(self.event_id)
+        self.assertEqual((budget.original, budget.requested, budget.approved), (5000.0, 0.0, 0.0))
+        self.assertEqual(budget.committed, 5000.0)
+
+    def test_decisions_move_amounts_between_columns(self) -> None:
+        """Approving moves a request from requested to approved; rejecting drops it."""
+        first, second = self.track_request(1, 1000.0), self.track_request(2, 400.0)
+        self.assertEqual(self.ledger.get(self.event_id).requested, 1400.0)
+
+        first.approve()
+        second.reject()
+
+        budget = self.ledger.get(self.event_id)
+        self.assertEqual((budget.requested, budget.approved), (0.0, 1000.0))
+        self.assertEqual(budget.committed, 6000.0)
+
+    def test_counter_offer_updates_requested_and_negotiating(self) -> None:
+        """An open counter-offer shows up at the offered amount until it is decided."""
+        negotiation = BudgetNegotiation(1, self.track_request(1, 1000.0))
+        self.ledger.track_negotiation(negotiation)
+        negotiation.counter_offer(800.0)
+
+        budget = self.ledger.get(self.event_id)
+        self.assertEqual((budget.requested, budget.negotiating), (800.0, 800.0))
+
+        negotiation.approve()
+        budget = self.ledger.get(self.event_id)
+        self.assertEqual((budget.requested, budget.negotiating, budget.approved), (0.0, 0.0, 800.0))
+
+    def test_negotiating_follows_the_request(self) -> None:
+        """Several negotiations count a request once, at its current amount, until it is decided."""
+        request = self.track_request(1, 1000.0)
+        first, second = BudgetNegotiation(1, request), BudgetNegotiation(2, request)
+        self.ledger.track_negotiation(first)
+        self.ledger.track_negotiation(second)
+        first.counter_offer(800.0)
+        second.counter_offer(600.0)
+
+        budget = self.ledger.get(self.event_id)
+        self.assertEqual((budget.requested, budget.negotiating), (600.0, 600.0))
+
+        request.approve()
+        budget = self.ledger.get(self.event_id)
+        self.assertEqual((budget.requested, budget.negotiating, budget.approved), (0.0, 0.0, 600.0))
+
+    def test_worker_asks_roll_up_per_event(self) -> None:
+        """Budget asks on tasks add up under the task's event."""
+        manager = Manager("Jack", Department.PRODUCTION)
+        worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        task = manager.create_task(self.event_id, "Prepare Stage", "Lights")
+        manager.assign_task(task, [worker])
+        worker.request_more_budget(task, 250.0, "Cables")
+        self.ledger.track_task(task)
+        worker.request_more_budget(task, 100.0, "Tape")
+
+        self.assertEqual(self.ledger.get(self.event_id).worker_asks, 350.0)
+
+    def test_rebuild_matches_incremental_ledger(self) -> None:
+        """Rebuilding from the sources gives the same totals."""
+        request = self.track_request(1, 1000.0)
+        negotiation = BudgetNegotiation(1, request)
+        self.ledger.track_negotiation(negotiation)
+        negotiation.counter_offer(700.0)
+
+        rebuilt = BudgetLedger()
+        rebuilt.rebuild([self.app], [request], [negotiation], [])
+        self.assertEqual(rebuilt.events(), self.ledger.events())
+
+    def test_listeners_are_not_pickled(self) -> None:
+        """A restored request no longer updates the ledger it was tracked by."""
+        request = pickle.loads(pickle.dumps(self.track_request(1, 1000.0)))
+        request.approve()
+
+        self.assertEqual(self.ledger.get(self.event_id).approved, 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
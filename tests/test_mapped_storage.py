@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import (MappedFileStorage, Employee, Role, EventSystem, EventApplicationStatus, Manager, Worker, Department,
+                 TaskRegistry, TaskStatus, HRRequest, HRRequestStatus, BudgetRequest, BudgetNegotiation)
+from src.ledger import BudgetLedger
+from src.projection import DomainState
+from src.journal import Journal
+
+class TestMappedFileStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        """Build a small SEP state touching every section."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+        worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        users = {"janet@sep.se": Employee("Janet", Role.CS_MANAGER), "jack@sep.se": manager, "tobias@sep.se": worker}
+        system = EventSystem()
+        for client in ("TestCorp", "Acme", "Initech"):
+            system.create_event_application(client, "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 5000, "Jazz")
+        system.review_application(1, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "Forward to FM")
+
+        task = manager.create_task(1, "Prepare Stage", "Lights and decorations")
+        manager.assign_task(task, [worker])
+        manager.change_task_status(task, TaskStatus.IN_PROGRESS)
+        worker.comment_on_task(task, "We'll use neon lights.")
+        worker.request_more_budget(task, 2500, "Roof rental")
+
+        hr_request = HRRequest(1, "Hire photographer")
+        hr_request.approve()
+        request = BudgetRequest(1, 1, 1000, "Equipment")
+        negotiation = BudgetNegotiation(1, request)
+        negotiation.counter_offer(800)
+
+        self.state = {
+            "users": users,
+            "system": system,
+            "hr_requests": {1: hr_request},
+            "budget_requests": {1: request},
+            "budget_negotiations": {1: negotiation},
+            "next_ids": (2, 2, 2),
+        }
+
+    def save(self, state, records: int = 0) -> None:
+        storage = MappedFileStorage(self.tmp.name)
+        for _ in range(records):
+            storage.append({"cmd": "noop"})
+        storage.write_snapshot(state)
+        storage.close()
+
+    def reload(self):
+        storage = MappedFileStorage(self.tmp.name)
+        self.addCleanup(storage.close)
+        state, records = storage.load()
+        self.assertEqual(records, [])
+        return state
+
+    def test_snapshot_round_trip(self) -> None:
+        """A snapshot read back should rebuild the same object graph."""
+        self.save(self.state)
+        state = self.reload()
+
+        app = state["system"].get_application_by_id(1)
+        self.assertEqual((app.client_name, app.status, app.comment), ("TestCorp", EventApplicationStatus.FORWARDED, ""))
+        self.assertEqual([h.role for h in app.history], [Role.CS_WORKER, Role.CS_MANAGER])
+        self.assertTrue(app.has_acted(Role.CS_MANAGER))
+
+        manager, worker = state["users"]["jack@sep.se"], state["users"]["tobias@sep.se"]
+        task = manager.tasks[0]
+        self.assertEqual((task.task_id, task.status), (1, TaskStatus.IN_PROGRESS))
+        self.assertIs(task.assigned_workers[0], worker)
+        self.assertIs(worker.tasks[0], task)
+        self.assertEqual(task.comments[0]["comment"], "We'll use neon lights.")
+        self.assertEqual(task.budget_requests[0]["amount"], 2500)
+
+        self.assertEqual(state["hr_requests"][1].status, HRRequestStatus.APPROVED)
+        self.assertIs(state["budget_negotiations"][1].request, state["budget_requests"][1])
+        self.assertEqual((state["budget_requests"][1].amount, state["budget_requests"][1].requested_amount), (800, 1000))
+        self.assertEqual(state["next_ids"], (2, 2, 2))
+
+    def test_applications_are_built_on_access(self) -> None:
+        """Loading builds no applications; lookups build only the ones asked for."""
+        self.save(self.state)
+        state = self.reload()
+        system = state["system"]
+
+        self.assertEqual(system.applications.loaded, 0)
+        ledger = BudgetLedger()
+        ledger.use_originals(state["budgets"])
+        self.assertEqual(ledger.get(3).original, 5000)
+        self.assertEqual(system.get_application_by_id(2).client_name, "Acme")
+        self.assertEqual(system.applications.loaded, 1)
+        self.assertEqual([a.app_id for a in system.iter_applications(after=1, limit=1)], [2])
+        with self.assertRaises(ValueError):
+            system.get_application_by_id(4)
+
+    def test_changes_after_load_are_saved(self) -> None:
+        """Reviews and new applications survive the next snapshot; untouched records are copied."""
+        self.save(self.state)
+        system = self.reload()["system"]
+        system.review_application(2, Role.CS_MANAGER, EventApplicationStatus.REJECTED, "No budget")
+        system.create_event_application("Globex", "Gala", datetime(2025, 12, 5), datetime(2025, 12, 6), 100, "")
+        self.assertEqual([a.app_id for a in system.query(status=EventApplicationStatus.PENDING_REVIEW)], [3, 4])
+
+        self.save(self.reload() | {"system": system}, records=1)
+        system = self.reload()["system"]
+
+        self.assertEqual([str(a) for a in system.iter_applications()],
+                         [f"[#{i}] {c} - {t} ({s})" for i, c, t, s in (
+                             (1, "TestCorp", "Workshop", EventApplicationStatus.FORWARDED),
+                             (2, "Acme", "Workshop", EventApplicationStatus.REJECTED),
+                             (3, "Initech", "Workshop", EventApplicationStatus.PENDING_REVIEW),
+                             (4, "Globex", "Gala", EventApplicationStatus.PENDING_REVIEW))])
+        self.assertEqual([h.comment for h in system.get_application_by_id(2).history], ["Initial submission", "No budget"])
+        self.assertEqual(system.next_id, 5)
+
+    def test_reload_gives_a_fresh_copy_for_checkpoints(self) -> None:
+        """A lazy journal checkpoint decodes the snapshot again, ignoring later changes."""
+        self.save(self.state)
+        state = self.reload()
+        journal = Journal()
+        journal.save_checkpoint(0, lambda: DomainState.of(*(state["reload"]()[key] for key in (
+            "system", "hr_requests", "budget_requests", "budget_negotiations")), []).snapshot())
+        state["system"].review_application(3, Role.CS_MANAGER, EventApplicationStatus.REJECTED, "")
+
+        rebuilt = DomainState.rebuild(journal)
+
+        self.assertEqual(rebuilt.system.get_application_by_id(3).status, EventApplicationStatus.PENDING_REVIEW)
+        self.assertEqual(len(rebuilt.system.query(client_name="Acme")), 1)
+
+    def test_unchanged_state_is_not_rewritten(self) -> None:
+        """Without records since the last snapshot, writing one again is skipped."""
+        self.save(self.state)
+        path = os.path.join(self.tmp.name, MappedFileStorage.SNAPSHOT_FILE)
+        written = os.stat(path).st_mtime_ns
+
+        self.save(self.reload())
+
+        self.assertEqual(os.stat(path).st_mtime_ns, written)
+
+if __name__ == "__main__":
+    unittest.main()
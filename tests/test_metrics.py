@@ -0,0 +1,31 @@
+import unittest
+
+from src.metrics import LatencyRecorder, percentile
+
+class TestLatencyMetrics(unittest.TestCase):
+    def test_percentile_uses_nearest_rank(self) -> None:
+        """p50 and p99 of 1..100 should be the 50th and 99th values."""
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(samples, 50), 50.0)
+        self.assertEqual(percentile(samples, 99), 99.0)
+
+    def test_percentile_of_no_samples_is_zero(self) -> None:
+        """An empty sample list should not raise."""
+        self.assertEqual(percentile([], 99), 0.0)
+
+    def test_recorder_groups_samples_by_command(self) -> None:
+        """The report should have one row per command type."""
+        stats = LatencyRecorder()
+        stats.record("login", 0.001)
+        stats.record("view-tasks", 0.002)
+        stats.record("view-tasks", 0.003)
+        stats.stop()
+
+        self.assertEqual(stats.count, 3)
+        report = stats.report()
+        self.assertEqual(len(report), 4)
+        self.assertTrue(report[-1].startswith("view-tasks"))
+
+
+if __name__ == "__main__":
+    unittest.main()
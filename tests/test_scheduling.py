@@ -0,0 +1,119 @@
+import random
+import unittest
+from datetime import datetime
+
+from src import Manager, Worker, Department, TaskRegistry, TaskStatus
+from src.scheduling import IntervalTree, Schedule
+
+EVENTS = {
+    1: (datetime(2025, 12, 1), datetime(2025, 12, 3)),
+    2: (datetime(2025, 12, 2), datetime(2025, 12, 4)),
+    3: (datetime(2025, 12, 10), datetime(2025, 12, 11)),
+}
+
+class TestIntervalTree(unittest.TestCase):
+    def test_matches_a_linear_scan(self) -> None:
+        """Overlap queries agree with checking every interval, across adds and removes."""
+        rng = random.Random(7)
+        tree: IntervalTree[int] = IntervalTree()
+        intervals = {}
+        for i in range(400):
+            start = rng.randrange(1000)
+            intervals[i] = (start, start + rng.randrange(50))
+            tree.add(*intervals[i], i, i)
+        for i in range(0, 400, 3):
+            tree.remove(*intervals.pop(i), i)
+
+        self.assertEqual(len(tree), len(intervals))
+        for _ in range(200):
+            lo = rng.randrange(1100)
+            hi = lo + rng.randrange(30)
+            expected = sorted(i for i, (start, end) in intervals.items() if start <= hi and lo <= end)
+            self.assertEqual(sorted(value for _, _, value in tree.overlapping(lo, hi)), expected)
+        with self.assertRaises(KeyError):
+            tree.remove(0, 0, "missing")
+
+    def test_build_matches_adding_one_by_one(self) -> None:
+        """A tree built in one pass answers like one built by `add`, and stays usable after."""
+        rng = random.Random(11)
+        intervals = [(start, start + rng.randrange(50), i, i) for i, start in enumerate(rng.randrange(1000) for _ in range(300))]
+        built: IntervalTree[int] = IntervalTree.build(intervals)
+        added: IntervalTree[int] = IntervalTree()
+        for interval in intervals:
+            added.add(*interval)
+        built.add(500, 2000, -1, -1)
+        added.add(500, 2000, -1, -1)
+
+        self.assertEqual(len(built), len(added))
+        self.assertEqual(list(built), list(added))
+        for _ in range(100):
+            lo = rng.randrange(1100)
+            self.assertEqual(list(built.overlapping(lo, lo + 20)), list(added.overlapping(lo, lo + 20)))
+
+class TestSchedule(unittest.TestCase):
+    def setUp(self) -> None:
+        """A production manager whose registry checks assignments against a schedule."""
+        registry = TaskRegistry()
+        self.schedule = registry.schedule = Schedule(EVENTS.get)
+        self.manager = Manager("Jack", Department.PRODUCTION, registry)
+        self.tobias = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        self.antony = Worker("Antony", Department.PRODUCTION, "Audio Specialist")
+        for worker in (self.tobias, self.antony):
+            self.schedule.add_worker(worker)
+
+    def task(self, event_id: int):
+        task = self.manager.create_task(event_id, f"Task for {event_id}", "")
+        self.schedule.track(task)
+        return task
+
+    def test_double_booking_is_refused(self) -> None:
+        """A worker can take more tasks of one event but not one at an overlapping event."""
+        self.manager.assign_task(self.task(1), [self.tobias])
+        self.manager.assign_task(self.task(1), [self.tobias])
+        clashing = self.task(2)
+
+        with self.assertRaisesRegex(ValueError, "Tobias is already booked for Event #1"):
+            self.manager.assign_task(clashing, [self.antony, self.tobias])
+        self.assertEqual(clashing.assigned_workers, [])
+
+        self.manager.assign_task(self.task(3), [self.tobias])
+        self.assertEqual(self.schedule.load(self.tobias), 3)
+
+    def test_closed_tasks_free_the_worker(self) -> None:
+        """The booking lasts while any of the worker's tasks for the event is open."""
+        first, second = self.task(1), self.task(1)
+        self.manager.assign_task(first, [self.tobias])
+        self.manager.assign_task(second, [self.tobias])
+        self.manager.change_task_status(first, TaskStatus.CLOSED)
+        self.assertTrue(self.schedule.is_busy(self.tobias, EVENTS[2]))
+        self.manager.change_task_status(second, TaskStatus.CLOSED)
+        self.assertFalse(self.schedule.is_busy(self.tobias, EVENTS[2]))
+
+    def test_free_workers_in_a_period(self) -> None:
+        """Only workers without bookings overlapping the period are free."""
+        self.manager.assign_task(self.task(1), [self.tobias])
+        self.assertEqual(self.schedule.free_workers(Department.PRODUCTION, *EVENTS[2]), [self.antony])
+        self.assertEqual(self.schedule.free_workers(Department.PRODUCTION, *EVENTS[3]), [self.tobias, self.antony])
+        self.assertEqual(self.schedule.free_workers(Department.PRODUCTION, *EVENTS[3], duty="photographer"), [self.tobias])
+
+    def test_free_workers_follow_bookings(self) -> None:
+        """Workers leave the free list while booked and come back, in their original order, once their tasks close."""
+        task = self.task(1)
+        self.manager.assign_task(task, [self.tobias])
+        self.assertEqual(self.schedule.free_workers(Department.PRODUCTION, *EVENTS[1]), [self.antony])
+        self.assertEqual(self.schedule.free_workers(Department.PRODUCTION, *EVENTS[1], duty="Photographer"), [])
+
+        self.manager.change_task_status(task, TaskStatus.CLOSED)
+        self.assertEqual(self.schedule.free_workers(Department.PRODUCTION, *EVENTS[1]), [self.tobias, self.antony])
+        self.assertEqual(self.schedule.free_workers(Department.SERVICES, *EVENTS[1]), [])
+
+    def test_department_capacity(self) -> None:
+        """A capacity caps the workers booked around overlapping events."""
+        self.schedule.capacity[Department.PRODUCTION] = 1
+        self.manager.assign_task(self.task(1), [self.tobias])
+        with self.assertRaisesRegex(ValueError, "above its capacity of 1"):
+            self.manager.assign_task(self.task(2), [self.antony])
+        self.manager.assign_task(self.task(3), [self.antony])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime
+
+from src import Manager, Worker, Department, TaskRegistry, EventSystem, Role, BudgetRequest
+from src.search import SearchIndex, Document, APPLICATION, BUDGET_REQUEST, TASK_COMMENT, TASK_BUDGET
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        """An index over two applications, a budget request and a task."""
+        self.index = SearchIndex()
+        system = EventSystem()
+        for preferences in ("Vegan catering, live jazz band", "Jazz quartet and photography"):
+            self.index.track_application(system.create_event_application(
+                "Client", "Party", datetime(2025, 12, 1), datetime(2025, 12, 2), 1000, preferences, Role.CS_WORKER))
+        self.index.track_request(BudgetRequest(1, 1, 500, "Extra photographers for the gala"))
+        self.manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+        self.worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        self.task = self.manager.create_task(1, "Photos", "")
+        self.index.track_task(self.task)
+
+    def test_prefix_words_must_all_match(self) -> None:
+        """Each query word matches as a prefix, case-insensitively, and all must match."""
+        self.assertEqual([d for _, d in self.index.search("JAZZ")],
+                         [Document(APPLICATION, 1), Document(APPLICATION, 2)])
+        self.assertEqual([d for _, d in self.index.search("jaz photo")], [Document(APPLICATION, 2)])
+        self.assertEqual(self.index.search("jazz gala"), [])
+        self.assertEqual(self.index.search("  ,. "), [])
+
+    def test_task_notes_are_indexed_as_written(self) -> None:
+        """Comments and budget asks added after tracking become searchable."""
+        self.manager.assign_task(self.task, [self.worker])
+        self.worker.comment_on_task(self.task, "Need a second photographer")
+        self.task.add_budget_request("Tobias", 200, "Rent a photography drone")
+        docs = [d for _, d in self.index.search("photog", limit=10)]
+        self.assertEqual(set(docs), {Document(APPLICATION, 2), Document(BUDGET_REQUEST, 1),
+                                     Document(TASK_COMMENT, self.task.task_id, 0),
+                                     Document(TASK_BUDGET, self.task.task_id, 0)})
+        self.assertEqual([d for _, d in self.index.search("drone")], [Document(TASK_BUDGET, self.task.task_id, 0)])
+
+    def test_ranking_limit_and_visibility(self) -> None:
+        """Documents repeating a rare word rank first; `visible` filters before the limit."""
+        self.index.index(Document(APPLICATION, 3), "jazz jazz jazz")
+        self.assertEqual(self.index.search("jazz", limit=1)[0][1], Document(APPLICATION, 3))
+        hits = self.index.search("jazz", visible=lambda d: d.id != 3, limit=1)
+        self.assertEqual([d for _, d in hits], [Document(APPLICATION, 1)])
+        with self.assertRaises(ValueError):
+            self.index.search("jazz", limit=-1)
+
+    def test_reindex_and_remove(self) -> None:
+        """Changed text replaces the old terms; removed documents stop matching."""
+        doc = Document(APPLICATION, 1)
+        self.index.index(doc, "Acoustic set")
+        self.assertEqual(self.index.search("vegan"), [])
+        self.assertEqual([d for _, d in self.index.search("acou")], [doc])
+        self.index.remove(doc)
+        self.assertEqual(self.index.search("acoustic"), [])
+        self.assertEqual(len(self.index), 2)
+
+    def test_deferred_rebuild_runs_on_first_search(self) -> None:
+        """A deferred load is not run until something is searched."""
+        index = SearchIndex()
+        calls = []
+        index.defer(lambda: calls.append(index.index(Document(APPLICATION, 1), "Gala dinner")))
+        self.assertEqual(calls, [])
+        self.assertEqual(len(index.search("gala")), 1)
+        index.search("gala")
+        self.assertEqual(len(calls), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+import server
+from src import EventSystem, FileStorage, journal
+
+class TestServerSessions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        """Start a server on a free port with an empty event system."""
+        # restore_state rebinds every global built on the system (queues,
+        # ledger, views, journal...); put all of them back afterwards.
+        saved = dict(vars(main))
+        self.addCleanup(vars(main).update, saved)
+        self.addCleanup(journal.install, journal.active())
+        main.restore_state({**main.snapshot_state(), "system": EventSystem(), "hr_requests": {},
+                            "budget_requests": {}, "budget_negotiations": {}, "next_ids": (1, 1, 1)})
+        self.server = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+        async def call(line: str) -> str:
+            writer.write(line.encode() + b"\n")
+            await writer.drain()
+            return (await reader.readuntil(server.END_OF_RESPONSE)).decode()
+
+        return call, writer
+
+    async def test_each_connection_has_its_own_session(self) -> None:
+        """Two clients can be logged in as different users at the same time."""
+        sarah, sarah_writer = await self.connect()
+        janet, janet_writer = await self.connect()
+
+        self.assertIn("Logged in as Sarah", await sarah("login sarah@sep.se"))
+        self.assertIn("Logged in as Janet", await janet("login janet@sep.se"))
+
+        self.assertIn("Created Event Application #1", await sarah('create-event-application TestCorp Workshop 2025-12-01 2025-12-02 5000 ""'))
+        self.assertIn("updated to Forwarded", await janet("review-event-application 1 FORWARDED ok"))
+        self.assertIn("Permission denied", await sarah("review-event-application 1 APPROVED ok"))
+
+        for writer in (sarah_writer, janet_writer):
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_failing_command_keeps_the_session(self) -> None:
+        """A command that raises is answered with its error and the connection stays usable."""
+        call, writer = await self.connect()
+        with mock.patch.object(main, "execute", side_effect=RuntimeError("disk full")):
+            self.assertIn("❌ disk full", await call("login sarah@sep.se"))
+        self.assertIn("Logged in as Sarah", await call("login sarah@sep.se"))
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_concurrent_sessions_do_not_lose_updates(self) -> None:
+        """Applications created concurrently from many connections all get distinct IDs."""
+        async def create(n: int) -> None:
+            call, writer = await self.connect()
+            await call("login sarah@sep.se")
+            for i in range(n):
+                await call(f'create-event-application Client{i} Workshop 2025-12-01 2025-12-02 100 ""')
+            await call("quit")
+            writer.close()
+            await writer.wait_closed()
+
+        await asyncio.gather(*(create(10) for _ in range(20)))
+
+        ids = [app.app_id for app in main.SYSTEM.applications]
+        self.assertEqual(sorted(ids), list(range(1, 201)))
+
+    async def test_replies_wait_for_the_group_commit(self) -> None:
+        """A mutating command is acknowledged only once its log record is on disk; due snapshots follow."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        storage = FileStorage(tmp.name, snapshot_every=2)
+        self.addCleanup(storage.close)
+        main.STORAGE, storage.auto_commit = storage, False
+        server.GROUP_COMMIT = server.GroupCommit(0.01)
+        self.addCleanup(setattr, server, "GROUP_COMMIT", None)
+        flusher = asyncio.create_task(server.GROUP_COMMIT.run())
+        self.addCleanup(flusher.cancel)
+        call, writer = await self.connect()
+
+        await call("login sarah@sep.se")
+        self.assertIn("Created Event Application #1", await call('create-event-application TestCorp Workshop 2025-12-01 2025-12-02 5000 ""'))
+        with open(storage.wal_path) as f:
+            self.assertIn("create-event-application", f.read())
+
+        await call('create-event-application TestCorp Workshop 2025-12-01 2025-12-02 5000 ""')
+        for _ in range(100):
+            if storage.records_since_snapshot == 0:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(storage.read_snapshot()["system"].applications), 2)
+        writer.close()
+        await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
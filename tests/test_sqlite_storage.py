@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import (SQLiteStorage, Employee, Role, EventSystem, EventApplicationStatus, Manager, Worker, Department,
+                 TaskStatus, TaskRegistry, HRRequest, HRRequestStatus, BudgetRequest, BudgetNegotiation)
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        """Build a small SEP state touching every table."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sep.db")
+
+        self.manager = Manager("Jack", Department.PRODUCTION)
+        self.worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        self.users = {
+            "janet@sep.se": Employee("Janet", Role.CS_MANAGER),
+            "jack@sep.se": self.manager,
+            "tobias@sep.se": self.worker,
+        }
+        self.system = EventSystem()
+        app = self.system.create_event_application("TestCorp", "Workshop", datetime(2025, 12, 1), datetime(2025, 12, 2), 5000, "Jazz")
+        self.system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "Forward to FM")
+
+        task = self.manager.create_task(app.app_id, "Prepare Stage", "Lights and decorations")
+        self.manager.assign_task(task, [self.worker])
+        self.manager.change_task_status(task, TaskStatus.IN_PROGRESS)
+        self.worker.comment_on_task(task, "We'll use neon lights.")
+        self.worker.request_more_budget(task, 2500, "Roof rental")
+
+        hr_request = HRRequest(1, "Hire photographer")
+        hr_request.approve()
+        request = BudgetRequest(1, app.app_id, 1000, "Equipment")
+        negotiation = BudgetNegotiation(1, request)
+        negotiation.counter_offer(800)
+
+        self.state = {
+            "users": self.users,
+            "system": self.system,
+            "hr_requests": {1: hr_request},
+            "budget_requests": {1: request},
+            "budget_negotiations": {1: negotiation},
+            "next_ids": (2, 2, 2),
+        }
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def reload(self):
+        storage = SQLiteStorage(self.path)
+        try:
+            return storage.load()
+        finally:
+            storage.close()
+
+    def test_snapshot_round_trip(self) -> None:
+        """A snapshot read back should rebuild the same object graph."""
+        storage = SQLiteStorage(self.path)
+        storage.write_snapshot(self.state)
+        storage.close()
+
+        state, records = self.reload()
+
+        self.assertEqual(records, [])
+        app = state["system"].get_application_by_id(1)
+        self.assertEqual(app.status, EventApplicationStatus.FORWARDED)
+        self.assertEqual([h[1] for h in app.history], [Role.CS_WORKER, Role.CS_MANAGER])
+
+        manager, worker = state["users"]["jack@sep.se"], state["users"]["tobias@sep.se"]
+        task = manager.tasks[0]
+        self.assertEqual(task.status, TaskStatus.IN_PROGRESS)
+        self.assertIs(task.assigned_workers[0], worker)
+        self.assertIs(worker.tasks[0], task)
+        self.assertEqual(task.comments[0]["comment"], "We'll use neon lights.")
+        self.assertEqual(task.budget_requests[0]["amount"], 2500)
+
+        self.assertEqual(state["hr_requests"][1].status, HRRequestStatus.APPROVED)
+        self.assertIs(state["budget_negotiations"][1].request, state["budget_requests"][1])
+        self.assertEqual(state["budget_requests"][1].amount, 800)
+        self.assertEqual(state["budget_requests"][1].requested_amount, 1000)
+        self.assertEqual(state["next_ids"], (2, 2, 2))
+
+    def test_task_ids_survive_a_round_trip(self) -> None:
+        """Task IDs should be restored as stored, gaps included, not renumbered."""
+        registry = TaskRegistry()
+        manager = Manager("Mike", Department.SERVICES, registry)
+        first, dropped, last = (manager.create_task(1, title, "") for title in ("Menu", "Drinks", "Tables"))
+        manager.tasks.remove(dropped)
+        self.users["mike@sep.se"] = manager
+        storage = SQLiteStorage(self.path)
+        storage.write_snapshot(self.state)
+        storage.close()
+
+        state, _ = self.reload()
+
+        restored = state["users"]["mike@sep.se"]
+        self.assertEqual([(t.task_id, t.title) for t in restored.tasks], [(first.task_id, "Menu"), (last.task_id, "Tables")])
+        self.assertIsNone(state["users"]["jack@sep.se"].tasks[0].task_id)
+        fresh = TaskRegistry()
+        fresh.adopt(restored)
+        self.assertEqual(restored.create_task(1, "Chairs", "").task_id, last.task_id + 1)
+
+    def test_log_records_after_snapshot_are_replayed(self) -> None:
+        """Only records appended after the last snapshot should be returned."""
+        storage = SQLiteStorage(self.path, group_size=1)
+        storage.append({"cmd": "before"})
+        storage.write_snapshot(self.state)
+        storage.append({"cmd": "after"})
+        storage.close()
+
+        _, records = self.reload()
+
+        self.assertEqual([r["cmd"] for r in records], ["after"])
+
+    def test_unchanged_state_is_not_snapshotted_again(self) -> None:
+        """A second snapshot with no records logged since writes nothing to the database."""
+        storage = SQLiteStorage(self.path)
+        storage.write_snapshot(self.state)
+        observer = sqlite3.connect(self.path)
+        self.addCleanup(observer.close)
+        version = observer.execute("PRAGMA data_version").fetchone()
+
+        storage.write_snapshot(self.state)
+        self.assertEqual(observer.execute("PRAGMA data_version").fetchone(), version)
+
+        storage.append({"cmd": "changed"})
+        storage.write_snapshot(self.state)
+        self.assertNotEqual(observer.execute("PRAGMA data_version").fetchone(), version)
+        storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
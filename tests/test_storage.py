@@ -0,0 +1,152 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+import main
+from src import EventSystem, FileStorage, clock, journal
+from src.commands import Session
+
+class TestFileStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        """Give each test an empty data directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def reload(self):
+        storage = FileStorage(self.directory)
+        try:
+            return storage.load()
+        finally:
+            storage.close()
+
+    def test_fresh_directory_loads_nothing(self) -> None:
+        """An empty directory has no snapshot and no log records."""
+        storage = FileStorage(self.directory)
+        self.assertEqual(storage.load(), (None, []))
+        storage.close()
+
+    def test_committed_records_survive_reopen(self) -> None:
+        """Records appended and committed should be replayed by the next session."""
+        storage = FileStorage(self.directory, group_size=100)
+        storage.append({"cmd": "create-hr-request", "args": ["Photographer"]})
+        storage.append({"cmd": "review-hr-request", "args": ["1", "approve"]})
+        storage.close()
+
+        state, records = self.reload()
+
+        self.assertIsNone(state)
+        self.assertEqual([r["cmd"] for r in records], ["create-hr-request", "review-hr-request"])
+
+    def test_snapshot_compacts_the_log(self) -> None:
+        """After a snapshot only records appended later should be replayed."""
+        storage = FileStorage(self.directory)
+        storage.append({"cmd": "first"})
+        storage.write_snapshot({"counter": 1})
+        storage.append({"cmd": "second"})
+        storage.close()
+
+        state, records = self.reload()
+
+        self.assertEqual(state, {"counter": 1})
+        self.assertEqual([r["cmd"] for r in records], ["second"])
+
+    def test_unchanged_state_is_not_snapshotted_again(self) -> None:
+        """With no records since the last snapshot, writing another one is skipped."""
+        storage = FileStorage(self.directory)
+        storage.append({"cmd": "first"})
+        storage.write_snapshot({"counter": 1})
+        storage.write_snapshot({"counter": 2})
+        storage.mark_changed()
+        storage.write_snapshot({"counter": 3})
+        storage.write_snapshot({"counter": 4})
+        storage.close()
+
+        self.assertEqual(self.reload(), ({"counter": 3}, []))
+
+    def test_torn_tail_is_discarded(self) -> None:
+        """A partially written last record is dropped and later appends still load."""
+        storage = FileStorage(self.directory)
+        storage.append({"cmd": "first"})
+        storage.close()
+        with open(os.path.join(self.directory, FileStorage.WAL_FILE), "ab") as f:
+            f.write(b'{"seq": 2, "cmd": "sec')
+
+        storage = FileStorage(self.directory)
+        storage.load()
+        storage.append({"cmd": "third"})
+        storage.close()
+
+        _, records = self.reload()
+        self.assertEqual([r["cmd"] for r in records], ["first", "third"])
+
+    def test_needs_snapshot_after_threshold(self) -> None:
+        """The storage asks for a snapshot once enough records have been logged."""
+        storage = FileStorage(self.directory, snapshot_every=2)
+        storage.append({"cmd": "first"})
+        self.assertFalse(storage.needs_snapshot)
+        storage.append({"cmd": "second"})
+        self.assertTrue(storage.needs_snapshot)
+        storage.close()
+
+    def test_commit_from_another_thread(self) -> None:
+        """Committing on another thread while records are appended loses none and keeps their order."""
+        storage = FileStorage(self.directory)
+        storage.auto_commit = False
+        done = threading.Event()
+        def flusher() -> None:
+            while not done.is_set():
+                storage.commit()
+        thread = threading.Thread(target=flusher)
+        thread.start()
+        for i in range(2000):
+            storage.append({"cmd": str(i)})
+        done.set()
+        thread.join()
+        storage.close()
+
+        _, records = self.reload()
+        self.assertEqual([r["cmd"] for r in records], [str(i) for i in range(2000)])
+
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        """Start main from an empty event system and give it a data directory."""
+        saved = dict(vars(main))
+        self.addCleanup(vars(main).update, saved)
+        self.addCleanup(journal.install, journal.active())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.reset()
+
+    def reset(self) -> None:
+        main.restore_state({**main.snapshot_state(), "system": EventSystem(), "hr_requests": {},
+                            "budget_requests": {}, "budget_negotiations": {}, "next_ids": (1, 1, 1)})
+
+    def test_replay_keeps_the_logged_times(self) -> None:
+        """Commands replayed from the log stamp the time they originally ran at, not the recovery time."""
+        main.open_storage(FileStorage(self.tmp.name))
+        session = Session()
+        session.login("sarah@sep.se", main.USERS["sarah@sep.se"])
+        ran_at = datetime(2025, 3, 4, 5, 6, 7)
+        with contextlib.redirect_stdout(io.StringIO()), clock.pinned(ran_at):
+            main.execute(session, "create-event-application",
+                         ["TestCorp", "Workshop", "2025-12-01", "2025-12-02", "5000", ""], interactive=False)
+        main.STORAGE.close()
+
+        self.reset()
+        self.assertEqual(main.open_storage(FileStorage(self.tmp.name)), 1)
+        self.addCleanup(main.STORAGE.close)
+
+        self.assertEqual(main.SYSTEM.get_application_by_id(1).history[0].timestamp, ran_at)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from typing import List
-from src import Task, Manager, Worker, Department, TaskStatus, Comment, InternalBudgetRequest
+from src import Task, TaskRegistry, Manager, Worker, Department, TaskStatus, Comment, InternalBudgetRequest
 
 class TestTaskDistributionWorkflow(unittest.TestCase):
     def setUp(self) -> None:
@@ -99,6 +99,17 @@ class TestTaskDistributionWorkflow(unittest.TestCase):
         self.assertEqual(comments[0]["worker"], "Tobias")
         self.assertEqual(comments[0]["comment"], "We'll use neon lights.")
 
+    def test_records_are_slotted(self) -> None:
+        """Comments and tasks carry no per-instance __dict__."""
+        task = self.manager.create_task(0, "Prepare Stage", "Set up stage lightning and decorations.")
+        comment = Comment("Tobias", "On it")
+
+        self.assertFalse(hasattr(task, "__dict__"))
+        self.assertFalse(hasattr(comment, "__dict__"))
+        self.assertEqual(comment.worker, comment["worker"])
+        with self.assertRaises(KeyError):
+            comment["missing"]
+
     def test_worker_cannot_comment_on_unassigned_task(self) -> None:
         """Workers cannot add a comment to tasks that are not assigned to them."""
         task = self.manager.create_task(0, "Prepare Stage", "Set up stage lightning and decorations.")
@@ -129,5 +140,64 @@ class TestTaskDistributionWorkflow(unittest.TestCase):
             self.workers[1].request_more_budget(task, 25000, "We'll have to rent a roof and lightning grid.")
 
 
+class TestTaskRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        """Set up two managers sharing one task registry."""
+        self.registry = TaskRegistry()
+        self.production = Manager("Jack", Department.PRODUCTION, self.registry)
+        self.services = Manager("Natalie", Department.SERVICES, self.registry)
+        self.worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+
+    def test_created_tasks_get_unique_ids(self) -> None:
+        """Each task registered gets its own ID and can be fetched by it."""
+        first = self.production.create_task(1, "Prepare Stage", "Lights")
+        second = self.services.create_task(1, "Catering", "Food")
+
+        self.assertNotEqual(first.task_id, second.task_id)
+        self.assertIs(self.registry.get(second.task_id), second)
+
+    def test_find_by_title_is_scoped_to_manager(self) -> None:
+        """Two managers can use the same title without seeing each other's task."""
+        mine = self.production.create_task(1, "Setup", "Stage")
+        theirs = self.services.create_task(1, "Setup", "Tables")
+
+        self.assertIs(self.registry.find(self.production, "Setup"), mine)
+        self.assertIs(self.registry.find(self.services, "Setup"), theirs)
+        self.assertIsNone(self.registry.find(self.production, "Catering"))
+
+    def test_assigned_tasks_are_found_by_worker_title(self) -> None:
+        """Assignment indexes the task under the worker as well."""
+        task = self.production.create_task(1, "Prepare Stage", "Lights")
+        self.assertIsNone(self.registry.find_assigned(self.worker, "Prepare Stage"))
+
+        self.production.assign_task(task, [self.worker])
+
+        self.assertIs(self.registry.find_assigned(self.worker, "Prepare Stage"), task)
+
+    def test_event_and_department_indexes(self) -> None:
+        """Tasks are indexed by event and by department, filtered by status."""
+        stage = self.production.create_task(1, "Prepare Stage", "Lights")
+        catering = self.services.create_task(1, "Catering", "Food")
+        self.production.create_task(2, "Photos", "Camera")
+
+        self.production.change_task_status(stage, TaskStatus.IN_PROGRESS)
+
+        self.assertEqual(self.registry.for_event(1), [stage, catering])
+        self.assertEqual([t.title for t in self.registry.for_department(Department.PRODUCTION, TaskStatus.OPEN)], ["Photos"])
+        self.assertEqual(self.registry.for_department(Department.PRODUCTION, TaskStatus.IN_PROGRESS), [stage])
+
+    def test_adopt_indexes_existing_tasks(self) -> None:
+        """A manager restored without a registry can be attached later."""
+        manager = Manager("Jack", Department.PRODUCTION)
+        task = manager.create_task(1, "Prepare Stage", "Lights")
+        manager.assign_task(task, [self.worker])
+
+        self.registry.adopt(manager)
+
+        self.assertIs(self.registry.find(manager, "Prepare Stage"), task)
+        self.assertIs(self.registry.find_assigned(self.worker, "Prepare Stage"), task)
+        self.assertIsNotNone(task.task_id)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+import pickle
+import unittest
+
+from src import Manager, Worker, Department, TaskRegistry, TaskStatus, HRRequest, HRRequestStatus, BudgetRequest
+from src.views import ALL, MaterializedView
+
+class TestMaterializedView(unittest.TestCase):
+    def setUp(self) -> None:
+        """HR requests grouped by status, rendered as 'id:status'."""
+        self.view = MaterializedView(lambda r: r.request_id, lambda r: (ALL, r.status),
+                                     lambda r: f"{r.request_id}:{r.status.value}")
+
+    def test_rows_follow_changes(self) -> None:
+        """A decision re-renders the row and moves it between status groups."""
+        first, second = HRRequest(1, "Chef"), HRRequest(2, "Waiter")
+        self.view.rebuild([first, second])
+        self.assertEqual(self.view.rows(HRRequestStatus.PENDING), ["1:Pending", "2:Pending"])
+
+        first.approve()
+        first.hire_staff(Worker("Helen", Department.SERVICES, "Chef"))
+
+        self.assertEqual(self.view.rows(ALL), ["1:Hired", "2:Pending"])
+        self.assertEqual(self.view.rows(HRRequestStatus.PENDING), ["2:Pending"])
+        self.assertEqual(self.view.rows(HRRequestStatus.HIRED), ["1:Hired"])
+        self.assertEqual(self.view.count(HRRequestStatus.APPROVED), 0)
+
+    def test_budget_amount_changes_are_rendered(self) -> None:
+        """Counter-offers re-render budget request rows in place."""
+        view = MaterializedView(lambda r: r.request_id, lambda r: (ALL,), lambda r: f"{r.request_id}:{r.amount}")
+        request = BudgetRequest(1, 1, 1000.0, "Equipment")
+        view.track(request)
+        request.set_amount(800.0)
+        self.assertEqual(view.rows(ALL), ["1:800.0"])
+
+    def test_task_views_per_owner_and_department(self) -> None:
+        """Assignment and status changes update owner and department groups."""
+        registry = TaskRegistry()
+        manager = Manager("Jack", Department.PRODUCTION, registry)
+        worker = Worker("Tobias", Department.PRODUCTION, "Photographer")
+        view = MaterializedView(
+            lambda t: t.task_id,
+            lambda t: [registry.manager_of(t), *t.assigned_workers, (t.department, t.status)],
+            lambda t: f"{t.title} ({t.status.value})")
+
+        task = manager.create_task(1, "Prepare Stage", "Lights")
+        view.track(task)
+        manager.assign_task(task, [worker])
+        self.assertEqual(view.rows(worker), ["Prepare Stage (Open)"])
+
+        manager.change_task_status(task, TaskStatus.CLOSED)
+        self.assertEqual(view.rows(manager), ["Prepare Stage (Closed)"])
+        self.assertEqual(view.rows((Department.PRODUCTION, TaskStatus.OPEN)), [])
+        self.assertEqual(view.rows((Department.PRODUCTION, TaskStatus.CLOSED)), ["Prepare Stage (Closed)"])
+
+    def test_rows_page_by_id_cursor(self) -> None:
+        """Pages follow ID order across chunks, and a cursor survives rows moving away."""
+        self.view.chunk_size = 2
+        requests = [HRRequest(i, "Chef") for i in (3, 1, 5, 2, 4)]
+        self.view.rebuild(requests)
+
+        self.assertEqual([row_id for row_id, _ in self.view.iter_rows(ALL)], [1, 2, 3, 4, 5])
+        self.assertEqual(self.view.rows(HRRequestStatus.PENDING, after=1, limit=3), ["2:Pending", "3:Pending", "4:Pending"])
+
+        requests[0].approve()
+        self.assertEqual(self.view.rows(HRRequestStatus.PENDING, after=2), ["4:Pending", "5:Pending"])
+        with self.assertRaises(ValueError):
+            self.view.rows(ALL, limit=-1)
+
+    def test_tracked_sources_still_pickle(self) -> None:
+        """Views subscribe through listeners, which are not pickled."""
+        request = HRRequest(1, "Chef")
+        self.view.track(request)
+        restored = pickle.loads(pickle.dumps(request))
+        restored.approve()
+        self.assertEqual(self.view.rows(ALL), ["1:Pending"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime
+
+from src import EventSystem, EventApplicationStatus, Role, HRRequest, BudgetRequest, Worker, Department, journal
+from src.event_bus import EventBus
+from src.financial_request import BudgetRequestOpened
+from src.staff_recruitment import HRRequestOpened
+from src.work_queue import WorkQueues, WorkItem, APPLICATION, HR_REQUEST, BUDGET_REQUEST, EVENT_TYPES
+
+class TestWorkQueues(unittest.TestCase):
+    def setUp(self) -> None:
+        """A system whose applications are filed in a set of work queues."""
+        self.system = EventSystem()
+        self.queues = WorkQueues(lambda event_id: None)
+        self.system.on_change = self.queues.track_application
+        bus = EventBus()
+        bus.subscribe(self.queues.apply, *EVENT_TYPES)
+        self.addCleanup(journal.publish_to, journal.publish_to(bus.publish))
+
+    def create(self, day: int):
+        return self.system.create_event_application("A", "Party", datetime(2025, 12, day), datetime(2025, 12, day), 1, "")
+
+    def test_applications_move_along_the_review_chain(self) -> None:
+        """Each review files the application for the next reviewer, soonest event first."""
+        late, soon = self.create(20), self.create(5)
+        self.assertEqual(self.queues.peek(Role.CS_MANAGER, 5), [WorkItem(APPLICATION, 2), WorkItem(APPLICATION, 1)])
+
+        self.system.review_application(late.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "")
+        self.assertEqual(self.queues.peek(Role.CS_MANAGER, 5), [WorkItem(APPLICATION, soon.app_id)])
+        self.assertEqual(self.queues.peek(Role.FIN_MANAGER), [WorkItem(APPLICATION, late.app_id)])
+
+        self.system.review_many([(late.app_id, EventApplicationStatus.APPROVED, "")], Role.FIN_MANAGER)
+        self.assertEqual(self.queues.count(Role.FIN_MANAGER), 0)
+        self.assertEqual(self.queues.pop(Role.ADM_MANAGER, 5), [WorkItem(APPLICATION, late.app_id)])
+        self.assertEqual(self.queues.pop(Role.ADM_MANAGER), [])
+
+    def test_rejected_application_leaves_the_queues(self) -> None:
+        """A rejection by SCS leaves nothing waiting for anyone."""
+        app = self.create(1)
+        self.system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.REJECTED, "")
+        self.assertEqual([self.queues.count(role) for role in Role], [0] * len(Role))
+
+    def test_requests_are_filed_by_status(self) -> None:
+        """HR requests wait for HR until hired; budget requests wait for FM while pending."""
+        hr, budget = HRRequest(1, "Chef"), BudgetRequest(1, 1, 100, "Band")
+        journal.record(HRRequestOpened(1, "Chef"))
+        journal.record(BudgetRequestOpened(1, 1, 100, "Band"))
+        self.assertEqual(self.queues.peek(Role.HR_MANAGER), [WorkItem(HR_REQUEST, 1)])
+        self.assertEqual(self.queues.peek(Role.FIN_MANAGER), [WorkItem(BUDGET_REQUEST, 1)])
+
+        hr.approve()
+        self.assertEqual(self.queues.count(Role.HR_MANAGER), 0)
+        self.assertEqual(self.queues.peek(Role.HR_WORKER), [WorkItem(HR_REQUEST, 1)])
+        hr.hire_staff(Worker("Helen", Department.SERVICES, "Chef"))
+        budget.reject()
+        self.assertEqual(self.queues.peek(Role.HR_WORKER) + self.queues.peek(Role.FIN_MANAGER), [])
+
+    def test_deferred_rebuild(self) -> None:
+        """Items loaded later are queued before the first read."""
+        queues = WorkQueues(lambda event_id: None)
+        queues.defer(lambda: queues.rebuild([], [HRRequest(7, "Chef")], []))
+        self.assertEqual(queues.pop(Role.HR_MANAGER), [WorkItem(HR_REQUEST, 7)])
+        self.assertEqual(queues.count(Role.HR_MANAGER), 0)
+
+    def test_rebuild_after_events_is_a_no_op(self) -> None:
+        """Requests filed from their events before a deferred rebuild lists them are queued once, in place."""
+        hr, later = HRRequest(1, "Chef"), HRRequest(2, "Waiter")
+        self.queues.defer(lambda: self.queues.rebuild([], [hr, later], []))
+        journal.record(HRRequestOpened(2, "Waiter"))
+        later.approve()
+
+        self.assertEqual(self.queues.peek(Role.HR_MANAGER, 5), [WorkItem(HR_REQUEST, 1)])
+        self.assertEqual(self.queues.peek(Role.HR_WORKER, 5), [WorkItem(HR_REQUEST, 2)])
+        hr.reject()
+        self.assertEqual(self.queues.count(Role.HR_MANAGER), 0)
+
+if __name__ == "__main__":
+    unittest.main()
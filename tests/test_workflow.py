@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime
+
+from src import (EventSystem, EventApplicationStatus, Role, HRRequest, HRRequestStatus, Manager, Department,
+                 TaskRegistry, TaskStatus)
+from src.event_request import REVIEW_WORKFLOW
+from src.staff_recruitment import HR_WORKFLOW
+from src.task_distribution import TASK_WORKFLOW
+from src.workflow import Require, Transition, Workflow
+
+class TestWorkflow(unittest.TestCase):
+    def test_rules_apply_in_order(self) -> None:
+        """A role requirement listed first wins over the transitions after it."""
+        flow: Workflow = Workflow(("draft", "sent"), [
+            Require(frozenset({"sent"}), "Managers only act on sent items.", roles=frozenset({Role.MANAGER})),
+            Transition("send", frozenset({"draft"}), "sent", "Already sent."),
+            Transition("close", frozenset({"draft", "sent"}), "closed", ""),
+        ], actions=("archive",))
+        self.assertEqual(flow.target("draft", "send"), "sent")
+        with self.assertRaisesRegex(ValueError, "Already sent."):
+            flow.target("sent", "send")
+        with self.assertRaisesRegex(ValueError, "Managers only act on sent items."):
+            flow.target("draft", "close", Role.MANAGER)
+        with self.assertRaisesRegex(ValueError, "Managers only act on sent items."):
+            flow.target("draft", "archive", Role.MANAGER)
+        with self.assertRaisesRegex(ValueError, "Invalid action: archive"):
+            flow.target("draft", "archive")
+        with self.assertRaisesRegex(ValueError, "Invalid action"):
+            flow.target("draft", ["unhashable"])
+
+    def test_review_workflow_keeps_its_messages(self) -> None:
+        """The application review rules give the messages they always did."""
+        system = EventSystem()
+        app = system.create_event_application("Client", "Party", datetime(2025, 1, 1), datetime(2025, 1, 2), 1, "")
+        with self.assertRaisesRegex(ValueError, "FM can only act after SCS has forwarded the application."):
+            REVIEW_WORKFLOW.check(app, EventApplicationStatus.APPROVED, Role.FIN_MANAGER)
+        with self.assertRaisesRegex(ValueError, "FM can only act after SCS"):
+            REVIEW_WORKFLOW.check(app, EventApplicationStatus.PENDING_REVIEW, Role.FIN_MANAGER)
+        with self.assertRaisesRegex(ValueError, "Invalid decision: EventApplicationStatus.PENDING_REVIEW"):
+            REVIEW_WORKFLOW.check(app, EventApplicationStatus.PENDING_REVIEW, Role.CS_MANAGER)
+        system.review_application(app.app_id, Role.CS_MANAGER, EventApplicationStatus.FORWARDED, "")
+        with self.assertRaisesRegex(ValueError, "AM cannot act before FM has reviewed the application."):
+            system.review_application(app.app_id, Role.ADM_MANAGER, EventApplicationStatus.APPROVED, "")
+        system.review_application(app.app_id, Role.FIN_MANAGER, EventApplicationStatus.FORWARDED, "ok")
+        system.review_application(app.app_id, Role.ADM_MANAGER, EventApplicationStatus.APPROVED, "")
+        self.assertIs(app.status, EventApplicationStatus.APPROVED)
+
+    def test_apply_many_reports_each_item(self) -> None:
+        """Allowed items are applied; the others report why not and stay as they were."""
+        requests = [HRRequest(i, "Chef") for i in range(3)]
+        requests[1].reject()
+        def approve(request: HRRequest, status: HRRequestStatus) -> None:
+            request.status = status
+        errors = HR_WORKFLOW.apply_many(((r, "approve") for r in requests), approve)
+        self.assertEqual(errors, [None, "Only Pending requests can be approved", None])
+        self.assertEqual([r.status for r in requests],
+                         [HRRequestStatus.APPROVED, HRRequestStatus.REJECTED, HRRequestStatus.APPROVED])
+
+    def test_task_status_changes(self) -> None:
+        """A task moves to any other status; to its own it is refused."""
+        manager = Manager("Jack", Department.PRODUCTION, TaskRegistry())
+        tasks = [manager.create_task(1, f"Task {i}", "") for i in range(2)]
+        manager.change_task_status(tasks[0], TaskStatus.CLOSED)
+        errors = TASK_WORKFLOW.apply_many(((t, TaskStatus.CLOSED) for t in tasks),
+                                          lambda t, status: manager.change_task_status(t, status))
+        self.assertEqual(errors, ["Cannot update task to same status.", None])
+        with self.assertRaises(PermissionError):
+            Manager("Natalie", Department.SERVICES).change_task_status(tasks[0], TaskStatus.OPEN)
+
+if __name__ == "__main__":
+    unittest.main()